@@ -0,0 +1,97 @@
+"""Throughput and peak memory of streamed result exports.
+
+Stores a synthetic district-wide batch (--docs results of --chars of OCR
+text each) in a ResultsStore, then exports it in every available format
+and compression. Peak memory is traced with tracemalloc and compared
+with the old path, which expanded the whole batch and json.dumps'ed it
+with indent=2 in one piece.
+
+    python benchmarks/bench_exports.py --docs 5000 --chars 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results_store import ResultsStore
+from exports import ResultExporter, ARROW_AVAILABLE, ZSTD_AVAILABLE
+from ner_scheduler import ENTITY_KEYS
+
+
+def make_result(rng, index, chars):
+    words = [rng.choice(("land", "forest", "claim", "village", "survey", "patta", "granted", "tribe"))
+             for _ in range(chars // 7)]
+    text = " ".join(words)
+    return {
+        "filename": f"claim_{index}.pdf",
+        "raw_text": text,
+        "cleaned_text": text,
+        "standardized_text": text,
+        "translated_text": text,
+        "original_language": "te",
+        "pages": [{"page": 1, "source": "ocr", "characters": len(text)}],
+        "entities": {key: [f"{key.lower()}_{rng.randint(0, 9999)}" for _ in range(rng.randint(0, 4))]
+                     for key in ENTITY_KEYS},
+    }
+
+
+def measure(func):
+    """(bytes produced, seconds, peak traced MB) of a call returning an iterable of chunks.
+
+    Timing and memory tracing are separate runs since tracemalloc slows allocation down.
+    """
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in func())
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    for _ in func():
+        pass
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--chars", type=int, default=20000, help="characters of text per result field")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    store = ResultsStore(max_bytes=8 * 1024 ** 3)
+    keys = [store.put(make_result(rng, i, args.chars), name=f"claim_{i}.pdf") for i in range(args.docs)]
+    batch_key = store.put({"success": True, "message": "district batch", "result_keys": keys}, prefix="batch_")
+    exporter = ResultExporter(store)
+    print(f"{args.docs} results stored, {store.total_bytes / 1e6:.0f} MB compressed in the results store")
+
+    def legacy():
+        stored = store.get(batch_key)
+        expanded = {k: v for k, v in stored.items() if k != "result_keys"}
+        expanded["results"] = [store.get(k) for k in stored["result_keys"]]
+        return [json.dumps(expanded, indent=2, ensure_ascii=False).encode("utf-8")]
+
+    cases = [("legacy json.dumps(indent=2)", legacy)]
+    for file_format, compression in [("json", None), ("ndjson", None), ("ndjson", "gzip"), ("ndjson", "zstd"),
+                                     ("parquet", None), ("arrow", None)]:
+        if compression == "zstd" and not ZSTD_AVAILABLE or file_format in ("parquet", "arrow") and not ARROW_AVAILABLE:
+            continue
+        label = f"{file_format}" + (f" + {compression}" if compression else "")
+        cases.append((label, lambda f=file_format, c=compression: exporter.export(batch_key, f, c)[0]))
+    if ARROW_AVAILABLE:
+        cases.append(("parquet (documents table)",
+                      lambda: exporter.export(batch_key, "parquet", table="documents")[0]))
+
+    for label, func in cases:
+        size, seconds, peak = measure(func)
+        print(f"  {label:<28} {size / 1e6:9.1f} MB  {seconds:6.2f} s  {size / 1e6 / seconds:7.1f} MB/s out  "
+              f"{args.docs / seconds:8,.0f} docs/s  peak {peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
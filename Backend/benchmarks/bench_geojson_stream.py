@@ -0,0 +1,114 @@
+"""Streaming GeoJSON ingestion speed and peak memory against json.load.
+
+Writes a synthetic survey export (default 100k polygons x 32 vertices, 3.2M
+vertices), then ingests it in separate processes so each peak RSS is
+measured on its own: once with the streaming reader into a FeatureTable
+plus polygon index, once with json.load plus the dict-based PolygonLayer.
+
+    python benchmarks/bench_geojson_stream.py --features 100000 --vertices 32
+"""
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_export(path, features, vertices, seed):
+    """Write a FeatureCollection one feature at a time, shaped like the survey layer"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"type": "FeatureCollection", "features": [\n')
+        for i in range(features):
+            cx, cy = rng.uniform(77.0, 81.0), rng.uniform(16.0, 19.5)
+            radius = rng.uniform(0.001, 0.004)
+            ring = [
+                [cx + radius * rng.uniform(0.7, 1.0) * math.cos(2 * math.pi * k / vertices),
+                 cy + radius * rng.uniform(0.7, 1.0) * math.sin(2 * math.pi * k / vertices)]
+                for k in range(vertices)
+            ]
+            ring.append(ring[0])
+            feature = {
+                "type": "Feature",
+                "properties": {"SURVEY_NO": str(i), "MANDAL": f"Mandal_{rng.randint(1, 400)}",
+                               "AREA": f"{rng.uniform(5000, 1500000):.2f}"},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+            f.write((",\n" if i else "") + json.dumps(feature))
+        f.write("\n]}\n")
+
+
+def child(mode, path):
+    """Ingest in this process and print timing and peak RSS as JSON"""
+    from spatial_index import PolygonLayer
+    from geojson_stream import read_feature_table, SURVEY_SCHEMA
+
+    start = time.perf_counter()
+    if mode == "stream":
+        with open(path, "rb") as f:
+            table = read_feature_table(f, SURVEY_SCHEMA)
+        layer = PolygonLayer.from_table("survey", table)
+        features, vertices = len(table), table.vertices
+    elif mode == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            collection = json.load(f)
+        layer = PolygonLayer("survey", collection["features"])
+        features, vertices = len(collection["features"]), len(layer.x1) + len(layer)
+    else:
+        features = vertices = 0
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": seconds,
+        "features": features,
+        "vertices": vertices,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def run_child(mode, path):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", type=int, default=100000)
+    parser.add_argument("--vertices", type=int, default=32, help="vertices per polygon")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-json", action="store_true", help="only run the streaming reader")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "export.geojson")
+        start = time.perf_counter()
+        write_export(path, args.features, args.vertices, args.seed)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"{args.features} features, {args.features * (args.vertices + 1):,} vertices, "
+              f"{size_mb:.0f} MB written in {time.perf_counter() - start:.1f} s")
+
+        baseline = run_child("baseline", path)["peak_rss_mb"]
+        print(f"  {'interpreter + imports':<30} {'':>10}  {'':>16}  peak RSS {baseline:8.0f} MB")
+        for mode, label in (("stream", "streaming reader + index"), ("json", "json.load + index")):
+            if mode == "json" and args.skip_json:
+                continue
+            result = run_child(mode, path)
+            print(f"  {label:<30} {result['seconds']:8.2f} s  "
+                  f"{result['features'] / result['seconds']:10,.0f} features/s  "
+                  f"peak RSS {result['peak_rss_mb']:8.0f} MB (+{result['peak_rss_mb'] - baseline:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Size and load time of the binary geometry store against the GeoJSON it is built from.
+
+Builds a store from the survey layer (optionally repeated on an N x N grid
+with --tile), then compares on-disk size, the time to json.load the
+GeoJSON with the time to map the store and decode its coordinates, and the
+bytes sent per level of detail as a binary store or simplified GeoJSON.
+
+    python benchmarks/bench_geometry_store.py --tile 20
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry_store import GeometryStore, build_store
+from spatial_index import load_geojson
+from bench_spatial_index import SURVEYS_PATH, tile_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tile", type=int, default=1, help="repeat the survey layer on an N x N grid")
+    args = parser.parse_args()
+
+    features = load_geojson(SURVEYS_PATH)
+    if args.tile > 1:
+        features = tile_features(features, args.tile)
+
+    with tempfile.TemporaryDirectory() as directory:
+        geojson_path = os.path.join(directory, "surveys.geojson")
+        store_path = os.path.join(directory, "surveys.geostore")
+        # Written the way the repository's layer files are: indented JSON with full float precision
+        with open(geojson_path, "w", encoding="utf-8") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f, indent=2)
+
+        start = time.perf_counter()
+        data = build_store(features)
+        build_time = time.perf_counter() - start
+        with open(store_path, "wb") as f:
+            f.write(data)
+
+        geojson_bytes = os.path.getsize(geojson_path)
+        print(f"{len(features)} polygons")
+        print(f"  {'GeoJSON on disk':<28} {geojson_bytes / 1024:10.1f} KB")
+        print(f"  {'store on disk (all levels)':<28} {len(data) / 1024:10.1f} KB  "
+              f"{geojson_bytes / len(data):5.1f}x smaller, built in {build_time * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        with open(geojson_path, "r", encoding="utf-8") as f:
+            json.load(f)
+        json_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = GeometryStore.open(store_path)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        store.coordinates(0)
+        decode_time = time.perf_counter() - start
+        print(f"  {'json.load':<28} {json_time * 1000:10.1f} ms")
+        print(f"  {'mmap open':<28} {open_time * 1000:10.2f} ms")
+        print(f"  {'decode full coordinates':<28} {decode_time * 1000:10.2f} ms")
+
+        print("\nper level of detail")
+        vertices = store.stats()["lod_vertices"]
+        for lod, tolerance in enumerate(store.lod_tolerances):
+            binary = store.encode(lod)
+            geojson = json.dumps(store.to_geojson(lod), separators=(",", ":")).encode("utf-8")
+            print(f"  lod {lod} ({tolerance:.5f} deg)  {vertices[lod]:9d} vertices  "
+                  f"binary {len(binary) / 1024:9.1f} KB ({geojson_bytes / len(binary):5.1f}x)  "
+                  f"geojson {len(geojson) / 1024:9.1f} KB")
+        # Release the mapping before the temporary directory is removed
+        store = None
+
+
+if __name__ == "__main__":
+    main()
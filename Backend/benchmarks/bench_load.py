@@ -0,0 +1,347 @@
+"""End-to-end load test of the API against local fake Vision, Translate and Gemini backends.
+
+Starts the server in a child process with the Google clients replaced by
+the stand-ins in fake_backends.py (each with its own latency
+distribution, error rate and rate limit), then drives every scenario
+over HTTP with --concurrency clients and reports requests/s, p50/p95/p99
+latency, error counts and the server's peak RSS. No credentials or
+network access are needed, so runs are comparable between changes.
+
+Scenarios: process (/process-documents), extract (/extract-text),
+chat (/chat) and schemes (/eligible-schemes). Uploads come from a
+synthetic corpus of scanned-looking PNGs and PDFs mixing image-only
+and text-layer pages; every upload is a new document unless
+--corpus-size makes them repeat (to measure the caches).
+
+    python benchmarks/bench_load.py --requests 200 --concurrency 16 \\
+        --vision-latency lognormal:300:0.4 --gemini-latency lognormal:1500:0.5 --json load.json
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import itertools
+import json
+import os
+import random
+import re
+import resource
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import uuid
+import zlib
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from fake_backends import (
+    FakeService, FakeVisionClient, FakeTranslateClient, FakeGeminiModel, Latency, document_text
+)
+
+SCENARIOS = ("process", "extract", "chat", "schemes")
+
+CHAT_QUESTIONS = [
+    "Which schemes can this claimant apply for?",
+    "Is the claimant eligible for PM-KISAN?",
+    "What documents are needed for the housing scheme?",
+    "How much land does the claimant hold?",
+]
+
+
+def make_png(rng, width, height):
+    """Grayscale PNG of random noise, with rows repeated so it compresses like a scan"""
+    rows = []
+    for _ in range(0, height, 4):
+        row = b"\x00" + rng.randbytes(width)
+        rows.extend([row] * 4)
+    raw = b"".join(rows[:height])
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+def make_pdf(rng, pages, text_layer_ratio, width, height):
+    """PDF whose pages are either a scanned image or embedded text"""
+    import fitz
+
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=595, height=842)
+        if rng.random() < text_layer_ratio:
+            # The base fonts have no Telugu glyphs; keep the English part of the form
+            text = document_text(rng.randbytes(16)).split("\n", 1)[1]
+            page.insert_text((56, 72), text, fontsize=11)
+        else:
+            page.insert_image(page.rect, stream=make_png(rng, width, height))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_corpus(count, args, seed=0):
+    """List of (filename, content type, bytes)"""
+    rng = random.Random(seed)
+    width, height = (int(v) for v in args.image_size.split("x"))
+    corpus = []
+    for index in range(count):
+        if rng.random() < args.pdf_ratio:
+            data = make_pdf(rng, args.pdf_pages, args.text_layer_ratio, width, height)
+            corpus.append((f"claim_{index}.pdf", "application/pdf", data))
+        else:
+            corpus.append((f"claim_{index}.png", "image/png", make_png(rng, width, height)))
+    return corpus
+
+
+def multipart(files):
+    """Encode (filename, content type, bytes) uploads as the `files` field of a form"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for filename, content_type, data in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def build_request(scenario, index, corpus, files_per_request):
+    """(method, path, body, headers) for request `index` of a scenario"""
+    if scenario in ("process", "extract"):
+        files = [corpus[(index * files_per_request + i) % len(corpus)] for i in range(files_per_request)]
+        body, content_type = multipart(files)
+        path = "/process-documents" if scenario == "process" else "/extract-text"
+        return "POST", path, body, {"Content-Type": content_type}
+    if scenario == "chat":
+        payload = {
+            "user_input": CHAT_QUESTIONS[index % len(CHAT_QUESTIONS)] + f" (#{index})",
+            "ocr_context": document_text(str(index)),
+        }
+        return "POST", "/chat", json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+    return "GET", "/eligible-schemes", None, {}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+def run_scenario(port, scenario, total, concurrency, corpus, files_per_request, timeout):
+    """Send `total` requests from `concurrency` keep-alive connections; returns (latencies, statuses, seconds)"""
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        while True:
+            index = next(counter)
+            if index >= total:
+                break
+            method, path, body, headers = build_request(scenario, index, corpus, files_per_request)
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+                status = 0
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return sorted(latencies), statuses, time.perf_counter() - start
+
+
+def server_memory_mb(pid):
+    """(current RSS, peak RSS) of the server in MB from /proc, or (None, None) off Linux"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(":", 1) for line in status if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def http_get(port, path, timeout=5):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def wait_until_ready(port, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} during startup")
+        try:
+            if http_get(port, "/")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server not ready after {timeout} s")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(args):
+    """Child process: the real app with the fake backends in place of the Google clients"""
+    os.chdir(BACKEND_DIR)
+    import uvicorn
+    import main
+
+    vision = FakeService("vision", args.vision_latency, args.vision_error_rate, args.vision_rate_limit, seed=1)
+    translate = FakeService("translate", args.translate_latency, args.translate_error_rate,
+                            args.translate_rate_limit, seed=2)
+    gemini = FakeService("gemini", args.gemini_latency, args.gemini_error_rate, args.gemini_rate_limit, seed=3)
+    # Functions in main look these globals up per call, so replacing them reroutes every endpoint
+    main.ocr_processor = main.OCRProcessor(None, client=FakeVisionClient(vision))
+    main.translation_service = main.TranslationService(client=FakeTranslateClient(translate))
+    main.ner_extractor = main.NERExtractor(model=FakeGeminiModel(gemini))
+    uvicorn.run(main.app, host="127.0.0.1", port=args.serve, log_level="warning")
+
+
+BACKEND_OPTIONS = [
+    ("vision", "lognormal:250:0.4"),
+    ("translate", "lognormal:120:0.3"),
+    ("gemini", "lognormal:1200:0.5"),
+]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=100, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per scenario first")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--files-per-request", type=int, default=2)
+    parser.add_argument("--corpus-size", type=int, default=0, help="distinct documents (0: every upload is new)")
+    parser.add_argument("--pdf-ratio", type=float, default=0.5)
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--text-layer-ratio", type=float, default=0.3, help="PDF pages with embedded text")
+    parser.add_argument("--image-size", default="800x1000", help="scanned page size in pixels, WIDTHxHEIGHT")
+    parser.add_argument("--timeout", type=float, default=300, help="per-request timeout in seconds")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the server's output")
+    for name, latency in BACKEND_OPTIONS:
+        parser.add_argument(f"--{name}-latency", default=latency,
+                            help="fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA (default %(default)s)")
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{name}-rate-limit", type=float, default=0, help="requests/s, 0 for unlimited")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.serve:
+        serve(args)
+        return
+    for name, _ in BACKEND_OPTIONS:
+        Latency(getattr(args, f"{name}_latency"))  # Fail on a bad spec before starting the server
+
+    # A corpus per upload scenario, so one scenario's documents are not cache hits in the next
+    uploads = (args.requests + args.warmup) * args.files_per_request
+    start = time.perf_counter()
+    corpora = {
+        scenario: make_corpus(args.corpus_size or uploads, args, seed=seed)
+        for seed, scenario in enumerate(args.scenarios) if scenario in ("process", "extract")
+    }
+    documents = [document for corpus in corpora.values() for document in corpus]
+    if documents:
+        print(f"{len(documents)} documents generated in {time.perf_counter() - start:.1f} s "
+              f"({sum(len(data) for _, _, data in documents) / len(documents) / 1024:.0f} KB average)")
+
+    port = free_port()
+    command = [sys.executable, os.path.abspath(__file__), "--serve", str(port)]
+    for name, _ in BACKEND_OPTIONS:
+        for option in ("latency", "error_rate", "rate_limit"):
+            command += [f"--{name}-{option.replace('_', '-')}", str(getattr(args, f"{name}_{option}"))]
+    output = None if args.verbose else subprocess.DEVNULL
+    server = subprocess.Popen(command, stdout=output, stderr=output)
+    results = {"config": {k: v for k, v in vars(args).items() if k not in ("serve", "json", "verbose")}, "scenarios": {}}
+    try:
+        start = time.perf_counter()
+        wait_until_ready(port, server, timeout=120)
+        results["startup_seconds"] = round(time.perf_counter() - start, 2)
+        print(f"server ready in {results['startup_seconds']} s, "
+              f"{args.concurrency} concurrent clients, {args.requests} requests per scenario\n")
+        print(f"{'scenario':<10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'RSS MB':>8} {'peak MB':>8}")
+
+        for scenario in args.scenarios:
+            corpus = corpora.get(scenario, [])
+            # Warm-up requests use their own documents so the measured ones are not cache hits
+            if args.warmup:
+                warmup_corpus = corpus[-args.warmup * args.files_per_request:] if not args.corpus_size else corpus
+                run_scenario(port, scenario, args.warmup, min(args.concurrency, args.warmup),
+                             warmup_corpus, args.files_per_request, args.timeout)
+            latencies, statuses, seconds = run_scenario(
+                port, scenario, args.requests, args.concurrency, corpus, args.files_per_request, args.timeout
+            )
+            rss, peak = server_memory_mb(server.pid)
+            errors = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+            row = {
+                "requests_per_second": round(len(latencies) / seconds, 2),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+                "errors": errors,
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+                "rss_mb": rss and round(rss, 1),
+                "peak_rss_mb": peak and round(peak, 1),
+            }
+            results["scenarios"][scenario] = row
+            print(f"{scenario:<10} {row['requests_per_second']:>8.2f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                  f"{row['p99_ms']:>9.1f} {errors:>7} {rss or float('nan'):>8.0f} {peak or float('nan'):>8.0f}")
+
+        # External call counts as the server recorded them
+        status, body = http_get(port, "/metrics")
+        if status == 200:
+            calls = re.findall(r'^fra_external_calls_total\{(.*)\} (\d+)$', body.decode("utf-8"), re.MULTILINE)
+            results["external_calls"] = {labels: int(count) for labels, count in calls}
+            print("\nexternal calls:")
+            for labels, count in calls:
+                print(f"  {labels}: {count}")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if results["scenarios"] and all(row["peak_rss_mb"] is None for row in results["scenarios"].values()):
+        # Off Linux, the peak of the whole server run is only known once it has exited
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak /= 1024 * 1024 if sys.platform == "darwin" else 1024  # bytes on macOS, KB elsewhere
+        print(f"\nserver peak RSS: {peak:.0f} MB")
+        results["server_peak_rss_mb"] = round(peak, 1)
+    if args.json:
+        with open(args.json, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Cost of the pipeline instrumentation against the stages it measures.
+
+Times an empty stage() and external_call() while a request breakdown is
+being collected (the fixed cost each instrumented call adds), the same
+with several threads recording at once, the resulting overhead on stages
+of the given durations, and how long a /metrics scrape takes to render.
+
+    python benchmarks/bench_metrics.py --threads 8 --stage-ms 1 10 100
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import registry, stage, external_call, start_request, end_request
+
+STAGES = ["ocr_pdf", "pdf_render", "normalize", "language_detection", "translation", "ner", "ner_patterns", "dss"]
+
+
+def instrumented_calls(kind, count):
+    """Seconds for `count` empty instrumented blocks of one kind in a fresh request context"""
+    token = start_request()
+    start = time.perf_counter()
+    if kind == "stage":
+        for i in range(count):
+            with stage(STAGES[i % len(STAGES)]):
+                pass
+    else:
+        for _ in range(count):
+            with external_call("gemini", "generate_content", sent=4000) as call:
+                call.received = 500
+    elapsed = time.perf_counter() - start
+    end_request(token)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000, help="instrumented calls per measurement")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--stage-ms", type=float, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    costs = {}
+    for kind in ("stage", "external_call"):
+        costs[kind] = instrumented_calls(kind, args.calls) / args.calls * 1e6
+        per_thread = args.calls // args.threads
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(lambda _: contextvars.copy_context().run(instrumented_calls, kind, per_thread),
+                          range(args.threads)))
+            threaded = (time.perf_counter() - start) / (per_thread * args.threads) * 1e6
+        print(f"{kind:<14} {costs[kind]:6.2f} µs per call, {threaded:6.2f} µs with {args.threads} threads recording")
+
+    # A stage usually wraps at most one external call
+    per_stage = costs["stage"] + costs["external_call"]
+    for stage_ms in args.stage_ms:
+        print(f"  overhead on a {stage_ms:g} ms stage with one external call: {per_stage / (stage_ms * 1000) * 100:.3f}%")
+
+    start = time.perf_counter()
+    text = registry.render()
+    print(f"/metrics render: {(time.perf_counter() - start) * 1000:.2f} ms, "
+          f"{len(text.splitlines())} lines, {len(text) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
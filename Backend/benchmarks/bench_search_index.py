@@ -0,0 +1,100 @@
+"""Indexing rate and query latency of the search index on synthetic documents.
+
+Builds --docs processed-document results (Zipf-distributed vocabulary plus
+survey numbers, villages, patta numbers and claim statuses as entities),
+then times typical reviewer queries and compares one against a linear scan
+of the stored results.
+
+    python benchmarks/bench_search_index.py --docs 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+VILLAGES = [f"Village{i}" for i in range(200)] + ["Kaltapally"]
+STATUSES = ["pending", "granted", "rejected", "pending verification", "approved"]
+
+
+def make_result(rng, vocabulary, cum_weights, words):
+    survey = f"{rng.randint(1, 400)}/{rng.randint(1, 9)}"
+    village = rng.choice(VILLAGES)
+    status = rng.choice(STATUSES)
+    patta = f"PAT-{rng.randint(0, 999999):06d}"
+    body = rng.choices(vocabulary, cum_weights=cum_weights, k=words)
+    body[rng.randrange(words)] = f"survey {survey} in {village} village, patta {patta}, claim {status}"
+    return {
+        "filename": f"claim_{rng.randint(0, 10**9)}.pdf",
+        "standardized_text": " ".join(body),
+        "translated_text": None,
+        "entities": {
+            "SURVEY_NUMBER": [survey],
+            "PLACE_NAME": [village],
+            "PATTA_NUMBER": [patta],
+            "CLAIM_STATUS": [status],
+        },
+    }
+
+
+def timed(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, np.percentile(times, 50) * 1000, np.percentile(times, 95) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200000)
+    parser.add_argument("--words", type=int, default=120, help="words per document")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"word{i}" for i in range(20000)]
+    cum_weights = np.cumsum([1 / (i + 1) for i in range(len(vocabulary))]).tolist()
+    stored = {f"doc_{i}": make_result(rng, vocabulary, cum_weights, args.words) for i in range(args.docs)}
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for key, result in stored.items():
+        index.add(key, result)
+    build_time = time.perf_counter() - start
+    stats = index.stats()
+    print(f"{args.docs} documents indexed in {build_time:.1f} s ({args.docs / build_time:,.0f} docs/s), "
+          f"{stats['terms']:,} terms, {stats['postings']:,} postings, "
+          f"{stats['index_bytes'] / 1e6:.0f} MB of posting arrays")
+
+    sample = next(r for r in stored.values() if r["entities"]["PLACE_NAME"] == ["Kaltapally"])
+    survey = sample["entities"]["SURVEY_NUMBER"][0]
+    queries = [
+        (f"survey {survey} Kaltapally", dict(query=f"survey {survey} Kaltapally")),
+        ("common terms (AND)", dict(query="word1 word2 word3")),
+        ("common terms (ANY)", dict(query="word1 word50", match="any")),
+        ("CLAIM_STATUS:pending", dict(filters=[("CLAIM_STATUS", "pending")])),
+        ("patta + status filters", dict(query="patta", filters=[("CLAIM_STATUS", "pending"), ("PLACE_NAME", "Kaltapally")])),
+        ("page 50 of a broad query", dict(query="word1", offset=49 * 20)),
+    ]
+    for label, kwargs in queries:
+        result, p50, p95 = timed(lambda: index.search(**kwargs), args.repeats)
+        print(f"  {label:<28} {result['total']:>8,} matches   p50 {p50:7.2f} ms   p95 {p95:7.2f} ms")
+
+    def linear_scan():
+        return [key for key, result in stored.items()
+                if survey in result["standardized_text"] and "Kaltapally" in result["standardized_text"]]
+    _, p50, _ = timed(linear_scan, 3)
+    print(f"  {'linear scan (substring)':<28} {'':>8}            p50 {p50:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Point lookup throughput of the spatial index over the survey polygons.
+
+Queries random points inside the survey layer's extent, verifies a sample
+against a brute-force ray cast over every polygon and reports points/s
+for the raw index, full lookups with properties and single-point calls.
+--tile N repeats the survey layer on an N x N grid to test larger layers.
+
+    python benchmarks/bench_spatial_index.py --points 200000 --tile 10
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_index import PolygonLayer, SpatialIndex, load_geojson
+
+SURVEYS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "geojson", "surveys.geojson")
+
+
+def tile_features(features, tiles):
+    """Copy the layer onto a tiles x tiles grid of shifted extents"""
+    coords = np.array([p for f in features for p in f["geometry"]["coordinates"][0]])
+    width, height = np.ptp(coords[:, 0]) * 1.01, np.ptp(coords[:, 1]) * 1.01
+    tiled = []
+    for i in range(tiles):
+        for j in range(tiles):
+            for feature in features:
+                shifted = copy.deepcopy(feature)
+                shifted["geometry"]["coordinates"] = [
+                    [[x + i * width, y + j * height] for x, y in ring] for ring in feature["geometry"]["coordinates"]
+                ]
+                tiled.append(shifted)
+    return tiled
+
+
+def brute_force(x, y, features):
+    """Indices of every polygon containing the point, by plain ray casting"""
+    found = []
+    for index, feature in enumerate(features):
+        inside = False
+        for ring in feature["geometry"]["coordinates"]:
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+                if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                    inside = not inside
+        if inside:
+            found.append(index)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=200000)
+    parser.add_argument("--tile", type=int, default=1, help="repeat the survey layer on an N x N grid")
+    parser.add_argument("--verify", type=int, default=2000, help="points checked against brute force")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    features = load_geojson(SURVEYS_PATH)
+    if args.tile > 1:
+        features = tile_features(features, args.tile)
+
+    start = time.perf_counter()
+    layer = PolygonLayer("survey", features)
+    build_time = time.perf_counter() - start
+    index = SpatialIndex({"survey": features})
+
+    coords = np.array([p for f in features for p in f["geometry"]["coordinates"][0]])
+    rng = np.random.default_rng(args.seed)
+    lon = rng.uniform(coords[:, 0].min(), coords[:, 0].max(), args.points)
+    lat = rng.uniform(coords[:, 1].min(), coords[:, 1].max(), args.points)
+
+    print(f"{len(layer)} polygons, {len(layer.x1)} edges, index built in {build_time * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    located = layer.locate(lon, lat)
+    locate_time = time.perf_counter() - start
+    print(f"  {'locate (bulk)':<24} {args.points / locate_time:12,.0f} points/s  "
+          f"({np.count_nonzero(located >= 0)} inside a polygon)")
+
+    start = time.perf_counter()
+    index.lookup_many(lon, lat)
+    lookup_time = time.perf_counter() - start
+    print(f"  {'lookup_many (bulk)':<24} {args.points / lookup_time:12,.0f} points/s")
+
+    singles = min(args.points, 5000)
+    start = time.perf_counter()
+    for i in range(singles):
+        index.lookup(lon[i], lat[i])
+    single_time = time.perf_counter() - start
+    print(f"  {'lookup (one point)':<24} {singles / single_time:12,.0f} points/s  "
+          f"{single_time / singles * 1e6:.1f} us/call")
+
+    mismatches = 0
+    for i in range(min(args.verify, args.points)):
+        expected = brute_force(lon[i], lat[i], features)
+        if (located[i] == -1) != (not expected) or (expected and located[i] not in expected):
+            mismatches += 1
+    if mismatches:
+        print(f"  {mismatches} MISMATCHES against brute force")
+        sys.exit(1)
+    print(f"  {min(args.verify, args.points)} sampled points match brute force")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Cold-start cost of the backend: importing main and the first use of each external client.
+
+Each measurement runs in a fresh interpreter (cwd Backend, so .env and the
+credentials resolve as they do for uvicorn) and reports the median of
+`--repeats` runs: wall time for `import main`, resident memory right after
+it, and how long the first request to touch Vision, Translate and Gemini
+waits for its client. Runs once with CLIENT_WARMUP off (creation happens on
+first use) and once with it on (creation starts in the background at
+startup, here simulated by calling warm_up() and waiting `--warmup-wait`
+seconds). `--importtime N` also lists the N slowest modules from
+`python -X importtime`.
+
+    python benchmarks/bench_startup.py --repeats 5 --importtime 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter; prints one JSON line
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+rss_mb = 0.0
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_mb = int(line.split()[1]) / 1024
+if WARMUP:
+    main.ocr_processor.vision.warm_up()
+    main.translation_service.translate.warm_up()
+    main.ner_extractor.gemini.warm_up()
+    time.sleep(WARMUP_WAIT)
+first_use = {}
+for name, get in (("vision", lambda: main.ocr_processor.client),
+                  ("translate", lambda: main.translation_service.translate_client),
+                  ("gemini", lambda: main.ner_extractor.gemini_model)):
+    start = time.perf_counter()
+    available = get() is not None
+    first_use[name] = {"seconds": time.perf_counter() - start, "available": available}
+print(json.dumps({"import_seconds": imported, "rss_mb": rss_mb, "first_use": first_use}))
+"""
+
+
+def run_child(warmup, warmup_wait):
+    """Measurements from one fresh interpreter"""
+    code = CHILD.replace("WARMUP_WAIT", repr(warmup_wait)).replace("WARMUP", repr(warmup))
+    env = dict(os.environ, CLIENT_WARMUP="false", HEALTH_PROBE_INTERVAL_SECONDS="0")
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(limit):
+    """The slowest modules by cumulative import time, in milliseconds"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+                            env=dict(os.environ, CLIENT_WARMUP="false"), capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, module.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def summarize(runs):
+    first_use = {name: statistics.median(run["first_use"][name]["seconds"] for run in runs)
+                 for name in runs[0]["first_use"]}
+    return {
+        "import_seconds": statistics.median(run["import_seconds"] for run in runs),
+        "rss_mb": statistics.median(run["rss_mb"] for run in runs),
+        "first_use_seconds": first_use,
+        "available": {name: info["available"] for name, info in runs[-1]["first_use"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup-wait", type=float, default=3.0,
+                        help="seconds between startup and the first request in the warm-up run")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="list the N slowest imports")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for label, warmup in (("lazy", False), ("warm-up", True)):
+        results[label] = summarize([run_child(warmup, args.warmup_wait) for _ in range(args.repeats)])
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<9} {'import':>9} {'rss':>8}   first use: {'vision':>8} {'translate':>10} {'gemini':>8}")
+    for label, result in results.items():
+        first_use = result["first_use_seconds"]
+        print(f"{label:<9} {result['import_seconds'] * 1000:7.0f}ms {result['rss_mb']:6.0f}MB"
+              f"   {'':>10} {first_use['vision'] * 1000:6.0f}ms {first_use['translate'] * 1000:8.0f}ms"
+              f" {first_use['gemini'] * 1000:6.0f}ms")
+    available = results["lazy"]["available"]
+    print("clients available: " + ", ".join(f"{name}={'yes' if ok else 'no'}" for name, ok in available.items()))
+
+    if args.importtime:
+        print("\nslowest imports (cumulative):")
+        for ms, module in import_times(args.importtime):
+            print(f"  {ms:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
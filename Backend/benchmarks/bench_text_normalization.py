@@ -0,0 +1,150 @@
+"""Throughput benchmark for text normalization on synthetic OCR corpora.
+
+Compares the original multi-pass clean_text/standardize_spacing with the
+precompiled TextNormalizer on English and Telugu OCR-like text, checks the
+outputs are identical and reports MB/s.
+
+    python benchmarks/bench_text_normalization.py --docs 200 --pages 80
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_normalizer import TextNormalizer
+
+
+def legacy_clean_text(text):
+    """clean_text as it was before TextNormalizer"""
+    if not text:
+        return ""
+
+    text = unicodedata.normalize('NFKD', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s\-.,;:()\[\]{}\'"/\\]', ' ', text)
+
+    replacements = {
+        r'\bl\b': 'I',
+        r'\b0\b': 'O',
+        r'rn': 'm',
+        r'[|!]': 'l',
+    }
+
+    for pattern, replacement in replacements.items():
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def legacy_standardize_spacing(text):
+    """standardize_spacing as it was before TextNormalizer"""
+    if not text:
+        return ""
+
+    text = re.sub(r'\r\n|\r|\n', ' ', text)
+    text = re.sub(r'\s*([,.;:!?])\s*', r'\1 ', text)
+    text = re.sub(r'\s{2,}', ' ', text)
+
+    return text.strip()
+
+
+ENGLISH_WORDS = (
+    "Form claim forest rights village district mandal survey number patta holder name father "
+    "land area hectares granted pending verified committee gram sabha tribal welfare officer "
+    "signature date Kaltapally Adilabad Telangana Ramesh Sothan cultivation occupation since"
+).split()
+
+TELUGU_WORDS = (
+    "అటవీ హక్కుల దావా గ్రామం జిల్లా మండలం సర్వే సంఖ్య పట్టా దారుడు పేరు తండ్రి భూమి విస్తీర్ణం "
+    "హెక్టార్లు మంజూరు పెండింగ్ ధృవీకరించబడింది కమిటీ గ్రామసభ గిరిజన సంక్షేమ అధికారి సంతకం తేదీ"
+).split()
+
+OCR_NOISE = ["|", "!", "rn", " l ", " 0 ", "  ", "\n", "\r\n", "\t", " , ", " .", ";", ":", "—", "•", "©", "ﬁ", "①"]
+
+
+def make_page(rng, words, n_words):
+    """Build one page of OCR-like text with line breaks, numbers and recognition noise"""
+    tokens = []
+    for i in range(n_words):
+        roll = rng.random()
+        if roll < 0.08:
+            tokens.append(rng.choice(OCR_NOISE))
+        elif roll < 0.14:
+            tokens.append(f"{rng.randint(1, 999)}/{rng.randint(1, 9)}")
+        elif roll < 0.17:
+            tokens.append(f"PAT-{rng.randint(0, 999999):06d}")
+        else:
+            tokens.append(rng.choice(words))
+        if i % 12 == 11:
+            tokens.append("\n")
+    return " ".join(tokens)
+
+
+def make_corpus(rng, words, docs, pages, words_per_page):
+    return [
+        "".join(f"\n--- Page {p + 1} ---\n{make_page(rng, words, words_per_page)}\n" for p in range(pages))
+        for _ in range(docs)
+    ]
+
+
+def run_legacy(texts):
+    out = []
+    for text in texts:
+        cleaned = legacy_clean_text(text)
+        out.append((cleaned, legacy_standardize_spacing(cleaned)))
+    return out
+
+
+def measure(label, func, texts, repeat):
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+    best = float("inf")
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(texts)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<28} {best * 1000:9.1f} ms  {size_mb / best:8.2f} MB/s")
+    return output, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50, help="documents per corpus")
+    parser.add_argument("--pages", type=int, default=80, help="pages per document")
+    parser.add_argument("--words", type=int, default=250, help="words per page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for the batch run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpora = {
+        "english": make_corpus(rng, ENGLISH_WORDS, args.docs, args.pages, args.words),
+        "telugu": make_corpus(rng, TELUGU_WORDS + ENGLISH_WORDS[:6], args.docs, args.pages, args.words),
+    }
+
+    engine = TextNormalizer()
+    batch_engine = TextNormalizer(batch_workers=args.workers, parallel_min_texts=2)
+
+    for name, texts in corpora.items():
+        size_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+        print(f"\n{name} corpus: {len(texts)} docs, {size_mb:.1f} MB")
+
+        expected, legacy_time = measure("legacy multi-pass", run_legacy, texts, args.repeat)
+        single, single_time = measure("TextNormalizer", engine.normalize_batch, texts, args.repeat)
+        batched, _ = measure(f"TextNormalizer batch x{args.workers}", batch_engine.normalize_batch, texts, args.repeat)
+
+        if single != expected or batched != expected:
+            print("  OUTPUT MISMATCH against legacy implementation")
+            sys.exit(1)
+        print(f"  outputs identical, speedup {legacy_time / single_time:.2f}x (single process)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Vector tile generation speed and payload size for the survey layer.
+
+Renders every tile covering the layer at each zoom level, reports tiles/s
+cold and from the tile cache, and compares the bytes a viewport of 4x3
+tiles downloads with the size of the full GeoJSON file. --tile N repeats
+the survey layer on an N x N grid to simulate larger datasets.
+
+    python benchmarks/bench_vector_tiles.py --zooms 8 10 12 14 16 --tile 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_index import load_geojson
+from vector_tiles import VectorTileServer, TileCache
+from bench_spatial_index import SURVEYS_PATH, tile_features
+
+
+def covering_tiles(layer, z):
+    """Every (x, y) tile overlapping the layer's extent at zoom z"""
+    tiles = 2 ** z
+    minx, miny = layer.boxes[:, 0].min(), layer.boxes[:, 1].min()
+    maxx, maxy = layer.boxes[:, 2].max(), layer.boxes[:, 3].max()
+    return [
+        (x, y)
+        for x in range(int(minx * tiles), int(maxx * tiles) + 1)
+        for y in range(int(miny * tiles), int(maxy * tiles) + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zooms", type=int, nargs="+", default=[8, 10, 12, 14, 16])
+    parser.add_argument("--tile", type=int, default=1, help="repeat the survey layer on an N x N grid")
+    parser.add_argument("--max-tiles", type=int, default=2000, help="tiles rendered per zoom level at most")
+    args = parser.parse_args()
+
+    features = load_geojson(SURVEYS_PATH)
+    if args.tile > 1:
+        features = tile_features(features, args.tile)
+    geojson_bytes = len(json.dumps({"type": "FeatureCollection", "features": features}).encode("utf-8"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        server = VectorTileServer({"survey": features}, version="bench", cache=TileCache(directory=directory))
+        layer = server.layers["survey"]
+        print(f"{len(layer)} polygons, {geojson_bytes / 1024:.0f} KB as GeoJSON, "
+              f"projected in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for z in args.zooms:
+            tiles = covering_tiles(layer, z)[:args.max_tiles]
+            start = time.perf_counter()
+            sizes = np.array([len(server.tile("survey", z, x, y)) for x, y in tiles])
+            cold = time.perf_counter() - start
+
+            server.cache._entries.clear()
+            server.cache.memory_bytes = 0
+            start = time.perf_counter()
+            for x, y in tiles:
+                server.tile("survey", z, x, y)
+            disk = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for x, y in tiles:
+                server.tile("survey", z, x, y)
+            memory = time.perf_counter() - start
+
+            # A 1024 x 768 viewport sees about 4 x 3 tiles; take the busiest ones as the worst case
+            viewport = np.sort(sizes)[-12:].sum()
+            print(f"  z{z:<3} {len(tiles):5d} tiles  cold {len(tiles) / cold:9,.0f}/s  "
+                  f"disk {len(tiles) / disk:9,.0f}/s  memory {len(tiles) / memory:10,.0f}/s  "
+                  f"max tile {sizes.max() / 1024:7.1f} KB  viewport <= {viewport / 1024:7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
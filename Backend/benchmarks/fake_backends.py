@@ -0,0 +1,239 @@
+"""In-process stand-ins for the Vision, Translate and Gemini clients used by the load benchmark.
+
+Each fake has the methods the backend calls, answers with plausible FRA
+document text, translations and entity JSON, and behaves like a remote
+service: every call waits for a latency drawn from a distribution, fails
+with a configurable probability and is refused once a requests-per-second
+limit is exceeded.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+
+# OCR output: a Telugu heading (so detection and translation run) plus English fields for NER
+DOCUMENT_TEMPLATE = (
+    "అటవీ హక్కుల చట్టం క్రింద దావా. గ్రామ సభ తీర్మానం ఆమోదించబడింది.\n"
+    "FOREST RIGHTS ACT - CLAIM FORM {form}\n"
+    "Name of the claimant: {name}\n"
+    "Father's name: {father}\n"
+    "Village: {village}, Mandal: {mandal}, District: Adilabad, State: Telangana\n"
+    "Survey No. {survey}   Patta No. PAT-{patta:06d}\n"
+    "Extent of land: {area} hectares   Date of application: {day:02d}/{month:02d}/2023\n"
+    "Claim status: {status}\n"
+    "Verified by the Forest Rights Committee of {village} on {day:02d}/{month:02d}/2024.\n"
+)
+
+NAMES = ["Ramesh Kumar", "Lakshmi Bai", "Soyam Bheemu", "Kodapa Sita", "Atram Raju", "Madavi Jangu"]
+VILLAGES = ["Kaltapally", "Gundala", "Jainoor", "Sirpur", "Utnoor", "Indravelli"]
+STATUSES = ["pending", "granted", "rejected", "pending verification"]
+
+# One document of a packed NER prompt (see ner_scheduler.build_multi_document_prompt)
+_PACKED_DOCUMENT = re.compile(r"=== (DOC_\d+) ===\n(.*?)\n=== END \1 ===", re.DOTALL)
+
+
+def document_text(seed):
+    """Deterministic synthetic document text for a seed (bytes or str)"""
+    digest = hashlib.sha256(seed if isinstance(seed, bytes) else seed.encode("utf-8")).digest()
+    rng = random.Random(digest)
+    village = rng.choice(VILLAGES)
+    return DOCUMENT_TEMPLATE.format(
+        form=rng.randint(1, 9999),
+        name=rng.choice(NAMES),
+        father=rng.choice(NAMES),
+        village=village,
+        mandal=rng.choice(VILLAGES),
+        survey=f"{rng.randint(1, 400)}/{rng.randint(1, 9)}",
+        patta=rng.randint(0, 999999),
+        area=round(rng.uniform(0.2, 4.0), 2),
+        day=rng.randint(1, 28),
+        month=rng.randint(1, 12),
+        status=rng.choice(STATUSES),
+    )
+
+
+class Latency:
+    """Latency distribution in milliseconds, parsed from a spec.
+
+    `fixed:MS`, `uniform:LOW:HIGH` or `lognormal:MEDIAN:SIGMA` (a long
+    right tail, like real API latency).
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        params = [float(p) for p in params]
+        if kind == "fixed" and len(params) == 1:
+            self._draw = lambda rng: params[0]
+        elif kind == "uniform" and len(params) == 2:
+            self._draw = lambda rng: rng.uniform(params[0], params[1])
+        elif kind == "lognormal" and len(params) == 2:
+            mu = math.log(max(params[0], 1e-3))
+            self._draw = lambda rng: rng.lognormvariate(mu, params[1])
+        else:
+            raise ValueError(f"Unknown latency spec {spec!r}; use fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA")
+
+    def seconds(self, rng):
+        return max(0.0, self._draw(rng)) / 1000
+
+
+class FakeServiceError(Exception):
+    """Error raised by a fake backend, carrying an HTTP-like status code"""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeService:
+    """Latency, error rate and rate limit shared by the calls of one fake backend"""
+
+    def __init__(self, name, latency="fixed:0", error_rate=0.0, rate_limit=0, seed=0):
+        """`rate_limit` is requests per second (0 for unlimited), enforced with a one-second token bucket"""
+        self.name = name
+        self.latency = Latency(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._rng = random.Random(seed)
+        self._tokens = float(rate_limit)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self.counts = {"calls": 0, "errors": 0, "rate_limited": 0}
+
+    def _admit(self):
+        """Return the delay for one call, or raise if it is rate limited or fails"""
+        with self._lock:
+            self.counts["calls"] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(float(self.rate_limit), self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens < 1:
+                    self.counts["rate_limited"] += 1
+                    raise FakeServiceError(429, f"{self.name}: quota exceeded")
+                self._tokens -= 1
+            delay = self.latency.seconds(self._rng)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.counts["errors"] += 1
+        return delay, failed
+
+    def call(self):
+        """Block like a remote call"""
+        delay, failed = self._admit()
+        time.sleep(delay)
+        if failed:
+            raise FakeServiceError(503, f"{self.name}: backend unavailable")
+
+    async def call_async(self):
+        delay, failed = self._admit()
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeServiceError(503, f"{self.name}: backend unavailable")
+
+
+class _Obj:
+    """Attribute bag standing in for protobuf responses"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def _annotation(content):
+    return _Obj(
+        error=_Obj(message=""),
+        full_text_annotation=_Obj(text=document_text(content)),
+    )
+
+
+class FakeVisionClient:
+    """Stands in for vision.ImageAnnotatorClient: text detection on single images and batches"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def document_text_detection(self, image):
+        self.service.call()
+        return _annotation(getattr(image, "content", b"") or b"")
+
+    def batch_annotate_images(self, requests):
+        self.service.call()
+        return _Obj(responses=[_annotation(getattr(getattr(r, "image", None), "content", b"") or b"") for r in requests])
+
+
+class FakeTranslateClient:
+    """Stands in for translate_v2.Client"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def detect_language(self, text):
+        self.service.call()
+        telugu = any("\u0c00" <= ch <= "\u0c7f" for ch in text)
+        return {"language": "te" if telugu else "en", "confidence": 0.95, "input": text}
+
+    def translate(self, values, target_language="en", source_language=None, format_=None):
+        self.service.call()
+        single = isinstance(values, str)
+        # Keep the Latin fields and replace other scripts, so NER still finds the claim details
+        results = [
+            {"translatedText": re.sub(r"[^\x00-\x7f]+", "forest rights", value), "input": value}
+            for value in ([values] if single else values)
+        ]
+        return results[0] if single else results
+
+    def get_languages(self):
+        self.service.call()
+        return [{"language": code} for code in ("en", "hi", "te", "or", "kn", "ta", "mr", "bn")]
+
+
+def _entities(text):
+    """Entity dict a model could plausibly return for one document"""
+    names = [name for name in NAMES if name in text]
+    villages = [village for village in VILLAGES if village in text]
+    return {
+        "PATTA_HOLDER_NAME": names[:1],
+        "PERSON": names[1:],
+        "PLACE_NAME": villages + (["Adilabad", "Telangana"] if "Adilabad" in text else []),
+        "ORGANIZATION": ["Forest Rights Committee"] if "Committee" in text else [],
+        "CLAIM_STATUS": [status for status in STATUSES if status in text][:1],
+    }
+
+
+class FakeGeminiModel:
+    """Stands in for genai.GenerativeModel: NER prompts get entity JSON, anything else a short answer"""
+
+    def __init__(self, service, stream_chunks=8):
+        self.service = service
+        self.stream_chunks = stream_chunks
+
+    def _reply(self, prompt):
+        documents = _PACKED_DOCUMENT.findall(prompt)
+        if documents:
+            return json.dumps({doc_id: _entities(text) for doc_id, text in documents})
+        if "EXACT JSON" in prompt:
+            return json.dumps(_entities(prompt))
+        return ("Based on the documents, the claimant may be eligible for PM-KISAN and the "
+                "Van Dhan Vikas Yojana once the Forest Rights Committee verifies the claim.")
+
+    def generate_content(self, prompt):
+        self.service.call()
+        return _Obj(text=self._reply(prompt))
+
+    async def generate_content_async(self, prompt, stream=False):
+        await self.service.call_async()
+        reply = self._reply(prompt)
+        if not stream:
+            return _Obj(text=reply)
+
+        async def chunks():
+            step = max(1, len(reply) // self.stream_chunks)
+            for start in range(0, len(reply), step):
+                await asyncio.sleep(0)
+                yield _Obj(text=reply[start:start + step])
+        return chunks()
@@ -0,0 +1,148 @@
+import re
+import unicodedata
+
+from metrics import external_call
+from result_cache import make_cache_key
+
+
+# Bump when the prompt changes so cached answers from the old prompt are not served
+PROMPT_VERSION = 1
+
+FALLBACK_REPLY = "I couldn't generate a proper response. Please rephrase your question about Central Sector Schemes."
+UNAVAILABLE_REPLY = "⚠️ Gemini API not available. Cannot generate response."
+ERROR_REPLY = "⚠️ I'm having trouble connecting to my knowledge base. Try again later."
+
+_NON_WORD = re.compile(r"[\W_]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    """Case-, punctuation- and spacing-insensitive form of a question used for cache keys"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def normalize_context(text):
+    """OCR context with whitespace runs collapsed, so re-extracted copies hash the same"""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def build_chat_prompt(question, context=""):
+    """Prompt for the FRA-CSS assistant with the user's extracted document data"""
+    return (
+        f"You are an expert assistant for the Forest Rights Act (FRA) Decision Support System "
+        f"focusing exclusively on Central Sector Schemes (CSS).\n\n"
+        f"CONTEXT: FRA OCR Extracted Data:\n{context}\n\n"
+        f"INSTRUCTIONS:\n"
+        f"- Only discuss Central Sector Schemes like PM-KISAN, MGNREGA, Jal Jeevan Mission, Ayushman Bharat PM-JAY, PMAY-G, PM-KUSUM, Swachh Bharat Mission, etc.\n"
+        f"- Provide specific eligibility criteria, application processes, and benefits.\n"
+        f"- Reference the user's extracted data when relevant (name, location, land area, etc.)\n"
+        f"- Keep responses concise (2-4 sentences)\n"
+        f"- Include actionable next steps\n"
+        f"- Use a helpful, professional tone\n\n"
+        f"USER QUESTION: {question}"
+    )
+
+
+def clean_reply(text):
+    """Strip whitespace and any code block fence around a model reply"""
+    reply = (text or "").strip()
+    if reply.startswith("```"):
+        reply = reply.strip("```").strip()
+    return reply
+
+
+def _chunk_text(chunk):
+    """Text of one streamed response chunk; chunks without text parts (e.g. safety stops) give ''"""
+    try:
+        return chunk.text or ""
+    except ValueError:
+        return ""
+
+
+class ChatAssistant:
+    """Answers scheme questions with Gemini's async client, streaming or whole.
+
+    Finished replies are cached in the result cache under the normalized
+    question plus a hash of the normalized OCR context, so frequently asked
+    questions (e.g. PM-KISAN eligibility with no document loaded) return
+    without a model call. Only complete, non-empty replies are cached.
+    """
+
+    def __init__(self, get_model, model_name, cache, cache_enabled=True):
+        """Initialize with a callable returning the Gemini model (or None) and a ResultCache"""
+        self.get_model = get_model
+        self.model_name = model_name
+        self.cache = cache
+        self.cache_enabled = cache_enabled
+
+    def cache_key(self, question, context=""):
+        context_hash = make_cache_key(normalize_context(context))
+        return make_cache_key(normalize_question(question), context_hash, self.model_name, PROMPT_VERSION)
+
+    def cached(self, question, context=""):
+        """Cached reply for the question, or None"""
+        if not self.cache_enabled:
+            return None
+        entry = self.cache.get("chat", self.cache_key(question, context))
+        return entry["bot_reply"] if entry else None
+
+    def _store(self, question, context, reply):
+        if self.cache_enabled and reply:
+            self.cache.set("chat", self.cache_key(question, context), {"bot_reply": reply})
+
+    async def reply(self, question, context=""):
+        """Return (reply, cached) for one question"""
+        cached = self.cached(question, context)
+        if cached is not None:
+            return cached, True
+
+        model = self.get_model()
+        if model is None:
+            return UNAVAILABLE_REPLY, False
+
+        prompt = build_chat_prompt(question, context)
+        with external_call("gemini", "chat", sent=len(prompt)) as call:
+            response = await model.generate_content_async(prompt)
+            reply = clean_reply(_chunk_text(response))
+            call.received = len(reply)
+        self._store(question, context, reply)
+        return reply or FALLBACK_REPLY, False
+
+    async def stream(self, question, context=""):
+        """Yield (event, data) pairs: `token` events as text arrives, then one `done` or `error`.
+
+        A cached reply is sent as a single token. The `done` event carries the
+        cleaned full reply, which clients should show in place of the tokens.
+        """
+        cached = self.cached(question, context)
+        if cached is not None:
+            yield "token", {"text": cached}
+            yield "done", {"bot_reply": cached, "cached": True}
+            return
+
+        model = self.get_model()
+        if model is None:
+            yield "error", {"bot_reply": UNAVAILABLE_REPLY}
+            return
+
+        parts = []
+        prompt = build_chat_prompt(question, context)
+        with external_call("gemini", "chat_stream", sent=len(prompt)) as call:
+            try:
+                response = await model.generate_content_async(prompt, stream=True)
+                async for chunk in response:
+                    text = _chunk_text(chunk)
+                    if text:
+                        parts.append(text)
+                        call.received += len(text)
+                        yield "token", {"text": text}
+            except Exception as e:
+                print(f"Chat stream error: {str(e)}")
+                call.failed = True
+                yield "error", {"bot_reply": ERROR_REPLY}
+                return
+
+        reply = clean_reply("".join(parts))
+        self._store(question, context, reply)
+        yield "done", {"bot_reply": reply or FALLBACK_REPLY, "cached": False}
@@ -0,0 +1,292 @@
+import csv
+import io
+import json
+import os
+import re
+from operator import itemgetter
+
+import numpy as np
+
+from rule_engine import RuleEngine, pack_masks
+
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scheme_rules.json")
+
+_default_rules = None
+
+
+def default_rules():
+    """Rule engine over the bundled scheme_rules.json, created on first use"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = RuleEngine(DEFAULT_RULES_PATH)
+    return _default_rules
+
+
+# DSS function for FRA schemes
+def fra_dss(claimant, rules=None):
+    """Eligible schemes for one claimant dict, in rule-file order"""
+    return (rules or default_rules()).plan().eligible(claimant)
+
+
+# Claimant fields echoed back in batch results, in addition to the fields the rules read
+IDENTITY_FIELDS = {
+    "Name": "text",
+    "Village": "text",
+    "District": "text",
+}
+
+# Alternative column names, e.g. the properties used in public/demo_claims.geojson
+FIELD_ALIASES = {
+    "name": "Name",
+    "areaha": "Land Area (hectares)",
+    "landarea": "Land Area (hectares)",
+    "status": "Claim Status",
+    "claimstatus": "Claim Status",
+}
+
+_TRUE_STRINGS = {"true", "yes", "y", "1", "t"}
+
+
+def _field_key(name):
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def claimant_fields(plan):
+    """Field name -> column kind (text, number or flag) for a compiled rule plan"""
+    return {**IDENTITY_FIELDS, **plan.field_kinds}
+
+
+def _to_number(value):
+    if value is None or value == "":
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _parse_distinct(values, parse, dtype):
+    """Parse each distinct value once; CSV columns repeat a few flag and status strings"""
+    try:
+        parsed = {value: parse(value) for value in set(values)}
+    except TypeError:  # unhashable JSON values
+        return np.fromiter(map(parse, values), dtype=dtype, count=len(values))
+    return np.fromiter(map(parsed.__getitem__, values), dtype=dtype, count=len(values))
+
+
+def _build_column(kind, values, types=None):
+    if types is None:
+        types = set(map(type, values))
+    if kind == "number":
+        if types <= {int, float, type(None)}:
+            # None converts to NaN, all in one C-level pass
+            return np.array(values, dtype=np.float64)
+        if types == {str}:
+            try:
+                return np.fromiter(map(float, values), dtype=np.float64, count=len(values))
+            except ValueError:  # blanks or text, parsed value by value below
+                pass
+        return _parse_distinct(values, _to_number, np.float64)
+    if kind == "flag":
+        if types <= {bool, int, type(None)}:
+            return np.array(values, dtype=bool)
+        return _parse_distinct(values, _to_flag, bool)
+    if not types <= {str}:
+        values = ["" if v is None else str(v) for v in values]
+    return np.array(values, dtype=object)
+
+
+def _source_columns(names, fields):
+    """Map each claimant field to the first input column name that matches it"""
+    lookup = {_field_key(field): field for field in fields}
+    lookup.update({alias: field for alias, field in FIELD_ALIASES.items() if field in fields})
+    sources = {}
+    for name in names:
+        field = lookup.get(_field_key(name))
+        if field and field not in sources:
+            sources[field] = name
+    return sources
+
+
+def columns_from_records(records, fields):
+    """Build one NumPy column per claimant field from a list of dicts.
+
+    Column names are matched case- and punctuation-insensitively, so
+    "Village ST Percentage", "village_st_percentage" and aliases such as
+    the demo GeoJSON's "area_ha" all work. Missing numbers become NaN and
+    missing flags False, so no rule fires on absent data.
+    """
+    # Match distinct keys only; records from one source nearly always share them
+    sources = _source_columns(sorted(set().union(*records), key=str), fields)
+
+    columns = {}
+    for field, kind in fields.items():
+        key = sources.get(field)
+        if key is None:
+            values = [None] * len(records)
+        else:
+            try:
+                values = list(map(itemgetter(key), records))
+            except KeyError:
+                values = [record.get(key) for record in records]
+        columns[field] = _build_column(kind, values)
+    return columns
+
+
+def columns_from_cells(header, cells, fields):
+    """Build claimant columns from a header and one list of string cells per header column"""
+    sources = _source_columns(header, fields)
+    total = len(cells[0]) if cells else 0
+
+    columns = {}
+    for field, kind in fields.items():
+        name = sources.get(field)
+        if name is None:
+            columns[field] = _build_column(kind, [None] * total)
+        else:
+            columns[field] = _build_column(kind, cells[header.index(name)], {str} if total else set())
+    return columns
+
+
+def split_plain_csv(data):
+    """(header, cells per column) for CSV text that uses no quoting, or None if it needs csv.reader.
+
+    Splitting the whole text at once and slicing out every column avoids
+    creating a list per row, which dominates loading large exports.
+    """
+    if '"' in data:
+        return None
+    newline = "\r\n" if "\r\n" in data else "\n"
+    lines = data.split(newline)
+    # Any other carriage return or line feed is a line break to csv.reader too
+    breaks = len(lines) - 1
+    if data.count("\n") != breaks or data.count("\r") != (breaks if newline == "\r\n" else 0):
+        return None
+    if not lines[-1]:
+        lines.pop()
+    if not lines:
+        return None
+    header = lines[0].split(",")
+    width = len(header)
+    # Blank or ragged rows would shift cells between columns; csv.reader handles those
+    if "" in lines or not all(line.count(",") == width - 1 for line in lines):
+        return None
+    cells = ",".join(lines[1:]).split(",") if len(lines) > 1 else []
+    return header, [cells[i::width] for i in range(width)]
+
+
+def columns_from_rows(header, rows, fields):
+    """Build claimant columns from a header and row lists, e.g. from csv.reader"""
+    sources = _source_columns(header, fields)
+
+    columns = {}
+    for field, kind in fields.items():
+        name = sources.get(field)
+        if name is None:
+            values = [None] * len(rows)
+        else:
+            position = header.index(name)
+            try:
+                values = list(map(itemgetter(position), rows))
+            except IndexError:  # short rows
+                values = [row[position] if position < len(row) else None for row in rows]
+        columns[field] = _build_column(kind, values)
+    return columns
+
+
+def load_claimants(data, filename="", fields=None):
+    """Parse CSV, GeoJSON (feature properties) or a JSON array of claimants into columns.
+
+    `fields` defaults to the fields read by the bundled rule file.
+    """
+    if fields is None:
+        fields = claimant_fields(default_rules().plan())
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+
+    stripped = data.lstrip()
+    if filename.lower().endswith(".csv") or not stripped.startswith(("[", "{")):
+        plain = split_plain_csv(data)
+        if plain is not None:
+            return columns_from_cells(*plain, fields)
+        reader = csv.reader(io.StringIO(data))
+        header = next(reader, [])
+        return columns_from_rows(header, [row for row in reader if row], fields)
+    else:
+        parsed = json.loads(data)
+        if isinstance(parsed, dict) and parsed.get("type") == "FeatureCollection":
+            records = [feature.get("properties") or {} for feature in parsed.get("features", [])]
+        elif isinstance(parsed, dict):
+            records = parsed.get("claimants", [parsed])
+        else:
+            records = parsed
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("Expected a JSON array of claimant objects")
+    return columns_from_records(records, fields)
+
+
+def evaluate_batch(columns, plan=None, include_claimants=True, explain=False):
+    """Evaluate the scheme rules over all claimants at once.
+
+    Each predicate of the compiled plan is one vectorized mask and each
+    scheme's condition is boolean array operations over those masks, so
+    scheme counts never leave NumPy. Scheme lists (plus traces with
+    `explain`) are built once per distinct combination of results.
+
+    Returns {"total_claimants", "scheme_counts", "claimants"}.
+    """
+    if plan is None:
+        plan = default_rules().plan()
+    total = len(columns["Name"])
+
+    predicate_masks = plan.predicate_masks(columns)
+    scheme_masks = plan.scheme_masks(predicate_masks, total)
+
+    scheme_counts = {name: 0 for name, _, _ in plan.schemes}
+    for (name, _, _), mask in zip(plan.schemes, scheme_masks):
+        scheme_counts[name] += int(np.count_nonzero(mask))
+
+    result = {
+        "total_claimants": total,
+        "scheme_counts": scheme_counts,
+    }
+
+    if include_claimants:
+        if explain:
+            # Traces name the predicates that fired, so group claimants by predicate pattern
+            patterns, inverse = np.unique(pack_masks(predicate_masks, total), return_inverse=True)
+            pattern_results = [plan.pattern(code) for code in patterns.tolist()]
+            scheme_lists = [schemes for schemes, _ in pattern_results]
+        else:
+            patterns, inverse = np.unique(pack_masks(scheme_masks, total), return_inverse=True)
+            names = [name for name, _, _ in plan.schemes]
+            scheme_lists = [[name for j, name in enumerate(names) if code >> j & 1] for code in patterns.tolist()]
+
+        inverse = inverse.reshape(-1).tolist()
+        claimants = [
+            {
+                "index": i,
+                "name": name,
+                "village": village,
+                "district": district,
+                "eligible_schemes": scheme_lists[pattern],
+            }
+            for i, (name, village, district, pattern) in enumerate(zip(
+                columns["Name"].tolist(),
+                columns["Village"].tolist(),
+                columns["District"].tolist(),
+                inverse
+            ))
+        ]
+        if explain:
+            for entry, pattern in zip(claimants, inverse):
+                entry["explanations"] = pattern_results[pattern][1]
+        result["claimants"] = claimants
+    return result
@@ -0,0 +1,133 @@
+import re
+
+
+# Entity types with a strict enough surface form to extract without the LLM
+PATTERN_ENTITY_KEYS = [
+    "PATTA_NUMBER",
+    "COORDINATES",
+    "DATE",
+    "LAND_AREA",
+    "SURVEY_NUMBER",
+    "PHONE_NUMBER",
+    "EMAIL",
+]
+
+_MONTHS = (
+    "Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|"
+    "Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?"
+)
+
+_AREA_UNITS = (
+    r"hectares?|ha|acres?|ac|guntas?|cents?|bighas?|"
+    r"sq\.?\s?(?:m|mtrs?|meters?|metres?|ft|feet|yards?|yds?)|"
+    r"square\s+(?:meters?|metres?|feet|yards?)"
+)
+
+_LAND_AREA = re.compile(rf"\b\d+(?:\.\d+)?\s*(?:{_AREA_UNITS})(?![a-z])", re.IGNORECASE)
+_SURVEY_KEYWORDS = re.compile(
+    r"\b(?:Survey|Sy|S\.?\s?No|Khasra|Khata|Plot|Sub[-\s]?div(?:ision)?)\b", re.IGNORECASE
+)
+_PAGE_PREFIX = re.compile(r"\b(?:Page|Pg|Sheet|p\.)\s*(?:No\.?)?\s*$", re.IGNORECASE)
+
+_LAT_LONG_LABEL = r"(Lat(?:itude)?|Long(?:itude)?|Lng)\.?\s*[:=]?\s*(-?\d{1,3}\.\d{3,})\s*°?\s*([NSEW](?![a-z]))?"
+
+
+def _survey_number(match):
+    """Labelled survey number with the spaces around its separators removed ("45 / 2" -> "45/2")"""
+    return re.sub(r"\s+", "", match.group(1))
+
+
+def _bare_survey_number(match):
+    """Accept a bare "45/2" only after a survey keyword or in a table row with a land area, never as a page count"""
+    text = match.string
+    line_start = text.rfind("\n", 0, match.start()) + 1
+    line_end = text.find("\n", match.end())
+    if line_end == -1:
+        line_end = len(text)
+    before = text[line_start:match.start()]
+    if _PAGE_PREFIX.search(before):
+        return None
+    if not _SURVEY_KEYWORDS.search(before) and not _LAND_AREA.search(text, line_start, line_end):
+        return None
+    return match.group()
+
+
+def _lat_long_pair(match):
+    """Join labelled latitude and longitude into one "lat, lon" value parse_coordinates reads"""
+    first_label, first, first_hemisphere, second_label, second, second_hemisphere = match.groups()
+    first_is_lat = first_label.lower().startswith("lat")
+    if first_is_lat == second_label.lower().startswith("lat"):
+        return None
+    if not first_is_lat:
+        first, first_hemisphere, second, second_hemisphere = second, second_hemisphere, first, first_hemisphere
+    return f"{first}{' ' + first_hemisphere if first_hemisphere else ''}, " \
+           f"{second}{' ' + second_hemisphere if second_hemisphere else ''}"
+
+
+# Each key maps to patterns whose group 1 (or whole match) is the entity value, or to
+# (pattern, formatter) pairs where formatter(match) returns the value or None to reject it
+_PATTERNS = {
+    "PATTA_NUMBER": [
+        re.compile(r"\b(?:PAT|REG|FRA|IFR|CFR|ROR)[-/][A-Z0-9]*\d[A-Z0-9/-]*", re.IGNORECASE),
+        re.compile(r"\bPatta\s*(?:No\.?|Number|#)\s*[:\-]?\s*([A-Z0-9]*\d[A-Z0-9/-]*)", re.IGNORECASE),
+    ],
+    "SURVEY_NUMBER": [
+        # Sub-divisions may be numbers or letters: 45/2, 45 / 2, 45/2B, 102/A, 12-A1
+        (re.compile(r"\b(?:Survey|Sy\.?|S\.\s?No\.?)\s*(?:No\.?|Number|#)?\s*[:\-]?\s*"
+                    r"(\d+[A-Z]?(?:(?:\s*/\s*|-)(?:\d+[A-Z]?|[A-Z]\d*)(?![A-Z]))*)", re.IGNORECASE),
+         _survey_number),
+        # Bare "45/2" forms; the lookarounds keep the parts of numeric dates out
+        (re.compile(r"(?<![\w/.\-])\d{1,4}/\d{1,3}[A-Za-z]?(?![\w/])"), _bare_survey_number),
+    ],
+    "COORDINATES": [
+        re.compile(r"-?\d{1,2}\.\d{3,}\s*°?\s*[NS]?\s*,\s*-?\d{1,3}\.\d{3,}\s*°?\s*[EW]?"),
+        re.compile(r"\d{1,3}\s*°\s*\d{1,2}\s*['′]\s*(?:\d{1,2}(?:\.\d+)?\s*[\"″]\s*)?[NSEW]\b"),
+        (re.compile(rf"\b{_LAT_LONG_LABEL}[\s,;/]*(?:and\s+)?{_LAT_LONG_LABEL}", re.IGNORECASE), _lat_long_pair),
+    ],
+    "DATE": [
+        # A trailing full stop ends a sentence; only ".digit" continues the number
+        re.compile(r"(?<![\d/.\-])\d{1,2}[./-]\d{1,2}[./-](?:\d{4}|\d{2})(?!\d|[/\-]|\.\d)"),
+        re.compile(r"\b\d{4}-\d{2}-\d{2}\b"),
+        re.compile(rf"\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:{_MONTHS})\.?,?\s+\d{{4}}\b", re.IGNORECASE),
+        re.compile(rf"\b(?:{_MONTHS})\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}\b", re.IGNORECASE),
+    ],
+    "LAND_AREA": [
+        _LAND_AREA,
+    ],
+    "PHONE_NUMBER": [
+        re.compile(r"(?<![\d+])(?:\+?91[\s-]?|0)?[6-9]\d{4}[\s-]?\d{5}(?!\d)"),
+        re.compile(r"(?<!\d)0\d{2,4}[\s-]\d{6,8}(?!\d)"),
+    ],
+    "EMAIL": [
+        re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}\b"),
+    ],
+}
+
+
+def extract_pattern_entities(text):
+    """Extract the strictly formatted entity types with compiled patterns.
+
+    Returns a dict with every key of PATTERN_ENTITY_KEYS mapped to a list of
+    unique values in document order, the same shape Gemini returns.
+    """
+    entities = {key: [] for key in PATTERN_ENTITY_KEYS}
+    if not text:
+        return entities
+
+    for key, patterns in _PATTERNS.items():
+        found = []
+        for pattern in patterns:
+            pattern, formatter = pattern if isinstance(pattern, tuple) else (pattern, None)
+            for match in pattern.finditer(text):
+                if formatter is not None:
+                    value = formatter(match)
+                else:
+                    value = match.group(1) if match.re.groups else match.group()
+                if value:
+                    found.append((match.start(), " ".join(value.split())))
+        seen = set()
+        for _, value in sorted(found):
+            if value and value not in seen:
+                seen.add(value)
+                entities[key].append(value)
+    return entities
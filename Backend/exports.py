@@ -0,0 +1,269 @@
+import io
+import zlib
+
+from ner_scheduler import ENTITY_KEYS
+from serialization import dumps
+
+# zstandard and pyarrow are optional; their formats are refused without them
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Compression applied around the json/ndjson byte stream, with its media type and extension
+STREAM_COMPRESSIONS = {
+    "gzip": ("application/gzip", "gz"),
+    "zstd": ("application/zstd", "zst"),
+}
+
+# Tables available in the columnar formats
+EXPORT_TABLES = ("entities", "documents")
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file that hands written bytes back on drain(), for streaming pyarrow writers"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def entity_schema():
+    """Long entity table: one row per extracted value"""
+    return pa.schema([
+        ("key", pa.string()),
+        ("filename", pa.string()),
+        ("entity_type", pa.dictionary(pa.int32(), pa.string())),
+        ("position", pa.int32()),
+        ("value", pa.string()),
+    ])
+
+
+def document_schema():
+    """One row per document with text sizes and a list column per entity type"""
+    return pa.schema(
+        [
+            ("key", pa.string()),
+            ("filename", pa.string()),
+            ("original_language", pa.string()),
+            ("pages", pa.int32()),
+            ("raw_chars", pa.int64()),
+            ("translated_chars", pa.int64()),
+            ("entity_count", pa.int32()),
+        ]
+        + [(entity_key, pa.list_(pa.string())) for entity_key in ENTITY_KEYS]
+    )
+
+
+def _compressor(compression):
+    """Object with compress()/flush() for a stream compression, or None"""
+    # Fast levels keep compression ahead of the network; results are highly redundant text anyway
+    if compression == "gzip":
+        return zlib.compressobj(1, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=1).compressobj()
+    return None
+
+
+class ResultExporter:
+    """Streams stored results out of the results store in several formats.
+
+    A batch is read one per-file result at a time, so memory stays
+    constant however many documents it holds. json and ndjson can be
+    wrapped in gzip or zstd; parquet and arrow export the entities as a
+    long table (one row per extracted value) or one row per document, with
+    the format's own compression.
+    """
+
+    def __init__(self, store, chunk_bytes=256 * 1024, batch_rows=50000):
+        """Initialize with a ResultsStore, the size of streamed chunks and rows per columnar batch"""
+        self.store = store
+        self.chunk_bytes = chunk_bytes
+        self.batch_rows = batch_rows
+
+    def formats(self):
+        """Formats and compressions usable with the installed packages"""
+        return {
+            "formats": [f for f in EXPORT_FORMATS if ARROW_AVAILABLE or f not in ("parquet", "arrow")],
+            "compressions": ["none", "gzip"] + (["zstd"] if ZSTD_AVAILABLE else []),
+            "tables": list(EXPORT_TABLES),
+        }
+
+    def iter_results(self, key, stored):
+        """(key, result) for a single stored result or every result of a batch entry"""
+        if "result_keys" not in stored:
+            yield key, stored
+            return
+        for result_key in stored["result_keys"]:
+            result = self.store.get(result_key)
+            if result is not None:
+                yield result_key, result
+
+    def _json(self, key, stored):
+        """Same document as /download-results: the batch fields plus its expanded results"""
+        if "result_keys" not in stored:
+            yield dumps(stored)
+            return
+        header = dumps({k: v for k, v in stored.items() if k != "result_keys"})
+        yield header[:-1] + (b',"results":[' if len(header) > 2 else b'"results":[')
+        for index, (_, result) in enumerate(self.iter_results(key, stored)):
+            yield (b"," if index else b"") + dumps(result)
+        yield b"]}"
+
+    def _ndjson(self, key, stored):
+        for result_key, result in self.iter_results(key, stored):
+            yield dumps(dict(result, key=result_key)) + b"\n"
+
+    def _batches(self, schema, rows):
+        """Group row dicts into record batches of at most batch_rows rows"""
+        columns = {name: [] for name in schema.names}
+        for row in rows:
+            for name, values in columns.items():
+                values.append(row[name])
+            if len(columns["key"]) >= self.batch_rows:
+                yield pa.record_batch([columns[name] for name in schema.names], schema=schema)
+                columns = {name: [] for name in schema.names}
+        if columns["key"]:
+            yield pa.record_batch([columns[name] for name in schema.names], schema=schema)
+
+    def _entity_rows(self, key, stored):
+        for result_key, result in self.iter_results(key, stored):
+            for entity_type, values in (result.get("entities") or {}).items():
+                if not isinstance(values, list):
+                    continue
+                for position, value in enumerate(values):
+                    yield {
+                        "key": result_key,
+                        "filename": result.get("filename"),
+                        "entity_type": entity_type,
+                        "position": position,
+                        "value": value if isinstance(value, str) else dumps(value).decode("utf-8"),
+                    }
+
+    def _document_rows(self, key, stored):
+        for result_key, result in self.iter_results(key, stored):
+            entities = result.get("entities") or {}
+            row = {
+                "key": result_key,
+                "filename": result.get("filename"),
+                "original_language": result.get("original_language"),
+                "pages": len(result["pages"]) if result.get("pages") else None,
+                "raw_chars": len(result.get("raw_text") or ""),
+                "translated_chars": len(result.get("translated_text") or ""),
+                "entity_count": sum(len(v) for v in entities.values() if isinstance(v, list)),
+            }
+            for entity_key in ENTITY_KEYS:
+                values = entities.get(entity_key)
+                row[entity_key] = [str(v) for v in values] if isinstance(values, list) else []
+            yield row
+
+    def _columnar(self, key, stored, file_format, table, compression):
+        if table == "entities":
+            schema, rows = entity_schema(), self._entity_rows(key, stored)
+        else:
+            schema, rows = document_schema(), self._document_rows(key, stored)
+        sink = _ByteSink()
+        if file_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+            writer = pa.ipc.new_stream(sink, schema, options=options)
+        for record_batch in self._batches(schema, rows):
+            writer.write_batch(record_batch)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def _compress(self, pieces, compression):
+        """Re-chunk pieces to about chunk_bytes and apply stream compression"""
+        compressor = _compressor(compression)
+        buffered = []
+        size = 0
+        for piece in pieces:
+            if compressor is not None:
+                piece = compressor.compress(piece)
+            if not piece:
+                continue
+            buffered.append(piece)
+            size += len(piece)
+            if size >= self.chunk_bytes:
+                yield b"".join(buffered)
+                buffered = []
+                size = 0
+        if compressor is not None:
+            buffered.append(compressor.flush())
+        if buffered:
+            yield b"".join(buffered)
+
+    def export(self, key, file_format="json", compression=None, table="entities"):
+        """Return (chunk iterator, media type, filename), or None when the key is not stored.
+
+        Raises ValueError for unknown or unavailable formats and compressions.
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown format {file_format!r}; use one of {', '.join(EXPORT_FORMATS)}")
+        media_type, extension = EXPORT_FORMATS[file_format]
+        filename = f"results_{key}"
+
+        if file_format in ("parquet", "arrow"):
+            if not ARROW_AVAILABLE:
+                raise ValueError(f"{file_format} export needs the pyarrow package")
+            if table not in EXPORT_TABLES:
+                raise ValueError(f"Unknown table {table!r}; use one of {', '.join(EXPORT_TABLES)}")
+            codecs = ("none", "gzip", "zstd", "snappy") if file_format == "parquet" else ("none", "zstd", "lz4")
+            compression = compression or ("zstd" if file_format == "parquet" else "none")
+            if compression not in codecs:
+                raise ValueError(f"{file_format} supports compression {', '.join(codecs)}")
+            stored = self.store.get(key)
+            if stored is None:
+                return None
+            chunks = self._compress(self._columnar(key, stored, file_format, table, compression), "none")
+            return chunks, media_type, f"{filename}_{table}.{extension}"
+
+        compression = compression or "none"
+        if compression not in ("none",) + tuple(STREAM_COMPRESSIONS):
+            raise ValueError(f"Unknown compression {compression!r}; use none, gzip or zstd")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression needs the zstandard package")
+        stored = self.store.get(key)
+        if stored is None:
+            return None
+        pieces = self._json(key, stored) if file_format == "json" else self._ndjson(key, stored)
+        if compression != "none":
+            media_type, suffix = STREAM_COMPRESSIONS[compression]
+            extension = f"{extension}.{suffix}"
+        return self._compress(pieces, compression), media_type, f"{filename}.{extension}"
@@ -0,0 +1,351 @@
+import codecs
+import json
+import re
+
+import numpy as np
+
+
+# Characters read from the stream per refill
+READ_CHARS = 1024 * 1024
+
+# Column types for the properties of a survey export
+SURVEY_SCHEMA = {"SURVEY_NO": "text", "MANDAL": "text", "AREA": "number"}
+
+# Whitespace and full-line // comments allowed between tokens, as load_geojson tolerates
+_SKIP = re.compile(r"(?:\s+|//[^\n]*)*")
+
+
+class _Growable:
+    """Append-only NumPy array that doubles its capacity when full"""
+
+    def __init__(self, dtype, width=None, capacity=1024):
+        shape = (capacity,) if width is None else (capacity, width)
+        self._array = np.empty(shape, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > len(self._array):
+            capacity = max(needed, 2 * len(self._array))
+            grown = np.empty((capacity,) + self._array.shape[1:], dtype=self._array.dtype)
+            grown[:self.size] = self._array[:self.size]
+            self._array = grown
+
+    def append(self, value):
+        self._reserve(1)
+        self._array[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        self._reserve(len(values))
+        self._array[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    @property
+    def data(self):
+        return self._array[:self.size]
+
+    def trim(self):
+        """Drop spare capacity once no more rows will be added"""
+        self._array = self._array[:self.size].copy()
+
+
+class _Column:
+    """One property column: float64 numbers, int8 flags or dictionary-encoded text"""
+
+    def __init__(self, kind, rows):
+        """Create a column and backfill `rows` missing values"""
+        self.kind = kind
+        self.strings = []
+        self.codes = {}
+        if kind == "number":
+            self.values = _Growable(np.float64)
+        elif kind == "flag":
+            self.values = _Growable(np.int8)
+        else:
+            self.values = _Growable(np.int32)
+        for _ in range(rows):
+            self.append(None)
+
+    def append(self, value):
+        if self.kind == "number":
+            try:
+                self.values.append(np.nan if value is None or isinstance(value, bool) else float(value))
+            except (TypeError, ValueError):
+                self.values.append(np.nan)
+        elif self.kind == "flag":
+            self.values.append(-1 if value is None else int(bool(value)))
+        elif value is None:
+            self.values.append(-1)
+        else:
+            if not isinstance(value, str):
+                value = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+            code = self.codes.get(value)
+            if code is None:
+                code = len(self.strings)
+                self.codes[value] = code
+                self.strings.append(value)
+            self.values.append(code)
+
+    def get(self, row):
+        """Python value of one row, or None when missing"""
+        value = self.values.data[row]
+        if self.kind == "number":
+            return None if value != value else float(value)
+        if value < 0:
+            return None
+        return bool(value) if self.kind == "flag" else self.strings[value]
+
+
+def _column_kind(value):
+    if isinstance(value, bool):
+        return "flag"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "text"
+
+
+class FeatureTable:
+    """Polygon features held as flat coordinate arrays with offsets plus typed property columns.
+
+    Rings are stored closed. Features without polygon geometry keep their
+    row with no rings, so row numbers match the source order. Bounding
+    boxes and the value dictionaries of text columns are built while rows
+    are appended; finish() packs each text column into a value -> rows
+    index with one sort.
+    """
+
+    def __init__(self, schema=None):
+        """Initialize with optional {property: "number" | "text" | "flag"} types; others are inferred"""
+        self.schema = dict(schema or {})
+        self.x = _Growable(np.float64, capacity=16384)
+        self.y = _Growable(np.float64, capacity=16384)
+        self.ring_offsets = _Growable(np.int64)
+        self.polygon_offsets = _Growable(np.int64)
+        self.feature_offsets = _Growable(np.int64)
+        for offsets in (self.ring_offsets, self.polygon_offsets, self.feature_offsets):
+            offsets.append(0)
+        self.boxes = _Growable(np.float64, width=4)
+        self.columns = {name: _Column(kind, 0) for name, kind in self.schema.items()}
+        self._postings = {}
+        self.rows = 0
+
+    def append(self, feature):
+        """Add one GeoJSON feature"""
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            polygons = []
+
+        minx = miny = np.inf
+        maxx = maxy = -np.inf
+        for polygon in polygons:
+            rings = 0
+            for ring in polygon:
+                if len(ring) < 3:
+                    continue
+                points = np.asarray(ring, dtype=np.float64)[:, :2]
+                if points[0, 0] != points[-1, 0] or points[0, 1] != points[-1, 1]:
+                    points = np.vstack([points, points[:1]])
+                self.x.extend(points[:, 0])
+                self.y.extend(points[:, 1])
+                self.ring_offsets.append(self.x.size)
+                minx, miny = min(minx, points[:, 0].min()), min(miny, points[:, 1].min())
+                maxx, maxy = max(maxx, points[:, 0].max()), max(maxy, points[:, 1].max())
+                rings += 1
+            if rings:
+                self.polygon_offsets.append(self.ring_offsets.size - 1)
+        self.feature_offsets.append(self.polygon_offsets.size - 1)
+        self.boxes.append((minx, miny, maxx, maxy) if minx <= maxx else (np.nan,) * 4)
+
+        properties = feature.get("properties") or {}
+        for name, value in properties.items():
+            if name not in self.columns and value is not None:
+                self.columns[name] = _Column(self.schema.get(name) or _column_kind(value), self.rows)
+        for name, column in self.columns.items():
+            column.append(properties.get(name))
+        self.rows += 1
+
+    def finish(self):
+        """Release spare capacity and build the value -> rows index of every text column"""
+        for array in (self.x, self.y, self.ring_offsets, self.polygon_offsets, self.feature_offsets, self.boxes):
+            array.trim()
+        for name, column in self.columns.items():
+            column.values.trim()
+            if column.kind == "text":
+                codes = column.values.data
+                order = np.argsort(codes, kind="stable")
+                starts = np.searchsorted(codes[order], np.arange(len(column.strings) + 1))
+                self._postings[name] = (order, starts)
+        return self
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def vertices(self):
+        return self.x.size
+
+    def find(self, name, value):
+        """Row numbers whose text property `name` equals `value`, via the attribute index"""
+        column = self.columns.get(name)
+        if column is None or column.kind != "text" or name not in self._postings:
+            return np.zeros(0, dtype=np.int64)
+        code = column.codes.get(str(value))
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        order, starts = self._postings[name]
+        return order[starts[code]:starts[code + 1]]
+
+    def row(self, index):
+        """Property dict of one row, without missing values"""
+        row = {}
+        for name, column in self.columns.items():
+            value = column.get(index)
+            if value is not None:
+                row[name] = value
+        return row
+
+    def row_view(self, indices=None):
+        """Lazy sequence of property dicts, built only for the rows that are read"""
+        return _RowView(self, np.arange(self.rows) if indices is None else indices)
+
+    def features(self):
+        """Yield every row as a GeoJSON-shaped feature whose rings are views into the coordinate arrays"""
+        points = np.column_stack([self.x.data, self.y.data])
+        ring_offsets = self.ring_offsets.data
+        polygon_offsets = self.polygon_offsets.data
+        feature_offsets = self.feature_offsets.data
+        for row in range(self.rows):
+            polygons = [
+                [points[ring_offsets[r]:ring_offsets[r + 1]] for r in range(polygon_offsets[p], polygon_offsets[p + 1])]
+                for p in range(feature_offsets[row], feature_offsets[row + 1])
+            ]
+            geometry = {"type": "MultiPolygon", "coordinates": polygons} if polygons else None
+            yield {"type": "Feature", "properties": self.row(row), "geometry": geometry}
+
+    def stats(self):
+        nbytes = sum(a.data.nbytes for a in (self.x, self.y, self.ring_offsets, self.polygon_offsets,
+                                            self.feature_offsets, self.boxes))
+        nbytes += sum(column.values.data.nbytes for column in self.columns.values())
+        return {
+            "features": self.rows,
+            "vertices": self.vertices,
+            "columns": {name: column.kind for name, column in self.columns.items()},
+            "array_bytes": nbytes,
+        }
+
+
+class _RowView:
+    """Read-only list-like view over selected rows of a FeatureTable"""
+
+    def __init__(self, table, indices):
+        self._table = table
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        return self._table.row(int(self._indices[i]))
+
+
+class _TextReader:
+    """Sliding window over a text stream for decoding one JSON value at a time"""
+
+    def __init__(self, stream, read_chars=READ_CHARS):
+        self.stream = stream
+        self.read_chars = read_chars
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def fill(self, minimum=0):
+        """Drop consumed text and read at least one more chunk"""
+        chunk = self.stream.read(max(self.read_chars, minimum))
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+
+    def peek(self):
+        """Next significant character, or "" at end of input"""
+        while True:
+            end = _SKIP.match(self.buffer, self.pos).end()
+            # A comment or whitespace run reaching the buffer end may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return self.buffer[end] if end < len(self.buffer) else ""
+
+    def expect(self, characters):
+        character = self.peek()
+        if character == "" or character not in characters:
+            raise ValueError(f"Expected one of {characters!r} but found {character or 'end of input'!r}")
+        self.pos += 1
+        return character
+
+    def value(self):
+        """Decode the JSON value at the current position"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+                # A number or literal touching the buffer end may be cut short
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                # A value cut off by the window fails at its very end or inside an open string;
+                # anything else is a real syntax error and is reported without reading further
+                truncated = e.msg.startswith("Unterminated string") or e.pos >= len(self.buffer) - 16
+                if self.eof or not truncated:
+                    raise
+            # Grow reads geometrically so a value larger than a chunk is not re-parsed too often
+            self.fill(len(self.buffer) - self.pos)
+
+
+def iter_features(stream, read_chars=READ_CHARS):
+    """Yield the features of a GeoJSON FeatureCollection one at a time.
+
+    Only one feature and one read chunk are held in memory at once; other
+    top-level members (type, crs, bbox, ...) are decoded and skipped.
+    Accepts a text or binary file object.
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = codecs.getreader("utf-8")(stream)
+    reader = _TextReader(stream, read_chars)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "features":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def read_feature_table(stream, schema=None, read_chars=READ_CHARS):
+    """Stream a GeoJSON FeatureCollection into a finished FeatureTable"""
+    table = FeatureTable(schema)
+    for feature in iter_features(stream, read_chars):
+        if isinstance(feature, dict):
+            table.append(feature)
+    return table.finish()
@@ -0,0 +1,556 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from spatial_index import load_geojson, ragged_arange
+from vector_tiles import simplification_importance
+
+
+# File signature and layout version of the binary geometry store
+MAGIC = b"FRAGEO01"
+
+# Coordinate quantization step in degrees (about 11 cm on the ground)
+DEFAULT_QUANTUM = 1e-6
+
+# Douglas-Peucker tolerances in degrees for the stored levels of detail, finest first
+DEFAULT_LOD_TOLERANCES = (0.0, 0.00002, 0.0001, 0.0005)
+
+# Text property code for a missing value, and the boolean column equivalent
+_MISSING_CODE = 0xFFFFFFFF
+_MISSING_FLAG = 255
+
+_HEADER = struct.Struct("<8sI")
+_ENTRY = struct.Struct("<2sQQ")
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def write_sections(sections):
+    """Serialize [(name, array)] into the store layout.
+
+    The file is a signature, a directory of (name, dtype, offset, count)
+    entries and the little-endian arrays themselves, each aligned to 8
+    bytes so the loader can map them in place.
+    """
+    arrays = [(name, np.ascontiguousarray(array).astype(np.asarray(array).dtype.newbyteorder("<"), copy=False))
+              for name, array in sections]
+    directory_size = _HEADER.size + sum(2 + len(name.encode("utf-8")) + _ENTRY.size for name, _ in arrays)
+
+    offset = _align(directory_size)
+    parts = [_HEADER.pack(MAGIC, len(arrays))]
+    layout = []
+    for name, array in arrays:
+        encoded = name.encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded)) + encoded)
+        parts.append(_ENTRY.pack(array.dtype.str[1:].encode("ascii"), offset, len(array)))
+        layout.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    out = bytearray(b"".join(parts))
+    for start, array in layout:
+        out.extend(b"\0" * (start - len(out)))
+        out.extend(array.tobytes())
+    return bytes(out)
+
+
+def _property_sections(names, rows):
+    """Encode property columns: numbers, integers and flags as arrays, everything else dictionary-encoded text"""
+    sections = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, bool) for v in present):
+            column = np.array([_MISSING_FLAG if v is None else int(v) for v in values], dtype=np.uint8)
+        elif present and len(present) == len(values) and all(type(v) is int for v in present):
+            column = np.array(values, dtype=np.int64)
+        elif present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        else:
+            strings = {}
+            codes = np.full(len(values), _MISSING_CODE, dtype=np.uint32)
+            for i, value in enumerate(values):
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    value = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+                codes[i] = strings.setdefault(value, len(strings))
+            encoded = [s.encode("utf-8") for s in strings]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+            offsets[1:] = np.cumsum([len(e) for e in encoded]) if encoded else []
+            sections.append((f"text:{name}:offsets", offsets))
+            sections.append((f"text:{name}:data", np.frombuffer(b"".join(encoded), dtype=np.uint8)))
+            column = codes
+        sections.append((f"prop:{name}", column))
+    return sections
+
+
+def _vertex_levels(importance, quantum, tolerances):
+    """Coarsest level of detail that still keeps each vertex of an open ring.
+
+    Douglas-Peucker results are nested (a coarser level keeps a subset of
+    a finer one), so one level number per vertex stores every level. A
+    ring keeps its three most significant vertices at every level.
+    """
+    levels = np.zeros(len(importance), dtype=np.uint8)
+    top = np.argsort(-importance, kind="stable")[:3]
+    for level, tolerance in enumerate(tolerances):
+        keep = importance > (tolerance / quantum) ** 2
+        keep[top] = True
+        levels[keep] = level
+    return levels
+
+
+def _geometry_sections(x, y, ring_offsets):
+    """Ring offsets, absolute ring starts and per-vertex deltas for flat quantized vertex arrays"""
+    first = ring_offsets[:-1]
+    is_first = np.zeros(len(x), dtype=bool)
+    is_first[first] = True
+    # A ring's first vertex is stored absolutely, so the delta leading into it is dropped
+    dx, dy = np.diff(x)[~is_first[1:]], np.diff(y)[~is_first[1:]]
+    largest = max(np.abs(dx).max(initial=0), np.abs(dy).max(initial=0))
+    dtype = np.int16 if largest <= np.iinfo(np.int16).max else np.int32
+    return [
+        ("ring_offsets", ring_offsets.astype(np.uint32)),
+        ("start_x", x[first].astype(np.int32)),
+        ("start_y", y[first].astype(np.int32)),
+        ("dx", dx.astype(dtype)),
+        ("dy", dy.astype(dtype)),
+    ]
+
+
+def build_store(features, quantum=DEFAULT_QUANTUM, tolerances=DEFAULT_LOD_TOLERANCES, source=""):
+    """Encode GeoJSON polygon features into store bytes holding every level of detail.
+
+    Every feature keeps its position, so indices match the source file;
+    features without polygon geometry are stored with no polygons. Rings
+    with fewer than 3 distinct vertices after quantization are dropped.
+    """
+    rows = []
+    feature_polygons = []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            polygons = []
+        feature_polygons.append([
+            [np.asarray(ring, dtype=np.float64)[:, :2] for ring in polygon if len(ring) >= 3]
+            for polygon in polygons
+        ])
+        rows.append(feature.get("properties") or {})
+
+    float_rings = [ring for polygons in feature_polygons for polygon in polygons for ring in polygon]
+    all_points = np.vstack(float_rings) if float_rings else np.zeros((0, 2))
+    origin = np.floor(all_points.min(axis=0) / quantum) * quantum if len(all_points) else np.zeros(2)
+
+    finest = min((t for t in tolerances if t > 0), default=0)
+    min_sq_tolerance = (finest / quantum) ** 2
+    polygon_counts, ring_counts, rings, levels = [], [], [], []
+    for polygons in feature_polygons:
+        kept = 0
+        for polygon in polygons:
+            kept_rings = []
+            for index, ring in enumerate(polygon):
+                ring = np.round((ring - origin) / quantum).astype(np.int64)
+                # Drop the closing vertex and any vertices that quantized onto their successor
+                ring = ring[np.any(ring != np.roll(ring, -1, axis=0), axis=1)]
+                if len(np.unique(ring, axis=0)) >= 3:
+                    kept_rings.append(ring)
+                elif index == 0:
+                    # A polygon whose exterior collapsed below the quantum is dropped with its holes
+                    break
+            if not kept_rings:
+                continue
+            for ring in kept_rings:
+                rings.append(ring)
+                if finest:
+                    importance = simplification_importance(
+                        np.vstack([ring, ring[:1]]).astype(np.float64), min_sq_tolerance
+                    )
+                    levels.append(_vertex_levels(importance[:-1], quantum, tolerances))
+                else:
+                    levels.append(np.zeros(len(ring), dtype=np.uint8))
+            ring_counts.append(len(kept_rings))
+            kept += 1
+        polygon_counts.append(kept)
+
+    points = np.vstack(rings) if rings else np.zeros((0, 2), dtype=np.int64)
+    ring_offsets = np.concatenate([[0], np.cumsum([len(ring) for ring in rings], dtype=np.int64)]).astype(np.int64)
+    sections = [
+        ("meta", np.array([quantum, origin[0], origin[1]], dtype=np.float64)),
+        ("lod_tolerances", np.asarray(tolerances, dtype=np.float64)),
+        ("source", np.frombuffer(source.encode("utf-8"), dtype=np.uint8)),
+        ("feature_offsets", np.concatenate([[0], np.cumsum(polygon_counts)]).astype(np.uint32)),
+        ("polygon_offsets", np.concatenate([[0], np.cumsum(ring_counts)]).astype(np.uint32)),
+        *_geometry_sections(points[:, 0], points[:, 1], ring_offsets),
+        ("vertex_level", np.concatenate(levels) if levels else np.zeros(0, dtype=np.uint8)),
+    ]
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    sections.extend(_property_sections(names, rows))
+    return write_sections(sections)
+
+
+class GeometryStore:
+    """Read-only view of a binary geometry store, mapped in place without parsing.
+
+    Full-detail coordinates are decoded on first use with one vectorized
+    cumulative sum and each coarser level is a mask over them; properties
+    are decoded only for the features a caller asks for.
+    """
+
+    def __init__(self, buffer):
+        """Open a store from bytes or a memory map"""
+        self._buffer = buffer
+        magic, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a geometry store file")
+
+        self._sections = {}
+        position = _HEADER.size
+        for _ in range(count):
+            (length,) = struct.unpack_from("<H", buffer, position)
+            name = bytes(buffer[position + 2:position + 2 + length]).decode("utf-8")
+            position += 2 + length
+            code, offset, items = _ENTRY.unpack_from(buffer, position)
+            position += _ENTRY.size
+            dtype = np.dtype("<" + code.decode("ascii"))
+            self._sections[name] = (
+                np.frombuffer(buffer, dtype=dtype, count=items, offset=offset) if items else np.zeros(0, dtype=dtype)
+            )
+
+        self.quantum, self.origin_x, self.origin_y = self._sections["meta"].tolist()
+        self.lod_tolerances = self._sections["lod_tolerances"].tolist()
+        self.source = self._sections["source"].tobytes().decode("utf-8")
+        self.feature_offsets = self._sections["feature_offsets"].astype(np.int64)
+        self.polygon_offsets = self._sections["polygon_offsets"].astype(np.int64)
+        self.property_names = [name[5:] for name in self._sections if name.startswith("prop:")]
+        self._ring_offsets = self._sections["ring_offsets"].astype(np.int64)
+        self._quantized = None
+        self._coordinates = {}
+        self._bounds = None
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a store file"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self.feature_offsets) - 1
+
+    @property
+    def nbytes(self):
+        return len(self._buffer)
+
+    def choose_lod(self, zoom, pixels=0.5):
+        """Coarsest level whose tolerance stays under `pixels` screen pixels at a web map zoom"""
+        pixel_degrees = 360.0 / (256 * 2 ** zoom)
+        level = 0
+        for i, tolerance in enumerate(self.lod_tolerances):
+            if tolerance <= pixel_degrees * pixels and tolerance >= self.lod_tolerances[level]:
+                level = i
+        return level
+
+    def _check_lod(self, lod):
+        if not 0 <= lod < len(self.lod_tolerances):
+            raise ValueError(f"Level of detail must be between 0 and {len(self.lod_tolerances) - 1}")
+
+    def _decode(self):
+        """Quantized (x, y) arrays of the full-detail vertices, decoded from ring starts and deltas"""
+        if self._quantized is None:
+            offsets = self._ring_offsets
+            first = offsets[:-1]
+            x = np.zeros(int(offsets[-1]), dtype=np.int64)
+            y = np.zeros(int(offsets[-1]), dtype=np.int64)
+            rest = np.ones(len(x), dtype=bool)
+            rest[first] = False
+            x[rest] = self._sections["dx"]
+            y[rest] = self._sections["dy"]
+            x[first] = self._sections["start_x"]
+            y[first] = self._sections["start_y"]
+            # Running sums restart at every ring start
+            lengths = np.diff(offsets)
+            for values in (x, y):
+                sums = np.cumsum(values)
+                values[:] = sums - np.repeat(sums[first] - values[first], lengths)
+            self._quantized = (x, y)
+        return self._quantized
+
+    def _level(self, lod):
+        """Vertex mask and ring offsets of one level of detail"""
+        self._check_lod(lod)
+        if lod == 0:
+            return None, self._ring_offsets
+        mask = self._sections["vertex_level"] >= lod
+        counts = np.add.reduceat(mask.astype(np.int64), self._ring_offsets[:-1]) if len(mask) else np.zeros(0, dtype=np.int64)
+        return mask, np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def coordinates(self, lod=0):
+        """(lon, lat) arrays for every vertex of one level, cached"""
+        coordinates = self._coordinates.get(lod)
+        if coordinates is None:
+            mask, _ = self._level(lod)
+            x, y = self._decode()
+            if mask is not None:
+                x, y = x[mask], y[mask]
+            coordinates = (self.origin_x + x * self.quantum, self.origin_y + y * self.quantum)
+            self._coordinates[lod] = coordinates
+        return coordinates
+
+    def feature_bounds(self):
+        """(n, 4) array of minx, miny, maxx, maxy per feature; NaN for features without geometry"""
+        if self._bounds is None:
+            lon, lat = self.coordinates(0)
+            vertex_starts = self._ring_offsets[self.polygon_offsets[self.feature_offsets]]
+            counts = np.diff(vertex_starts)
+            bounds = np.full((len(self), 4), np.nan)
+            has = counts > 0
+            starts = vertex_starts[:-1][has]
+            if len(starts):
+                bounds[has, 0] = np.minimum.reduceat(lon, starts)
+                bounds[has, 1] = np.minimum.reduceat(lat, starts)
+                bounds[has, 2] = np.maximum.reduceat(lon, starts)
+                bounds[has, 3] = np.maximum.reduceat(lat, starts)
+            self._bounds = bounds
+        return self._bounds
+
+    def query(self, minx, miny, maxx, maxy):
+        """Indices of the features whose bounds intersect a lon/lat box"""
+        b = self.feature_bounds()
+        with np.errstate(invalid="ignore"):
+            hit = (b[:, 0] <= maxx) & (minx <= b[:, 2]) & (b[:, 1] <= maxy) & (miny <= b[:, 3])
+        return np.flatnonzero(hit)
+
+    def _text(self, name):
+        offsets = self._sections[f"text:{name}:offsets"]
+        data = self._sections[f"text:{name}:data"].tobytes()
+        return offsets, data
+
+    def properties(self, indices):
+        """Property dicts for the given feature indices"""
+        rows = [{} for _ in indices]
+        for name in self.property_names:
+            column = self._sections[f"prop:{name}"][indices]
+            if f"text:{name}:offsets" in self._sections:
+                offsets, data = self._text(name)
+                for row, code in zip(rows, column.tolist()):
+                    if code != _MISSING_CODE:
+                        row[name] = data[offsets[code]:offsets[code + 1]].decode("utf-8")
+            elif column.dtype == np.uint8:
+                for row, value in zip(rows, column.tolist()):
+                    if value != _MISSING_FLAG:
+                        row[name] = bool(value)
+            elif column.dtype == np.float64:
+                for row, value in zip(rows, column.tolist()):
+                    if value == value:
+                        row[name] = value
+            else:
+                for row, value in zip(rows, column.tolist()):
+                    row[name] = value
+        return rows
+
+    def _select(self, ring_offsets, indices):
+        """Polygon, ring and vertex index ranges of the selected features"""
+        polygon_counts = np.diff(self.feature_offsets)[indices]
+        polygons = ragged_arange(self.feature_offsets[indices], polygon_counts)
+        ring_counts = np.diff(self.polygon_offsets)[polygons]
+        rings = ragged_arange(self.polygon_offsets[polygons], ring_counts)
+        vertex_counts = np.diff(ring_offsets)[rings]
+        vertices = ragged_arange(ring_offsets[rings], vertex_counts)
+        return polygon_counts, ring_counts, vertex_counts, vertices
+
+    def to_geojson(self, lod=0, indices=None):
+        """GeoJSON FeatureCollection of one level, coordinates rounded to the quantization step"""
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.int64)
+        lon, lat = self.coordinates(lod)
+        polygon_counts, ring_counts, vertex_counts, vertices = self._select(self._level(lod)[1], indices)
+        digits = max(0, int(round(-np.log10(self.quantum))))
+        points = np.round(np.column_stack([lon[vertices], lat[vertices]]), digits).tolist()
+
+        features = []
+        # ring_counts is per polygon and vertex_counts per ring, so each needs its own running index
+        vertex, ring, polygon = 0, 0, 0
+        for feature_index, properties, polygon_count in zip(indices.tolist(), self.properties(indices), polygon_counts.tolist()):
+            polygons = []
+            for _ in range(polygon_count):
+                rings = []
+                for _ in range(int(ring_counts[polygon])):
+                    count = int(vertex_counts[ring])
+                    # GeoJSON rings repeat their first vertex at the end
+                    rings.append(points[vertex:vertex + count] + points[vertex:vertex + 1])
+                    vertex += count
+                    ring += 1
+                polygons.append(rings)
+                polygon += 1
+            if not polygons:
+                geometry = None
+            elif len(polygons) == 1:
+                geometry = {"type": "Polygon", "coordinates": polygons[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "coordinates": polygons}
+            features.append({"type": "Feature", "id": feature_index, "properties": properties, "geometry": geometry})
+        return {"type": "FeatureCollection", "features": features}
+
+    def encode(self, lod=0, indices=None):
+        """A standalone store holding one level for the given features, for sending to clients"""
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.int64)
+        mask, ring_offsets = self._level(lod)
+        polygon_counts, ring_counts, vertex_counts, vertices = self._select(ring_offsets, indices)
+        x, y = self._decode()
+        if mask is not None:
+            x, y = x[mask], y[mask]
+
+        sections = [
+            ("meta", self._sections["meta"]),
+            ("lod_tolerances", np.array([self.lod_tolerances[lod]])),
+            ("source", self._sections["source"]),
+            ("feature_offsets", np.concatenate([[0], np.cumsum(polygon_counts)]).astype(np.uint32)),
+            ("polygon_offsets", np.concatenate([[0], np.cumsum(ring_counts)]).astype(np.uint32)),
+            *_geometry_sections(x[vertices], y[vertices], np.concatenate([[0], np.cumsum(vertex_counts)])),
+        ]
+        for name in self.property_names:
+            column = self._sections[f"prop:{name}"][indices]
+            if f"text:{name}:offsets" in self._sections:
+                offsets, _ = self._text(name)
+                offsets = offsets.astype(np.int64)
+                present = column != _MISSING_CODE
+                used, codes = np.unique(column[present], return_inverse=True)
+                column = column.copy()
+                column[present] = codes
+                lengths = offsets[used.astype(np.int64) + 1] - offsets[used.astype(np.int64)]
+                data = self._sections[f"text:{name}:data"][ragged_arange(offsets[used.astype(np.int64)], lengths)]
+                sections.append((f"text:{name}:offsets", np.concatenate([[0], np.cumsum(lengths)]).astype(np.uint32)))
+                sections.append((f"text:{name}:data", data))
+            sections.append((f"prop:{name}", column))
+        return write_sections(sections)
+
+    def stats(self):
+        return {
+            "features": len(self),
+            "bytes": self.nbytes,
+            "lod_tolerances": self.lod_tolerances,
+            "lod_vertices": [int(self._level(lod)[1][-1]) for lod in range(len(self.lod_tolerances))],
+        }
+
+
+class GeometryStoreSet:
+    """Geometry stores for the spatial layers, rebuilt from GeoJSON whenever the source file changes"""
+
+    def __init__(self, directory, quantum=DEFAULT_QUANTUM, tolerances=DEFAULT_LOD_TOLERANCES):
+        """Initialize with the directory holding <layer>.geostore files"""
+        self.directory = directory
+        self.quantum = quantum
+        self.tolerances = tuple(tolerances)
+        self.stores = {}
+        self._encoded = {}
+
+    def _stamp(self, source_path):
+        """Source identity recorded in a store; a mismatch means the store is stale"""
+        stat = os.stat(source_path)
+        return f"{os.path.abspath(source_path)}:{stat.st_size}:{stat.st_mtime_ns}:{self.quantum}:{self.tolerances}"
+
+    def load(self, name, source_path, features=None):
+        """Map a layer's store, building it first if it is missing or stale"""
+        try:
+            stamp = self._stamp(source_path)
+        except (OSError, TypeError) as e:
+            print(f"❌ Geometry source for {name} unavailable: {str(e)}")
+            return None
+
+        path = os.path.join(self.directory, f"{name}.geostore")
+        try:
+            store = GeometryStore.open(path) if os.path.exists(path) else None
+        except (OSError, ValueError, struct.error):
+            store = None
+
+        if store is None or store.source != stamp:
+            try:
+                data = build_store(
+                    load_geojson(source_path) if features is None else features,
+                    self.quantum, self.tolerances, stamp
+                )
+            except (OSError, ValueError, TypeError, KeyError, IndexError) as e:
+                print(f"❌ Could not build geometry store for {name}: {str(e)}")
+                self.stores.pop(name, None)
+                return None
+            store = self._write(name, data)
+
+        self._install(name, store)
+        return store
+
+    def _install(self, name, store):
+        self.stores[name] = store
+        for key in [key for key in self._encoded if key[0] == name]:
+            self._encoded.pop(key, None)
+
+    def _write(self, name, data):
+        """Persist freshly built store bytes and map them"""
+        path = os.path.join(self.directory, f"{name}.geostore")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+            store = GeometryStore.open(path)
+        except OSError as e:
+            print(f"❌ Could not write geometry store for {name}: {str(e)}")
+            store = GeometryStore(data)
+        print(f"✅ Built geometry store for {name}: {len(store)} features, {store.nbytes} bytes")
+        return store
+
+    def replace(self, name, features, source):
+        """Rebuild a layer's store from features that have no source file, such as an uploaded layer"""
+        store = self._write(name, build_store(features, self.quantum, self.tolerances, source))
+        self._install(name, store)
+        return store
+
+    def load_all(self, paths, layers=None):
+        """Load {layer name: GeoJSON path}, reusing already parsed {layer name: features} for rebuilds"""
+        for name, path in paths.items():
+            if path:
+                self.load(name, path, (layers or {}).get(name))
+        print("✅ Geometry stores ready: " + ", ".join(f"{len(store)} {name}" for name, store in self.stores.items()))
+
+    def encoded(self, name, lod):
+        """Whole-layer store bytes for one level, kept after the first request until the layer is rebuilt"""
+        store = self.stores[name]
+        key = (name, lod)
+        cached = self._encoded.get(key)
+        # Bytes encoded from a store that has since been replaced are not served
+        if cached is None or cached[0] is not store:
+            cached = (store, store.encode(lod))
+            self._encoded[key] = cached
+        return cached[1]
+
+    def stats(self):
+        return {name: store.stats() for name, store in self.stores.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build binary geometry stores from GeoJSON layers")
+    parser.add_argument("sources", nargs="+", help="GeoJSON files; each becomes <name>.geostore")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "geometry_store"))
+    parser.add_argument("--quantum", type=float, default=DEFAULT_QUANTUM)
+    parser.add_argument("--tolerances", type=float, nargs="+", default=list(DEFAULT_LOD_TOLERANCES))
+    args = parser.parse_args()
+
+    stores = GeometryStoreSet(args.out, args.quantum, args.tolerances)
+    for source in args.sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        store = stores.load(name, source)
+        if store is not None:
+            print(f"{name}: {os.path.getsize(source)} bytes GeoJSON -> {store.nbytes} bytes, "
+                  f"vertices per level {store.stats()['lod_vertices']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+
+class HealthMonitor:
+    """Runs external health probes on a schedule and serves their last result.
+
+    Each probe is a callable returning a dict of details (healthy unless it
+    says `"healthy": False`) or raising. Probes run one after another on a
+    background thread every `interval_seconds`, so health endpoints answer
+    from memory and load-balancer checks never reach Google's APIs.
+    """
+
+    def __init__(self, interval_seconds=300):
+        """Initialize with the time between probe rounds; 0 probes only on refresh()"""
+        self.interval_seconds = interval_seconds
+        self._probes = {}
+        self._results = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, name, probe):
+        self._probes[name] = probe
+
+    def _run(self, name, probe):
+        start = time.perf_counter()
+        try:
+            result = dict(probe() or {})
+            result["healthy"] = result.get("healthy", True) is not False
+            result.setdefault("error", None)
+        except Exception as e:
+            result = {"healthy": False, "error": str(e)}
+        result["checked_at"] = time.time()
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            self._results[name] = result
+        return result
+
+    def refresh(self, name=None):
+        """Run one probe, or all of them, now (blocking)"""
+        names = [name] if name is not None else list(self._probes)
+        return {probe_name: self._run(probe_name, self._probes[probe_name]) for probe_name in names}
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.refresh()
+            if not self.interval_seconds or self._stop.wait(self.interval_seconds):
+                break
+
+    def start(self):
+        """Probe once in the background now, then every interval"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="health-probes", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def status(self, name):
+        """Last result of a probe with its age, or a pending entry before its first run"""
+        with self._lock:
+            result = self._results.get(name)
+        if result is None:
+            return {"healthy": None, "pending": True}
+        return dict(result, age_seconds=round(time.time() - result["checked_at"], 1))
+
+    def snapshot(self):
+        return {name: self.status(name) for name in self._probes}
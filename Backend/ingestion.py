@@ -0,0 +1,135 @@
+import hashlib
+import io
+import os
+import tempfile
+
+
+# Bytes pulled from an upload per read
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised as soon as an upload or a whole batch crosses its size limit"""
+
+    def __init__(self, message, filename=None):
+        super().__init__(message)
+        self.filename = filename
+
+
+class IngestedFile:
+    """An upload copied into a spooled temporary file.
+
+    Content stays in memory up to `spool_bytes` and then moves to a named
+    temporary file on disk, so PDFs can be opened by path instead of from an
+    in-memory copy. The SHA-256 of the content is computed while streaming.
+    """
+
+    def __init__(self, filename, content_type, spool_bytes, spool_dir=None):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.spool_bytes = spool_bytes
+        self.spool_dir = spool_dir
+        self._hasher = hashlib.sha256()
+        self._buffer = io.BytesIO()
+        self._disk_file = None
+        self.path = None
+
+    def write(self, chunk):
+        """Append a chunk, rolling over to disk once the spool threshold is passed"""
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+        if self._disk_file is None and self.size > self.spool_bytes:
+            suffix = os.path.splitext(self.filename or "")[1]
+            self._disk_file = tempfile.NamedTemporaryFile(dir=self.spool_dir, suffix=suffix, delete=False)
+            self.path = self._disk_file.name
+            self._disk_file.write(self._buffer.getbuffer())
+            self._buffer = None
+        if self._disk_file is not None:
+            self._disk_file.write(chunk)
+        else:
+            self._buffer.write(chunk)
+
+    def finish(self):
+        """Flush to disk and freeze the content hash"""
+        if self._disk_file is not None:
+            self._disk_file.close()
+            self._disk_file = None
+        self.sha256 = self._hasher.hexdigest()
+
+    @property
+    def on_disk(self):
+        return self.path is not None
+
+    def read_bytes(self):
+        """Return the whole content as bytes (used for single images sent to Vision)"""
+        if self.on_disk:
+            with open(self.path, "rb") as f:
+                return f.read()
+        return self._buffer.getvalue()
+
+    def open(self):
+        """Return a binary file object over the content, for streaming parsers"""
+        if self.on_disk:
+            return open(self.path, "rb")
+        return io.BytesIO(self._buffer.getvalue())
+
+    def pdf_source(self):
+        """Return what PyMuPDF should open: the spool file path, or bytes for small uploads"""
+        return self.path if self.on_disk else self._buffer.getvalue()
+
+    def close(self):
+        """Release the in-memory buffer and delete the spool file"""
+        if self._disk_file is not None:
+            self._disk_file.close()
+            self._disk_file = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self._buffer = None
+
+
+async def ingest_uploads(files, max_file_bytes, max_total_bytes, spool_bytes=2 * 1024 * 1024, spool_dir=None):
+    """Stream FastAPI UploadFiles into IngestedFiles, enforcing size limits.
+
+    Reads each upload in CHUNK_SIZE pieces and raises UploadTooLargeError the
+    moment a file exceeds `max_file_bytes` or the batch exceeds
+    `max_total_bytes`; everything ingested so far is cleaned up first.
+    """
+    ingested = []
+    total = 0
+    try:
+        for file in files:
+            upload = IngestedFile(file.filename, file.content_type, spool_bytes, spool_dir)
+            ingested.append(upload)
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if upload.size + len(chunk) > max_file_bytes:
+                    raise UploadTooLargeError(
+                        f"File {file.filename} exceeds the {max_file_bytes // (1024 * 1024)} MB limit",
+                        file.filename
+                    )
+                if total > max_total_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload batch exceeds the {max_total_bytes // (1024 * 1024)} MB total limit",
+                        file.filename
+                    )
+                upload.write(chunk)
+            upload.finish()
+            await file.close()
+    except BaseException:
+        close_uploads(ingested)
+        raise
+    return ingested
+
+
+def close_uploads(uploads):
+    """Delete the spool files of a batch"""
+    for upload in uploads:
+        upload.close()
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import time
+import uuid
+
+
+# Job and per-file states
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_OCR = "ocr"
+STATUS_ANALYZING = "analyzing"
+STATUS_COMPLETED = "completed"
+STATUS_NO_TEXT = "no_text"
+STATUS_FAILED = "failed"
+STATUS_COMPLETED_WITH_ERRORS = "completed_with_errors"
+
+FINISHED_FILE_STATES = {STATUS_COMPLETED, STATUS_NO_TEXT, STATUS_FAILED}
+
+
+class Job:
+    """A batch of uploads processed in the background.
+
+    Every state change is appended to `events` so Server-Sent Events
+    subscribers can replay the history and then follow new events live.
+    """
+
+    def __init__(self, uploads):
+        self.id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.finished_at = None
+        self.batch_key = None
+        self.uploads = uploads
+        self.files = [
+            {
+                "index": index,
+                "filename": upload.filename,
+                "status": STATUS_QUEUED,
+                "pages": [],
+                "result_key": None,
+                "error": None,
+            }
+            for index, upload in enumerate(uploads)
+        ]
+        self.remaining = len(uploads)
+        self.events = []
+        self._changed = asyncio.Event()
+
+    @property
+    def status(self):
+        """Overall state; a finished job is failed when no file completed and completed_with_errors for a mix"""
+        if self.finished_at is not None:
+            completed = sum(1 for f in self.files if f["status"] == STATUS_COMPLETED)
+            if completed == len(self.files):
+                return STATUS_COMPLETED
+            return STATUS_COMPLETED_WITH_ERRORS if completed else STATUS_FAILED
+        if any(f["status"] != STATUS_QUEUED for f in self.files):
+            return STATUS_RUNNING
+        return STATUS_QUEUED
+
+    def publish(self, event, data):
+        """Record an event and wake up every stream waiting on this job"""
+        self.events.append((event, data))
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def to_dict(self):
+        """Job summary with per-file and per-page status"""
+        counts = {}
+        for f in self.files:
+            counts[f["status"]] = counts.get(f["status"], 0) + 1
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "batch_key": self.batch_key,
+            "total_files": len(self.files),
+            "completed_files": len(self.files) - self.remaining,
+            "file_status_counts": counts,
+            "files": self.files,
+        }
+
+    async def stream(self, after=-1, keepalive_seconds=15):
+        """Yield (event_id, event, data) from `after + 1` onwards until the job finishes.
+
+        Yields None when no event arrived within `keepalive_seconds`, so
+        callers can send a keep-alive comment to idle proxies.
+        """
+        next_id = after + 1
+        while True:
+            while next_id < len(self.events):
+                event, data = self.events[next_id]
+                yield next_id, event, data
+                next_id += 1
+            if self.finished_at is not None:
+                return
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class JobProgress:
+    """Handle passed to the file processor for reporting progress of one file"""
+
+    def __init__(self, job, index, loop):
+        self.job = job
+        self.index = index
+        self.loop = loop
+
+    def set_status(self, status):
+        entry = self.job.files[self.index]
+        entry["status"] = status
+        self.job.publish("file", {"index": self.index, "filename": entry["filename"], "status": status})
+
+    def set_pages(self, pages):
+        if pages is not None:
+            self.job.files[self.index]["pages"] = pages
+
+    def _page_done(self, page, source):
+        self.job.files[self.index]["pages"].append({"page": page, "source": source})
+        self.job.publish("page", {"index": self.index, "page": page, "source": source})
+
+    def page_done(self, page, source):
+        """Report a finished page; safe to call from worker threads"""
+        self.loop.call_soon_threadsafe(self._page_done, page, source)
+
+
+class JobManager:
+    """Queue of document jobs drained by a fixed pool of asyncio workers.
+
+    `process_file(upload, progress)` runs the pipeline for one upload and
+    returns the results-store key of its result, or None when the file had
+    no text. `on_job_finished(job)` runs once every file is done.
+    """
+
+    def __init__(self, process_file, workers=4, ttl_seconds=3600, on_job_finished=None):
+        self.process_file = process_file
+        self.workers = max(1, workers)
+        self.ttl_seconds = ttl_seconds
+        self.on_job_finished = on_job_finished
+        self.jobs = {}
+        self._queue = None
+        self._tasks = []
+
+    def start(self):
+        """Start worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel workers and delete spool files of unfinished jobs"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self.jobs.values():
+            for upload in job.uploads:
+                upload.close()
+
+    def submit(self, uploads):
+        """Queue every file of a new job and return the job"""
+        self._prune()
+        job = Job(uploads)
+        self.jobs[job.id] = job
+        for index in range(len(uploads)):
+            self._queue.put_nowait((job, index))
+        if not uploads:
+            self._finish(job)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def _finish(self, job):
+        job.uploads = []
+        if self.on_job_finished is not None:
+            try:
+                self.on_job_finished(job)
+            except Exception as e:
+                print(f"Job {job.id} completion hook failed: {str(e)}")
+        job.finished_at = time.time()
+        job.publish("done", job.to_dict())
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, index = await self._queue.get()
+            upload = job.uploads[index]
+            entry = job.files[index]
+            progress = JobProgress(job, index, loop)
+            try:
+                result_key = await self.process_file(upload, progress)
+                entry["result_key"] = result_key
+                if result_key is None:
+                    progress.set_status(STATUS_NO_TEXT)
+                else:
+                    progress.set_status(STATUS_COMPLETED)
+                    job.publish("result", {"index": index, "filename": entry["filename"], "result_key": result_key})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Job {job.id} failed on {entry['filename']}: {str(e)}")
+                entry["error"] = str(e)
+                progress.set_status(STATUS_FAILED)
+            finally:
+                upload.close()
+                self._queue.task_done()
+
+            job.remaining -= 1
+            if job.remaining == 0:
+                self._finish(job)
+
+
+def format_sse(event_id, event, data):
+    """Encode one Server-Sent Events message"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+# Client states reported by LazyClient.stats()
+STATE_IDLE = "idle"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+
+class LazyClient:
+    """A client created on first use instead of at import time.
+
+    `factory()` builds the client (importing its SDK only then) or raises.
+    Concurrent first callers wait for a single factory call. A failure is
+    remembered, so requests on a box without credentials get None at once,
+    and retried after `retry_seconds`. warm_up() starts creation in the
+    background so the first request does not pay for it. get() may block,
+    so async code calls it on a worker thread and otherwise uses peek().
+    """
+
+    def __init__(self, name, factory, client=None, retry_seconds=60):
+        """Initialize with a factory; pass a ready `client` to skip it"""
+        self.name = name
+        self.factory = factory
+        self.retry_seconds = retry_seconds
+        self._client = client
+        self._state = STATE_READY if client is not None else STATE_IDLE
+        self._failed_at = None
+        self._error = None
+        self._init_seconds = None
+        self._lock = threading.Lock()
+
+    def _due(self):
+        if self._state == STATE_IDLE:
+            return True
+        return self._state == STATE_FAILED and time.monotonic() - self._failed_at >= self.retry_seconds
+
+    def get(self):
+        """The client, creating it if needed; None if it cannot be created"""
+        if self._state == STATE_READY:
+            return self._client
+        with self._lock:
+            if self._due():
+                start = time.perf_counter()
+                try:
+                    self._client = self.factory()
+                    self._state = STATE_READY
+                    self._error = None
+                    print(f"✅ {self.name} client ready in {time.perf_counter() - start:.2f} s")
+                except Exception as e:
+                    self._client = None
+                    self._state = STATE_FAILED
+                    self._failed_at = time.monotonic()
+                    self._error = str(e)
+                    print(f"❌ {self.name} client unavailable: {str(e)}")
+                self._init_seconds = time.perf_counter() - start
+            return self._client
+
+    def peek(self):
+        """The client if it already exists, else None; never creates it or waits for the lock"""
+        return self._client if self._state == STATE_READY else None
+
+    @property
+    def ready(self):
+        """Whether the client exists, without creating it"""
+        return self._state == STATE_READY
+
+    def warm_up(self):
+        """Create the client on a background thread"""
+        thread = threading.Thread(target=self.get, name=f"warm-up-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {
+            "state": self._state,
+            "init_seconds": None if self._init_seconds is None else round(self._init_seconds, 3),
+            "error": self._error,
+        }
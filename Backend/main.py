@@ -1,21 +1,46 @@
-from google.cloud import vision
-from google.cloud import translate_v2 as translate
-from google.oauth2 import service_account
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Query
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import json
-import re
-import unicodedata
+import csv
 import os
+import time
 import warnings
-import fitz  # PyMuPDF for PDF processing
 import uvicorn
-from datetime import datetime
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from dotenv import load_dotenv
 from pydantic import BaseModel
+from pdf_engine import PDFEngine, SOURCE_FAILED
+from result_cache import ResultCache, make_cache_key
+from results_store import ResultsStore
+from serialization import ORJSON_AVAILABLE
+from exports import ResultExporter
+from search_index import SearchIndex, snippet
+from ingestion import ingest_uploads, close_uploads, UploadTooLargeError
+from jobs import JobManager, format_sse, STATUS_OCR, STATUS_ANALYZING
+from text_normalizer import TextNormalizer
+from script_detection import detect_script_language
+from translation_pipeline import TranslationPipeline
+from ner_scheduler import NERScheduler, ENTITY_KEYS, CHARS_PER_TOKEN, merge_entities
+from entity_patterns import extract_pattern_entities, PATTERN_ENTITY_KEYS
+from dss import load_claimants, evaluate_batch, claimant_fields, DEFAULT_RULES_PATH
+from rule_engine import RuleEngine
+from spatial_index import SpatialIndex, PolygonLayer, load_layers, parse_coordinates
+from geojson_stream import read_feature_table, SURVEY_SCHEMA
+from vector_tiles import VectorTileServer, TileCache, source_version
+from geometry_store import GeometryStoreSet
+from chat_assistant import ChatAssistant, ERROR_REPLY
+from retrieval import DocumentRetriever
+from lazy_client import LazyClient
+from health import HealthMonitor
+from metrics import (
+    registry as metrics_registry, stage, staged, external_call, record_pages,
+    start_request, end_request, request_timings, server_timing, HTTP_SECONDS, HTTP_BYTES
+)
 
 
 # Load environment variables
@@ -27,13 +52,6 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 
-# Import Google Generative AI (Gemini)
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-
 # Configuration from environment variables
 class Config:
     # Google Cloud credentials - convert relative path to absolute
@@ -54,20 +72,109 @@ class Config:
     # File processing settings
     MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
     MAX_TOTAL_SIZE_MB = int(os.getenv("MAX_TOTAL_SIZE_MB", "50"))
+    UPLOAD_SPOOL_MB = int(os.getenv("UPLOAD_SPOOL_MB", "2"))  # Uploads larger than this are spooled to disk
+    UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None  # Defaults to the system temp directory
     
     # Translation settings
     AUTO_TRANSLATE = os.getenv("AUTO_TRANSLATE", "True").lower() == "true"
-    SOURCE_LANGUAGE = os.getenv("SOURCE_LANGUAGE", "te")  # Telugu by default
+    SOURCE_LANGUAGE = os.getenv("SOURCE_LANGUAGE", "te")  # Telugu by default; comma-separated for several (e.g. "te,or,kn")
     TARGET_LANGUAGE = os.getenv("TARGET_LANGUAGE", "en")  # English by default
+    TRANSLATE_CHUNK_CHARS = int(os.getenv("TRANSLATE_CHUNK_CHARS", "4500"))  # Character budget per Translate request
+    TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))  # Translate requests in flight per document
+    
+    # Text normalization settings
+    NORMALIZE_BATCH_WORKERS = int(os.getenv("NORMALIZE_BATCH_WORKERS", "1"))  # Processes for large normalize_batch calls
+    
+    # Spatial index settings (polygon layers checked against claim coordinates)
+    _repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    SPATIAL_SURVEYS_PATH = os.getenv("SPATIAL_SURVEYS_PATH", os.path.join(_repo_root, "geojson", "surveys.geojson"))
+    SPATIAL_MANDALS_PATH = os.getenv("SPATIAL_MANDALS_PATH", os.path.join(_repo_root, "public", "geojson", "mandals.geojson"))
+    SPATIAL_DISTRICTS_PATH = os.getenv("SPATIAL_DISTRICTS_PATH", os.path.join(_repo_root, "public", "geojson", "districts.geojson"))
+    SPATIAL_AREA_TOLERANCE = float(os.getenv("SPATIAL_AREA_TOLERANCE", "0.1"))  # Accepted relative LAND_AREA mismatch
+    SPATIAL_UPLOAD_MAX_MB = int(os.getenv("SPATIAL_UPLOAD_MAX_MB", "1024"))  # Largest GeoJSON layer export accepted for ingestion
+    
+    # Vector tile settings (the spatial layers served as Mapbox Vector Tiles)
+    TILE_MAX_ZOOM = int(os.getenv("TILE_MAX_ZOOM", "18"))
+    TILE_EXTENT = int(os.getenv("TILE_EXTENT", "4096"))  # Grid units per tile side
+    TILE_BUFFER = int(os.getenv("TILE_BUFFER", "64"))  # Grid units kept beyond the tile edge so borders don't show seams
+    TILE_SIMPLIFY_PIXELS = float(os.getenv("TILE_SIMPLIFY_PIXELS", "0.5"))  # Simplification tolerance in pixels of a 256 px tile
+    TILE_CACHE_MEMORY_MB = int(os.getenv("TILE_CACHE_MEMORY_MB", "64"))  # In-memory LRU budget for generated tiles
+    TILE_CACHE_DIR = os.getenv("TILE_CACHE_DIR", "")  # Set to a directory to keep generated tiles across restarts
+    TILE_MAX_AGE_SECONDS = int(os.getenv("TILE_MAX_AGE_SECONDS", "3600"))  # Cache-Control max-age sent with tiles
+    
+    # Geometry store settings (quantized binary copies of the spatial layers with levels of detail)
+    GEOMETRY_STORE_DIR = os.getenv("GEOMETRY_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "geometry_store"))
+    GEOMETRY_QUANTUM = float(os.getenv("GEOMETRY_QUANTUM", "0.000001"))  # Coordinate step in degrees
+    GEOMETRY_LOD_TOLERANCES = [float(t) for t in os.getenv("GEOMETRY_LOD_TOLERANCES", "0,0.00002,0.0001,0.0005").split(",")]  # Degrees, finest first
+    
+    # DSS settings
+    DSS_RULES_PATH = os.getenv("DSS_RULES_PATH", DEFAULT_RULES_PATH)  # JSON scheme rules, reloaded when the file changes
+    DSS_RULES_RELOAD_SECONDS = float(os.getenv("DSS_RULES_RELOAD_SECONDS", "2"))  # How often the file's mtime is checked
+    
+    # NER settings (token counts are estimated at 4 characters per token)
+    NER_MODE = os.getenv("NER_MODE", "hybrid").lower()  # hybrid (patterns + Gemini), gemini (Gemini only) or offline (patterns only)
+    NER_CHUNK_TOKENS = int(os.getenv("NER_CHUNK_TOKENS", "6000"))  # Longer texts are split into chunks of this size
+    NER_CHUNK_OVERLAP_TOKENS = int(os.getenv("NER_CHUNK_OVERLAP_TOKENS", "200"))
+    NER_PACK_TOKENS = int(os.getenv("NER_PACK_TOKENS", "8000"))  # Budget for several short documents in one prompt
+    NER_SHORT_DOC_TOKENS = int(os.getenv("NER_SHORT_DOC_TOKENS", "1500"))  # Documents up to this size can be packed
+    NER_CONCURRENCY = int(os.getenv("NER_CONCURRENCY", "4"))  # Gemini calls in flight per document or batch
+    NER_BATCH_PACKING = os.getenv("NER_BATCH_PACKING", "True").lower() == "true"  # Pack a batch's short documents
+    
+    # Concurrency settings
+    CONCURRENT_PROCESSING = os.getenv("CONCURRENT_PROCESSING", "True").lower() == "true"
+    WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "32"))  # Threads for blocking OCR/Translate/Gemini calls
+    MAX_CONCURRENT_FILES = int(os.getenv("MAX_CONCURRENT_FILES", "20"))  # Files processed in parallel per batch
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))  # Files processed in parallel across all background jobs
+    JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))  # Keep finished job status this long
+    
+    # PDF OCR settings
+    PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1)))  # Render processes
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))  # Smaller PDFs render in-process
+    VISION_BATCH_SIZE = int(os.getenv("VISION_BATCH_SIZE", "16"))  # Page images per batch_annotate_images call
+    VISION_BATCH_MAX_MB = int(os.getenv("VISION_BATCH_MAX_MB", "8"))  # Payload cap per batch call
+    VISION_BATCH_CONCURRENCY = int(os.getenv("VISION_BATCH_CONCURRENCY", "4"))  # Batch calls in flight per PDF
+    PDF_TEXT_LAYER = os.getenv("PDF_TEXT_LAYER", "True").lower() == "true"  # Skip OCR for pages with embedded text
+    PDF_TEXT_LAYER_MIN_CHARS = int(os.getenv("PDF_TEXT_LAYER_MIN_CHARS", "50"))
+    PDF_TEXT_LAYER_MIN_PRINTABLE_RATIO = float(os.getenv("PDF_TEXT_LAYER_MIN_PRINTABLE_RATIO", "0.9"))
+    
+    # Result cache settings
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "True").lower() == "true"
+    CACHE_MEMORY_MB = int(os.getenv("CACHE_MEMORY_MB", "256"))  # In-memory LRU budget
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "")  # Set to a file path to persist the cache across restarts
+    
+    # Chat settings
+    CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "True").lower() == "true"  # Reuse replies to repeated questions on the same context
+    CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "1500"))  # Document context budget per chat turn
+    CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", "5"))  # Most relevant document chunks included per turn
+    CHAT_CHUNK_TOKENS = int(os.getenv("CHAT_CHUNK_TOKENS", "200"))  # Size of the indexed document chunks
+    CHAT_MAX_INDEXES = int(os.getenv("CHAT_MAX_INDEXES", "64"))  # Documents or batches whose chunk index is kept
+    
+    # Results storage settings
+    RESULTS_MAX_MB = int(os.getenv("RESULTS_MAX_MB", "256"))  # Memory budget for stored results
+    RESULTS_TTL_SECONDS = int(os.getenv("RESULTS_TTL_SECONDS", str(24 * 3600)))  # Drop results unread for this long
+    RESULTS_COMPRESS = os.getenv("RESULTS_COMPRESS", "True").lower() == "true"
+    
+    # Export settings (/export and /download-results stream stored results)
+    EXPORT_CHUNK_KB = int(os.getenv("EXPORT_CHUNK_KB", "256"))  # Size of streamed response chunks
+    EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "50000"))  # Rows per Parquet row group / Arrow batch
+    
+    # Client and health settings (Vision, Translate and Gemini clients are created on first use)
+    CLIENT_WARMUP = os.getenv("CLIENT_WARMUP", "True").lower() == "true"  # Create the clients in the background at startup
+    CLIENT_RETRY_SECONDS = int(os.getenv("CLIENT_RETRY_SECONDS", "60"))  # Retry creating a client that failed after this long
+    HEALTH_PROBE_INTERVAL_SECONDS = int(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "300"))  # Time between external health probes; 0 probes once at startup
 
 # Initialize configuration
 config = Config()
 
+# orjson encodes responses several times faster than the standard library when it is installed
+FastJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
 # Initialize FastAPI app
 app = FastAPI(
     title="FRA Document OCR & AI Entity Recognition + Scheme Recommendation",
     description="API for processing FRA documents using Google Cloud Vision OCR, Gemini AI for NER, and FRA scheme recommendations",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -79,8 +186,112 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inverted index over stored results and their entities, served by /search
+search_index = SearchIndex()
+
+def forget_result(key):
+    """Drop an evicted or expired result from the search index and the chat retrieval indexes"""
+    search_index.remove(key)
+    document_retriever.remove(key)
+
 # Global storage for results (in production, use a database)
-results_storage = {}
+results_storage = ResultsStore(
+    max_bytes=config.RESULTS_MAX_MB * 1024 * 1024,
+    ttl_seconds=config.RESULTS_TTL_SECONDS,
+    compress=config.RESULTS_COMPRESS,
+    on_remove=forget_result
+)
+
+# Streams stored results as JSON, NDJSON, Parquet or Arrow
+result_exporter = ResultExporter(
+    results_storage,
+    chunk_bytes=config.EXPORT_CHUNK_KB * 1024,
+    batch_rows=config.EXPORT_BATCH_ROWS
+)
+
+# Content-addressed cache for OCR, language detection, translation and NER results
+result_cache = ResultCache(
+    max_memory_bytes=config.CACHE_MEMORY_MB * 1024 * 1024,
+    sqlite_path=config.CACHE_SQLITE_PATH or None,
+    enabled=config.CACHE_ENABLED
+)
+
+# Bounded worker pool for the blocking Vision, Translate and Gemini client calls
+worker_pool = ThreadPoolExecutor(max_workers=config.WORKER_POOL_SIZE, thread_name_prefix="fra-worker")
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the worker pool so the event loop stays responsive"""
+    loop = asyncio.get_running_loop()
+    # Run in a copy of the caller's context so stage timings count toward its request
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(worker_pool, partial(context.run, func, *args, **kwargs))
+
+async def client_available(lazy_client):
+    """Whether a lazy client can be used, creating it on the worker pool so the event loop never waits for it"""
+    if lazy_client.ready:
+        return True
+    return await run_blocking(lazy_client.get) is not None
+
+async def iterate_blocking(iterator):
+    """Drive a blocking iterator on the worker pool, one item at a time"""
+    done = object()
+    while True:
+        item = await run_blocking(next, iterator, done)
+        if item is done:
+            break
+        yield item
+
+@app.middleware("http")
+async def reject_oversized_requests(request, call_next):
+    """Refuse request bodies whose declared length exceeds the batch limit before parsing them"""
+    content_length = request.headers.get("content-length")
+    # Layer exports have their own, larger limit
+    limit_mb = config.SPATIAL_UPLOAD_MAX_MB if request.url.path.startswith("/spatial/layers/") else config.MAX_TOTAL_SIZE_MB
+    # Allow 1 MB on top of the file limit for multipart boundaries and headers
+    max_body_bytes = (limit_mb + 1) * 1024 * 1024
+    if content_length and content_length.isdigit() and int(content_length) > max_body_bytes:
+        return FastJSONResponse(
+            status_code=413,
+            content={
+                "success": False,
+                "message": f"Request body exceeds the {limit_mb} MB upload limit",
+                "results": []
+            }
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Record latency and body sizes per route and return the request's stage timings as Server-Timing.
+    
+    Stages running concurrently (files of a batch, Vision batches, Gemini
+    chunks) each add their own time, so the breakdown can exceed the total.
+    Streaming responses are timed up to their first byte.
+    """
+    started = time.perf_counter()
+    token = start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        timings = end_request(token)
+    elapsed = time.perf_counter() - started
+    
+    # Label by route template, not the raw path, to keep the number of series bounded
+    route = request.scope.get("route")
+    route = getattr(route, "path", "unmatched")
+    HTTP_SECONDS.observe(elapsed, request.method, route, str(response.status_code))
+    for direction, length in (("in", request.headers.get("content-length")),
+                              ("out", response.headers.get("content-length"))):
+        if length and length.isdigit():
+            HTTP_BYTES.inc(int(length), route, direction)
+    response.headers["Server-Timing"] = server_timing(timings, elapsed)
+    return response
+
+@app.on_event("shutdown")
+def shutdown_worker_pool():
+    """Release worker threads and PDF render processes when the server stops"""
+    worker_pool.shutdown(wait=False)
+    PDFEngine.shutdown()
 
 # FRA claimant data for scheme recommendation
 fra_claimant = {
@@ -122,6 +333,11 @@ fra_claimant = {
 }
 
 # Pydantic models for request/response
+class PageInfo(BaseModel):
+    page: int
+    source: str  # "text_layer", "ocr" or "failed"
+    characters: int
+
 class ProcessingResult(BaseModel):
     filename: str
     raw_text: str
@@ -130,12 +346,18 @@ class ProcessingResult(BaseModel):
     translated_text: Optional[str] = None
     original_language: Optional[str] = None
     entities: Dict[str, Any]
+    pages: Optional[List[PageInfo]] = None
 
 class EntityExtractionResponse(BaseModel):
     success: bool
     message: str
     results: List[ProcessingResult]
 
+class BulkLookupRequest(BaseModel):
+    lon: List[float]
+    lat: List[float]
+    land_area: Optional[List[Optional[str]]] = None
+
 class HealthResponse(BaseModel):
     status: str
     gemini_available: bool
@@ -147,259 +369,244 @@ class TranslationHealthResponse(BaseModel):
     translate_api_available: bool
     supported_languages: int
     test_translation: str
-
-# DSS function for FRA schemes
-def fra_dss(claimant):
-    schemes = []
-    
-    # FRA Rights
-    if claimant["Claim Status"] == "Granted":
-        schemes.append("Individual Forest Rights - Title to forest land under occupation (up to 4 ha)")
-        if claimant["ST"]:
-            schemes.append("Community Forest Rights - Nistar, grazing, MFP collection, habitat for PTGs")
-        if claimant["Village ST Percentage"] >= 50 or (claimant["Aspirational District"] and claimant["Village ST Population"] >= 50):
-            schemes.append("Community Forest Resource Rights - Management and conservation authority")
-
-    # Core CSS Schemes
-    if claimant["Claim Status"] == "Granted":
-        schemes.append("National Social Assistance Programme (NSAP)")
-        schemes.append("Mahatma Gandhi National Rural Employment Guarantee Programme (MGNREGA)")
-        if claimant["SC"]:
-            schemes.append("Umbrella Scheme for Development of Scheduled Castes")
-        if claimant["ST"]:
-            schemes.append("Umbrella Programme for Development of Scheduled Tribes")
-        if claimant["Other Vulnerable"]:
-            schemes.append("Umbrella Programme for Development of Other Vulnerable Groups")
-
-    # DAJGUA
-    if (claimant["Village Population"] >= 500 and claimant["Village ST Percentage"] >= 50) or (claimant["Aspirational District"] and claimant["Village ST Population"] >= 50):
-        schemes.append("Village Eligible for DAJGUA Interventions")
-        if claimant["ST"]:
-            if claimant["No Pucca House"]:
-                schemes.append("Priority: PMAY-G for low-income ST HH")
-            if claimant["Water Index"] < 0.3:
-                schemes.append("Priority: JJM due to low water index")
-            if claimant["Unelectrified HH"]:
-                schemes.append("Eligible: House Electrification under RDSS")
-    
-    # Other CSS Schemes
-    if claimant["Land Area (hectares)"] <= 2.5 and claimant["Claim Status"] == "Granted":
-        schemes.append("Pradhan Mantri Krishi Sinchai Yojana (Micro-irrigation)")
-        schemes.append("PM Kisan Samman Nidhi (Income Support)")
-
-    if claimant["Water Index"] < 0.3:
-        schemes.append("Priority: Jal Jeevan Mission / Borewell schemes (low water index)")
-
-    if claimant["Income Level"] == "Low" or claimant["No Pucca House"] or claimant["No Toilet"]:
-        schemes.append("PM Awas Yojana – PMAY (Rural Housing Assistance)")
-        schemes.append("Swachh Bharat Mission – SBM Rural/Urban (Sanitation)")
-
-    return schemes
-
-def make_json_serializable(obj):
-    """Convert numpy types to JSON serializable types"""
-    if hasattr(obj, 'dtype'):
-        if 'float' in str(obj.dtype):
-            return float(obj)
-        elif 'int' in str(obj.dtype):
-            return int(obj)
-        else:
-            return str(obj)
-    elif isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(make_json_serializable(item) for item in obj)
-    elif hasattr(obj, 'item'):  # numpy scalar
-        return obj.item()
-    else:
-        return obj
+    checked_seconds_ago: Optional[float] = None  # Age of the probe result served
 
 class OCRProcessor:
     """Handle Google Cloud Vision API OCR processing"""
     
-    def __init__(self, credentials_path):
-        """Initialize with Google Cloud credentials"""
-        try:
-            credentials = service_account.Credentials.from_service_account_file(credentials_path)
-            self.client = vision.ImageAnnotatorClient(credentials=credentials)
-            self.credentials_loaded = True
-        except Exception as e:
-            print(f"Failed to load Google Cloud credentials: {str(e)}")
-            self.credentials_loaded = False
+    def __init__(self, credentials_path, client=None):
+        """Initialize with Google Cloud credentials, or with a ready Vision `client`"""
+        self.credentials_path = credentials_path
+        self.vision = LazyClient("Google Cloud Vision", self._create_client, client,
+                                 retry_seconds=config.CLIENT_RETRY_SECONDS)
+        self._pdf_engine = None
+    
+    def _create_client(self):
+        """Create the Vision client (called once, on first use)"""
+        from google.cloud import vision
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_file(self.credentials_path)
+        return vision.ImageAnnotatorClient(credentials=credentials)
+    
+    @property
+    def client(self):
+        return self.vision.get()
+    
+    @property
+    def credentials_loaded(self):
+        """Whether Vision is usable; creates the client on first use, so async handlers use client_available()"""
+        return self.client is not None
+    
+    @property
+    def pdf_engine(self):
+        """PDF engine bound to the Vision client"""
+        if self._pdf_engine is None and self.client is not None:
+            # Building the engine is cheap and stateless, so a rare duplicate from a race is harmless
+            self._pdf_engine = PDFEngine(
+                self.client,
+                render_workers=config.PDF_RENDER_WORKERS,
+                batch_size=config.VISION_BATCH_SIZE,
+                batch_max_bytes=config.VISION_BATCH_MAX_MB * 1024 * 1024,
+                ocr_concurrency=config.VISION_BATCH_CONCURRENCY,
+                parallel_min_pages=config.PDF_PARALLEL_MIN_PAGES,
+                use_text_layer=config.PDF_TEXT_LAYER,
+                text_layer_min_chars=config.PDF_TEXT_LAYER_MIN_CHARS,
+                text_layer_min_printable_ratio=config.PDF_TEXT_LAYER_MIN_PRINTABLE_RATIO
+            )
+        return self._pdf_engine
     
+    @staged("ocr_image")
     def extract_text_from_image(self, image_bytes):
         """Extract text from image using Vision API"""
         if not self.credentials_loaded:
             return None
+        
+        cache_key = make_cache_key(image_bytes)
+        cached = result_cache.get("ocr_image", cache_key)
+        if cached is not None:
+            return cached
             
         try:
+            from google.cloud import vision
             image = vision.Image(content=image_bytes)
-            response = self.client.document_text_detection(image=image)
-            
-            if response.error.message:
-                raise Exception(f"Vision API error: {response.error.message}")
-            
-            # Get full text annotation
-            if response.full_text_annotation:
-                return response.full_text_annotation.text
-            else:
-                return ""
+            with external_call("vision", "document_text_detection", sent=len(image_bytes)) as call:
+                response = self.client.document_text_detection(image=image)
+                
+                if response.error.message:
+                    raise Exception(f"Vision API error: {response.error.message}")
+                
+                # Get full text annotation
+                text = response.full_text_annotation.text if response.full_text_annotation else ""
+                call.received = len(text)
+            result_cache.set("ocr_image", cache_key, text)
+            return text
                 
         except Exception as e:
             print(f"OCR processing failed: {str(e)}")
             return None
     
-    def extract_text_from_pdf(self, pdf_bytes):
-        """Extract text from PDF by converting pages to images"""
+    @staged("ocr_pdf")
+    def extract_pdf_pages(self, pdf_source, content_hash=None, on_page=None):
+        """Extract per-page text from PDF, using the embedded text layer where usable.
+        
+        `pdf_source` is either the PDF bytes or a path to the file; for paths,
+        pass the content hash so the result can be cached. `on_page(page, source)`
+        is called as each page finishes.
+        """
         if not self.credentials_loaded:
             return None
+        
+        engine = self.pdf_engine
+        cache_key = None
+        if content_hash is not None or not isinstance(pdf_source, str):
+            cache_key = make_cache_key(
+                content_hash or pdf_source, engine.zoom, engine.use_text_layer,
+                engine.text_layer_min_chars, engine.text_layer_min_printable_ratio
+            )
+            cached = result_cache.get("ocr_pdf", cache_key)
+            if cached is not None:
+                return cached
             
         try:
-            # Open PDF from bytes
-            doc = fitz.open("pdf", pdf_bytes)
-            all_text = ""
-            
-            for page_num in range(doc.page_count):
-                # Convert page to image
-                page = doc[page_num]
-                mat = fitz.Matrix(2, 2)  # Increase resolution
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Extract text using Vision API
-                page_text = self.extract_text_from_image(img_data)
-                if page_text:
-                    all_text += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-            
-            doc.close()
-            return all_text
+            pages = engine.extract_pages(pdf_source, on_page)
+            # Only cache complete extractions so failed pages are retried next time
+            if cache_key and all(page["source"] != SOURCE_FAILED for page in pages):
+                result_cache.set("ocr_pdf", cache_key, pages)
+            return pages
             
         except Exception as e:
             print(f"PDF processing failed: {str(e)}")
             return None
+    
+    def extract_text_from_pdf(self, pdf_bytes):
+        """Extract text from PDF by rendering pages in parallel and batching Vision calls"""
+        pages = self.extract_pdf_pages(pdf_bytes)
+        if pages is None:
+            return None
+        return PDFEngine.assemble_text(pages)
 
 class TranslationService:
     """Handle text translation using Google Translate API"""
     
-    def __init__(self):
-        """Initialize Google Translate client"""
-        try:
-            credentials_path = config.GOOGLE_CREDENTIALS_PATH
-            
-            if os.path.exists(credentials_path):
-                credentials = service_account.Credentials.from_service_account_file(
-                    credentials_path, 
-                    scopes=[
-                        'https://www.googleapis.com/auth/cloud-platform',
-                        'https://www.googleapis.com/auth/cloud-translation'
-                    ]
-                )
-                self.translate_client = translate.Client(credentials=credentials)
-                print("✅ Google Translate API initialized successfully")
-            else:
-                print("❌ Google service account key not found at:", credentials_path)
-                self.translate_client = None
-        except Exception as e:
-            print(f"❌ Failed to initialize Google Translate: {str(e)}")
-            self.translate_client = None
+    def __init__(self, client=None):
+        """Initialize Google Translate client, or use a ready `client`"""
+        self.translate = LazyClient("Google Translate", self._create_client, client,
+                                    retry_seconds=config.CLIENT_RETRY_SECONDS)
+        self._pipeline = None
     
+    def _create_client(self):
+        """Create the Translate client (called once, on first use)"""
+        credentials_path = config.GOOGLE_CREDENTIALS_PATH
+        if not os.path.exists(credentials_path):
+            raise FileNotFoundError(f"Google service account key not found at: {credentials_path}")
+        from google.cloud import translate_v2 as translate
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_path, 
+            scopes=[
+                'https://www.googleapis.com/auth/cloud-platform',
+                'https://www.googleapis.com/auth/cloud-translation'
+            ]
+        )
+        return translate.Client(credentials=credentials)
+    
+    @property
+    def translate_client(self):
+        return self.translate.get()
+    
+    @property
+    def pipeline(self):
+        """Sentence-chunked translation pipeline over the client"""
+        if self._pipeline is None and self.translate_client is not None:
+            self._pipeline = TranslationPipeline(
+                self.translate_client,
+                memory=result_cache,
+                max_chars=config.TRANSLATE_CHUNK_CHARS,
+                concurrency=config.TRANSLATE_CONCURRENCY
+            )
+        return self._pipeline
+    
+    @staged("language_detection")
     def detect_language(self, text):
         """Detect language using Google Translate API"""
         if not self.translate_client:
             return self._fallback_language_detection(text)
         
+        sample_text = text[:1000]
+        cache_key = make_cache_key(sample_text)
+        cached = result_cache.get("language", cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            result = self.translate_client.detect_language(text[:1000])
+            with external_call("translate", "detect_language", sent=len(sample_text)):
+                result = self.translate_client.detect_language(sample_text)
             detected_lang = result['language']
             confidence = result['confidence']
             
-            return {
+            detection = {
                 'language': detected_lang,
                 'confidence': confidence
             }
+            result_cache.set("language", cache_key, detection)
+            return detection
             
         except Exception as e:
             print(f"Language detection error: {str(e)}")
             return self._fallback_language_detection(text)
     
     def _fallback_language_detection(self, text):
-        """Enhanced fallback language detection"""
-        language_ranges = {
-            'hi': [(0x0900, 0x097F)],  # Devanagari
-            'bn': [(0x0980, 0x09FF)],  # Bengali
-            'te': [(0x0C00, 0x0C7F)],  # Telugu
-            'ta': [(0x0B80, 0x0BFF)],  # Tamil
-            'ar': [(0x0600, 0x06FF)],  # Arabic
-            'zh': [(0x4E00, 0x9FFF)],  # Chinese
-        }
-        
-        char_counts = {}
-        total_chars = 0
-        sample_text = text[:1000] if len(text) > 1000 else text
-        
-        for char in sample_text:
-            if char.isalpha():
-                total_chars += 1
-                char_code = ord(char)
-                
-                detected_lang = None
-                for lang, ranges in language_ranges.items():
-                    for start, end in ranges:
-                        if start <= char_code <= end:
-                            detected_lang = lang
-                            break
-                    if detected_lang:
-                        break
-                
-                if detected_lang:
-                    char_counts[detected_lang] = char_counts.get(detected_lang, 0) + 1
-        
-        if total_chars > 0 and char_counts:
-            most_common_lang = max(char_counts, key=char_counts.get)
-            confidence = char_counts[most_common_lang] / total_chars
-            
-            if confidence > 0.1:
-                return {
-                    'language': most_common_lang,
-                    'confidence': confidence
-                }
-        
-        return {'language': 'en', 'confidence': 0.0}
+        """Script-based fallback language detection"""
+        return detect_script_language(text)
     
-    def translate_with_google(self, text, target_language='en'):
-        """Translate text using Google Translate API"""
+    @staged("translation")
+    def translate_with_google(self, text, target_language='en', detection=None):
+        """Translate text using Google Translate API.
+        
+        Pass the document's `detection` result to avoid detecting its language again.
+        """
         if not self.translate_client:
             return text
         
+        cache_key = make_cache_key(text, target_language)
+        cached = result_cache.get("translation", cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            detection = self.detect_language(text)
+            if detection is None:
+                detection = self.detect_language(text)
             source_lang = detection['language']
             
             if source_lang == target_language or source_lang == 'en':
                 return text
             
-            result = self.translate_client.translate(
+            # Sentence-chunked, batched requests; repeated segments come from the translation memory
+            translated_text, stats = self.pipeline.translate(
                 text,
-                target_language=target_language,
                 source_language=source_lang if source_lang != 'unknown' else None,
-                format_='text'
+                target_language=target_language
             )
             
-            return result['translatedText']
+            if stats["failed_segments"]:
+                print(f"Google Translate left {stats['failed_segments']} of {stats['segments']} segment(s) untranslated")
+            else:
+                result_cache.set("translation", cache_key, translated_text)
+            return translated_text
             
         except Exception as e:
             print(f"Google Translate error: {str(e)}")
             return text
     
-    def should_translate(self, text):
-        """Determine if text needs translation"""
+    def should_translate(self, text, detection=None):
+        """Determine if text needs translation, reusing `detection` when given"""
         if not config.AUTO_TRANSLATE:
             return False
         
-        detection = self.detect_language(text)
-        if detection and detection.get('language') == 'te':
+        if detection is None:
+            detection = self.detect_language(text)
+        source_languages = [lang.strip() for lang in config.SOURCE_LANGUAGE.split(",")]
+        if detection and detection.get('language') in source_languages:
             confidence = detection.get('confidence', 0)
             return confidence > 0.1
         
@@ -408,176 +615,369 @@ class TranslationService:
 class TextPreprocessor:
     """Handle text cleaning and normalization"""
     
+    normalizer = TextNormalizer(batch_workers=config.NORMALIZE_BATCH_WORKERS)
+    
     @staticmethod
     def clean_text(text):
         """Clean and normalize extracted text"""
-        if not text:
-            return ""
-        
-        text = unicodedata.normalize('NFKD', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s\-.,;:()\[\]{}\'"/\\]', ' ', text)
-        
-        replacements = {
-            r'\bl\b': 'I',
-            r'\b0\b': 'O',
-            r'rn': 'm',
-            r'[|!]': 'l',
-        }
-        
-        for pattern, replacement in replacements.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        text = ' '.join(text.split())
-        return text.strip()
+        return TextNormalizer.clean(text)
     
     @staticmethod
     def standardize_spacing(text):
         """Standardize spacing and line breaks"""
-        if not text:
-            return ""
-        
-        text = re.sub(r'\r\n|\r|\n', ' ', text)
-        text = re.sub(r'\s*([,.;:!?])\s*', r'\1 ', text)
-        text = re.sub(r'\s{2,}', ' ', text)
-        
-        return text.strip()
+        return TextNormalizer.standardize(text)
+    
+    @staticmethod
+    @staged("normalize")
+    def normalize(text):
+        """Clean and standardize in one call, returning (cleaned_text, standardized_text)"""
+        return TextNormalizer.normalize(text)
+    
+    @classmethod
+    @staged("normalize")
+    def normalize_batch(cls, texts):
+        """Normalize many documents at once, returning a list of (cleaned_text, standardized_text)"""
+        return cls.normalizer.normalize_batch(texts)
 
 class NERExtractor:
     """Handle Named Entity Recognition using Google Gemini API"""
     
-    def __init__(self):
-        """Initialize Gemini NER model"""
-        self.gemini_model = None
+    def __init__(self, model=None):
+        """Initialize Gemini NER model, or use a ready `model`"""
+        self.model_name = 'gemini-2.5-flash'
         self.api_key = config.GEMINI_API_KEY
-        self.load_model()
+        self.mode = config.NER_MODE
+        # In hybrid mode Gemini is only asked for the types the local patterns cannot find
+        if self.mode == "gemini":
+            self.gemini_keys = ENTITY_KEYS
+        else:
+            self.gemini_keys = [key for key in ENTITY_KEYS if key not in PATTERN_ENTITY_KEYS]
+        self.gemini = LazyClient("Gemini", self.load_model, model, retry_seconds=config.CLIENT_RETRY_SECONDS)
+        self.scheduler = NERScheduler(
+            self._generate,
+            max_chunk_tokens=config.NER_CHUNK_TOKENS,
+            overlap_tokens=config.NER_CHUNK_OVERLAP_TOKENS,
+            pack_tokens=config.NER_PACK_TOKENS,
+            short_doc_tokens=config.NER_SHORT_DOC_TOKENS,
+            concurrency=config.NER_CONCURRENCY,
+            entity_keys=self.gemini_keys
+        )
+        if self.mode == "offline":
+            print("✅ NER running offline with local pattern extraction only")
     
     def load_model(self):
-        """Load Gemini model"""
-        if GEMINI_AVAILABLE:
-            try:
-                genai.configure(api_key=self.api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-                print("✅ Gemini API initialized successfully")
-            except Exception as e:
-                print(f"❌ Gemini API initialization failed: {str(e)}")
-                self.gemini_model = None
-        else:
-            print("❌ Google Generative AI package not available")
+        """Load Gemini model (called once, on first use)"""
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise RuntimeError("Google Generative AI package not available")
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.model_name)
+    
+    @property
+    def gemini_model(self):
+        """The Gemini model, or None when offline or unavailable; may block, so not for the event loop"""
+        if self.mode == "offline":
+            return None
+        return self.gemini.get()
+    
+    def _generate(self, prompt):
+        """Send one prompt to Gemini and return the reply text"""
+        with external_call("gemini", "generate_content", sent=len(prompt)) as call:
+            text = self.gemini_model.generate_content(prompt).text
+            call.received = len(text)
+            return text
     
     def extract_entities_gemini(self, text):
-        """Extract entities using Google Gemini API"""
+        """Extract entities using Google Gemini API.
+        
+        Long texts are split into overlapping chunks extracted in parallel
+        and merged, so no document fails only because of its length.
+        """
         if not self.gemini_model or not text:
             return {}
         
-        try:
-            prompt = f"""
-You are an expert multilingual NER system specialized in official government documents worldwide. 
-
-TASK: Extract entities from this document text (originally translated from any language to English).
-
-DOCUMENT TEXT:
-{text}
-
-INSTRUCTIONS:
-1. This document may have been translated from ANY language (Hindi, Telugu, Tamil, Arabic, Spanish, French, etc.)
-2. Extract ALL entities even if names seem unusual due to transliteration
-3. Look for patterns that indicate official document entities regardless of language origin
-4. Be extra careful with proper names that may have been transliterated
-
-ENTITY TYPES TO EXTRACT:
-- PATTA_HOLDER_NAME: Primary land title holder names, main applicant names
-- PATTA_NUMBER: Patta numbers, land title numbers, document numbers (PAT-XXX, REG-XXX, etc.)
-- CLAIM_STATUS: Application status like 'granted', 'pending', 'approved', 'rejected', 'verified'
-- PERSON: Other person names (family members, witnesses, officers - excluding main patta holders)
-- PLACE_NAME: Villages, cities, districts, states, countries
-- ORGANIZATION: Government departments, committees, institutions
-- COORDINATES: Latitude/longitude, GPS coordinates
-- DATE: All dates in any format
-- LAND_AREA: Area measurements (hectares, acres, sq meters)
-- SURVEY_NUMBER: Land survey numbers
-- ADDRESS: Complete addresses or location descriptions
-- PHONE_NUMBER: Contact numbers
-- EMAIL: Email addresses
-
-RETURN FORMAT - EXACT JSON:
-{{
-    "PATTA_HOLDER_NAME": [],
-    "PATTA_NUMBER": [],
-    "CLAIM_STATUS": [],
-    "PERSON": [],
-    "PLACE_NAME": [],
-    "ORGANIZATION": [],
-    "COORDINATES": [],
-    "DATE": [],
-    "LAND_AREA": [],
-    "SURVEY_NUMBER": [],
-    "ADDRESS": [],
-    "PHONE_NUMBER": [],
-    "EMAIL": []
-}}
-
-CRITICAL RULES:
-- Include ALL potential names even if spelling seems unusual
-- Look for transliterated names that might appear as multiple words
-- Extract numbers with prefixes/suffixes as document numbers
-- Return ONLY valid JSON, no explanations
-"""
-
-            response = self.gemini_model.generate_content(prompt)
-            
-            try:
-                response_text = response.text.strip()
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:]
-                if response_text.startswith('```'):
-                    response_text = response_text[3:]
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
-                response_text = response_text.strip()
-                
-                entities = json.loads(response_text)
-                
-                expected_keys = ["PATTA_HOLDER_NAME", "PATTA_NUMBER", "CLAIM_STATUS", "PERSON", "PLACE_NAME", 
-                               "ORGANIZATION", "COORDINATES", "DATE", "LAND_AREA", "SURVEY_NUMBER", 
-                               "ADDRESS", "PHONE_NUMBER", "EMAIL"]
-                
-                for key in expected_keys:
-                    if key not in entities:
-                        entities[key] = []
-                    elif not isinstance(entities[key], list):
-                        entities[key] = [entities[key]] if entities[key] else []
-                
-                return entities
-                
-            except json.JSONDecodeError as e:
-                print(f"Gemini API returned invalid JSON format: {str(e)}")
-                return {}
-                
-        except Exception as e:
-            print(f"Gemini NER extraction failed: {str(e)}")
+        cache_key = make_cache_key(text, self.model_name, *self.gemini_keys)
+        cached = result_cache.get("ner", cache_key)
+        if cached is not None:
+            return cached
+        
+        entities = self.scheduler.extract(text)
+        if entities is None:
             return {}
+        
+        result_cache.set("ner", cache_key, entities)
+        return entities
     
-    def extract_all_entities(self, text):
-        """Extract entities using Gemini API"""
+    @staged("ner")
+    def extract_entities_batch(self, texts, raw_texts=None):
+        """Extract entities for many documents, packing short ones into shared prompts.
+        
+        Returns a list of entity dicts aligned with `texts`.
+        """
+        if raw_texts is None:
+            raw_texts = texts
+        if self.mode == "offline" or not self.gemini_model:
+            return [self.combine_entities(raw_text, {}, text) for text, raw_text in zip(texts, raw_texts)]
+        
+        results = [{} for _ in texts]
+        misses = []
+        for index, text in enumerate(texts):
+            if not text:
+                continue
+            cache_key = make_cache_key(text, self.model_name, *self.gemini_keys)
+            cached = result_cache.get("ner", cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                misses.append((index, text, cache_key))
+        
+        if misses:
+            extracted = self.scheduler.extract_many([text for _, text, _ in misses])
+            for (index, _, cache_key), entities in zip(misses, extracted):
+                if entities is not None:
+                    result_cache.set("ner", cache_key, entities)
+                    results[index] = entities
+        return [self.combine_entities(raw_text, entities, text)
+                for text, raw_text, entities in zip(texts, raw_texts, results)]
+    
+    @staged("ner_patterns")
+    def combine_entities(self, raw_text, gemini_entities, text=None):
+        """Merge Gemini output with locally extracted pattern entities.
+        
+        Patterns run on the raw OCR text, where dates, coordinates and
+        emails still have the punctuation that cleaning removes, and on the
+        translated `text`, where keywords such as "Survey No" appear for
+        documents in other languages. Gemini's values are kept for a
+        pattern type the patterns found nothing for.
+        """
+        if self.mode == "gemini":
+            return gemini_entities
+        
+        pattern_sources = [raw_text] if not text or text == raw_text else [raw_text, text]
+        pattern_entities = merge_entities(
+            [extract_pattern_entities(source) for source in pattern_sources], PATTERN_ENTITY_KEYS
+        )
+        entities = {key: gemini_entities.get(key) or [] for key in ENTITY_KEYS}
+        for key in PATTERN_ENTITY_KEYS:
+            if pattern_entities[key]:
+                entities[key] = pattern_entities[key]
+        return entities
+    
+    @staged("ner")
+    def extract_all_entities(self, text, raw_text=None):
+        """Extract entities using local patterns and the Gemini API"""
+        if raw_text is None:
+            raw_text = text
+        if self.mode == "offline":
+            return self.combine_entities(raw_text, {}, text)
         if self.gemini_model:
             gemini_entities = self.extract_entities_gemini(text)
-            return gemini_entities if isinstance(gemini_entities, dict) else {}
+            gemini_entities = gemini_entities if isinstance(gemini_entities, dict) else {}
+            return self.combine_entities(raw_text, gemini_entities, text)
         else:
-            print("⚠️ Gemini API not available. No entity extraction will be performed.")
-            return {}
+            print("⚠️ Gemini API not available. Only local pattern extraction will be performed.")
+            return self.combine_entities(raw_text, {}, text)
 
 # Global instances
+scheme_rules = RuleEngine(config.DSS_RULES_PATH, check_interval=config.DSS_RULES_RELOAD_SECONDS)
+spatial_paths = {
+    "survey": config.SPATIAL_SURVEYS_PATH,
+    "mandal": config.SPATIAL_MANDALS_PATH,
+    "district": config.SPATIAL_DISTRICTS_PATH
+}
+spatial_layers = load_layers(spatial_paths)
+spatial_index = SpatialIndex(spatial_layers, area_tolerance=config.SPATIAL_AREA_TOLERANCE)
+spatial_tables = {}  # Layers ingested through /spatial/layers, with their attribute indexes
+tile_server = VectorTileServer(
+    spatial_layers,
+    version=source_version(
+        spatial_paths.values(), config.TILE_EXTENT, config.TILE_BUFFER, config.TILE_SIMPLIFY_PIXELS
+    ),
+    extent=config.TILE_EXTENT,
+    buffer=config.TILE_BUFFER,
+    simplify_pixels=config.TILE_SIMPLIFY_PIXELS,
+    max_zoom=config.TILE_MAX_ZOOM,
+    cache=TileCache(
+        max_memory_bytes=config.TILE_CACHE_MEMORY_MB * 1024 * 1024,
+        directory=config.TILE_CACHE_DIR or None
+    )
+)
+geometry_stores = GeometryStoreSet(
+    config.GEOMETRY_STORE_DIR,
+    quantum=config.GEOMETRY_QUANTUM,
+    tolerances=config.GEOMETRY_LOD_TOLERANCES
+)
+geometry_stores.load_all(spatial_paths, spatial_layers)
 ocr_processor = OCRProcessor(config.GOOGLE_CREDENTIALS_PATH)
 text_preprocessor = TextPreprocessor()
 ner_extractor = NERExtractor()
+chat_assistant = ChatAssistant(
+    # Called on the event loop, so it must not create the model; handlers do that first with client_available()
+    lambda: ner_extractor.gemini.peek() if ner_extractor.mode != "offline" else None,
+    ner_extractor.model_name,
+    result_cache,
+    cache_enabled=config.CHAT_CACHE_ENABLED
+)
+document_retriever = DocumentRetriever(
+    lambda key: load_stored_results(key, keep_keys=True),
+    chunk_tokens=config.CHAT_CHUNK_TOKENS,
+    max_indexes=config.CHAT_MAX_INDEXES
+)
 translation_service = TranslationService()
 
+async def store_result(result, prefix="", name=""):
+    """Store one document result and add it to the search index; returns its key"""
+    key = results_storage.put(result, prefix=prefix, name=name)
+    await run_blocking(search_index.add, key, result)
+    return key
+
+ALLOWED_UPLOAD_TYPES = {'image/png', 'image/jpeg', 'image/jpg', 'application/pdf'}
+
+def extract_raw_text(upload, on_page=None):
+    """Run OCR on a single ingested upload (blocking).
+    
+    Returns (raw_text, pages) where pages reports the extraction path of
+    each PDF page and is None for images.
+    """
+    if upload.content_type == "application/pdf":
+        pages = ocr_processor.extract_pdf_pages(upload.pdf_source(), upload.sha256, on_page)
+        if pages is None:
+            return None, None
+        record_pages(pages)
+        page_info = [
+            {"page": p["page"], "source": p["source"], "characters": len(p["text"])}
+            for p in pages
+        ]
+        return PDFEngine.assemble_text(pages), page_info
+    return ocr_processor.extract_text_from_image(upload.read_bytes()), None
+
+def prepare_text_result(filename, raw_text, pages=None):
+    """Clean and translate OCR output (blocking); returns the text fields of a result"""
+    if not raw_text:
+        print(f"No text found in file: {filename}")
+        return None
+    
+    cleaned_text, standardized_text = text_preprocessor.normalize(raw_text)
+    
+    translated_text = standardized_text
+    original_language = "Unknown"
+    
+    # Detect once and reuse the result for the translate decision and the translation itself
+    detection = translation_service.detect_language(standardized_text)
+    if translation_service.should_translate(standardized_text, detection):
+        original_language = detection.get('language', 'Unknown')
+        translated_text = translation_service.translate_with_google(standardized_text, 'en', detection)
+    
+    return {
+        "filename": filename,
+        "raw_text": raw_text,
+        "cleaned_text": cleaned_text,
+        "standardized_text": standardized_text,
+        "translated_text": translated_text,
+        "original_language": original_language,
+        "pages": pages
+    }
+
+def finalize_result(prepared, entities):
+    """Attach extracted entities to prepared text fields; the result stays a plain dict (see ProcessingResult)"""
+    return dict(prepared, entities=entities)
+
+def build_processing_result(filename, raw_text, pages=None):
+    """Clean, translate and run NER over OCR output (blocking)"""
+    prepared = prepare_text_result(filename, raw_text, pages)
+    if prepared is None:
+        return None
+    
+    try:
+        entities = ner_extractor.extract_all_entities(prepared["translated_text"], prepared["raw_text"])
+    except Exception as e:
+        print(f"NER failed: {str(e)}")
+        entities = {}
+    
+    return finalize_result(prepared, entities)
+
+async def process_batch_with_ner(files):
+    """Process a batch, then run NER once over all documents so short ones share Gemini prompts"""
+    prepared = [p for p in await process_batch(files, prepare_text_result) if p is not None]
+    if not prepared:
+        return []
+    
+    try:
+        entities = await run_blocking(
+            ner_extractor.extract_entities_batch,
+            [p["translated_text"] for p in prepared],
+            [p["raw_text"] for p in prepared]
+        )
+    except Exception as e:
+        print(f"Batch NER failed: {str(e)}")
+        entities = [{} for _ in prepared]
+    
+    return [finalize_result(p, e) for p, e in zip(prepared, entities)]
+
+def build_text_result(filename, raw_text, pages=None):
+    """Clean and standardize OCR output without NER (blocking)"""
+    cleaned_text, standardized_text = text_preprocessor.normalize(raw_text)
+    
+    return {
+        "filename": filename,
+        "raw_text": raw_text,
+        "cleaned_text": cleaned_text,
+        "standardized_text": standardized_text,
+        "pages": pages
+    }
+
+async def process_file(file, build_result, semaphore=None):
+    """Run OCR plus `build_result` on one ingested upload.
+    
+    In concurrent mode the blocking stages run on the worker pool and
+    `semaphore` bounds how many files of a batch are in flight at once.
+    Returns None when OCR failed for the file.
+    """
+    if semaphore is None:
+        raw_text, pages = extract_raw_text(file)
+        if raw_text is None:
+            print(f"OCR failed for file: {file.filename}")
+            return None
+        return build_result(file.filename, raw_text, pages)
+    
+    async with semaphore:
+        print(f"\nProcessing file: {file.filename}")
+        raw_text, pages = await run_blocking(extract_raw_text, file)
+        if raw_text is None:
+            print(f"OCR failed for file: {file.filename}")
+            return None
+        return await run_blocking(build_result, file.filename, raw_text, pages)
+
+async def ingest_batch(files):
+    """Stream a batch of UploadFiles to spool files under the configured size limits"""
+    return await ingest_uploads(
+        files,
+        max_file_bytes=config.MAX_FILE_SIZE_MB * 1024 * 1024,
+        max_total_bytes=config.MAX_TOTAL_SIZE_MB * 1024 * 1024,
+        spool_bytes=config.UPLOAD_SPOOL_MB * 1024 * 1024,
+        spool_dir=config.UPLOAD_SPOOL_DIR
+    )
+
+async def process_batch(files, build_result):
+    """Process a batch of ingested uploads, returning one entry per file in input order"""
+    if not config.CONCURRENT_PROCESSING:
+        results = []
+        for file in files:
+            print(f"\nProcessing file: {file.filename}")
+            results.append(await process_file(file, build_result))
+        return results
+    
+    semaphore = asyncio.Semaphore(max(1, config.MAX_CONCURRENT_FILES))
+    return await asyncio.gather(*(process_file(file, build_result, semaphore) for file in files))
+
 # FRA Scheme Recommendation Endpoint
 @app.get("/eligible-schemes")
-def get_schemes():
+def get_schemes(explain: bool = False):
     """Get eligible FRA schemes for the default claimant"""
-    return {
+    with stage("dss"):
+        schemes, trace = scheme_rules.plan().evaluate(fra_claimant, explain=explain)
+    response = {
         "claimant": {
             "name": fra_claimant["Name"],
             "father": fra_claimant["Father"],
@@ -587,64 +987,379 @@ def get_schemes():
             "landArea": fra_claimant["Land Area (hectares)"],
             "claimStatus": fra_claimant["Claim Status"],
         },
-        "eligible_schemes": fra_dss(fra_claimant)
+        "eligible_schemes": list(schemes)
+    }
+    if explain:
+        # Predicates that fired for each eligible scheme
+        response["explanations"] = trace
+    return response
+
+@app.get("/eligible-schemes/rules")
+def get_scheme_rules():
+    """Currently loaded scheme rule plan and its memo sizes"""
+    return scheme_rules.stats()
+
+@staged("dss")
+def evaluate_claimants(data, filename, include_claimants=True, explain=False):
+    """Parse a claimant file and evaluate every DSS rule over it at once (blocking)"""
+    # One plan for loading and evaluating, even if the rule file reloads meanwhile
+    plan = scheme_rules.plan()
+    columns = load_claimants(data, filename, claimant_fields(plan))
+    return evaluate_batch(columns, plan, include_claimants=include_claimants, explain=explain)
+
+@app.post("/eligible-schemes/batch")
+async def get_schemes_batch(file: UploadFile = File(...), include_claimants: bool = True, explain: bool = False):
+    """Get eligible FRA schemes for every claimant in a CSV, GeoJSON or JSON upload"""
+    try:
+        uploads = await ingest_batch([file])
+    except UploadTooLargeError as e:
+        return FastJSONResponse(
+            status_code=413,
+            content={"success": False, "message": str(e)}
+        )
+    
+    try:
+        return await run_blocking(
+            evaluate_claimants, uploads[0].read_bytes(), file.filename or "", include_claimants, explain
+        )
+    except (ValueError, csv.Error) as e:
+        return FastJSONResponse(
+            status_code=400,
+            content={"success": False, "message": f"Could not read claimants from {file.filename}: {str(e)}"}
+        )
+    finally:
+        close_uploads(uploads)
+
+# Spatial lookup endpoints
+@app.get("/spatial/lookup")
+async def spatial_lookup(lat: Optional[float] = None, lon: Optional[float] = None,
+                         coordinates: Optional[str] = None, land_area: Optional[str] = None):
+    """Find the survey, mandal and district polygons containing a point"""
+    if coordinates:
+        point = parse_coordinates(coordinates)
+        if point is None:
+            raise HTTPException(status_code=400, detail=f"Could not parse coordinates '{coordinates}'")
+        lon, lat = point
+    if lat is None or lon is None:
+        raise HTTPException(status_code=400, detail="Provide lat and lon, or coordinates")
+    return spatial_index.lookup(lon, lat, land_area)
+
+@app.post("/spatial/lookup/bulk")
+async def spatial_lookup_bulk(request: BulkLookupRequest):
+    """Resolve many points at once; optional land_area values are checked against survey AREA"""
+    if len(request.lon) != len(request.lat) or (request.land_area is not None and len(request.land_area) != len(request.lon)):
+        raise HTTPException(status_code=400, detail="lon, lat and land_area must have the same length")
+    results = await run_blocking(spatial_index.lookup_many, request.lon, request.lat, request.land_area)
+    return {"count": len(results), "results": results}
+
+@app.get("/spatial/validate/{key}")
+async def spatial_validate(key: str):
+    """Check the COORDINATES and LAND_AREA entities of a stored result or batch"""
+    stored = load_stored_results(key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Results not found")
+    
+    documents = stored.get("results", [stored])
+    return {
+        "key": key,
+        "documents": [
+            {
+                "filename": document.get("filename"),
+                **spatial_index.validate_entities(document.get("entities") or {})
+            }
+            for document in documents
+        ]
+    }
+
+def ingest_layer_table(name, upload):
+    """Stream an uploaded GeoJSON export into a feature table and its polygon index"""
+    start = time.perf_counter()
+    with upload.open() as stream:
+        table = read_feature_table(stream, SURVEY_SCHEMA)
+    layer = PolygonLayer.from_table(name, table)
+    return table, layer, time.perf_counter() - start
+
+def publish_layer_geometry(name, table):
+    """Re-cut an ingested layer's tiles and rebuild its geometry store (blocking)"""
+    version = source_version((), tile_server.version, name, len(table), time.time_ns())
+    tile_server.replace_layer(name, table.features(), version)
+    geometry_stores.replace(name, table.features(), f"upload:{name}:{version}")
+
+@app.post("/spatial/layers/{layer}")
+async def ingest_spatial_layer(layer: str, file: UploadFile = File(...)):
+    """Replace a spatial layer with an uploaded GeoJSON FeatureCollection, parsed one feature at a time"""
+    try:
+        uploads = await ingest_uploads(
+            [file],
+            max_file_bytes=config.SPATIAL_UPLOAD_MAX_MB * 1024 * 1024,
+            max_total_bytes=config.SPATIAL_UPLOAD_MAX_MB * 1024 * 1024,
+            spool_bytes=config.UPLOAD_SPOOL_MB * 1024 * 1024,
+            spool_dir=config.UPLOAD_SPOOL_DIR
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    try:
+        table, polygon_layer, seconds = await run_blocking(ingest_layer_table, layer, uploads[0])
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid GeoJSON: {str(e)}")
+    finally:
+        close_uploads(uploads)
+    
+    spatial_tables[layer] = table
+    spatial_index.replace_layer(layer, polygon_layer)
+    await run_blocking(publish_layer_geometry, layer, table)
+    return {
+        "layer": layer,
+        "indexed_polygons": len(polygon_layer),
+        "seconds": round(seconds, 3),
+        "features_per_second": round(len(table) / seconds) if seconds else None,
+        **table.stats()
+    }
+
+@app.get("/spatial/layers/{layer}/features")
+async def find_layer_features(layer: str, field: str, value: str, limit: int = 100):
+    """Features of an ingested layer whose text property equals a value, from the attribute index"""
+    table = spatial_tables.get(layer)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"Layer '{layer}' has not been ingested")
+    rows = table.find(field, value)
+    return {
+        "layer": layer,
+        "total": len(rows),
+        "features": [
+            {"row": int(row), "properties": table.row(int(row)), "bbox": table.boxes.data[row].tolist()}
+            for row in rows[:limit]
+        ]
+    }
+
+@app.get("/spatial/stats")
+async def spatial_stats():
+    """Polygon counts per spatial layer"""
+    return spatial_index.stats()
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers the given ETag"""
+    if_none_match = request.headers.get("if-none-match", "")
+    return if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+# Vector tile endpoints
+@app.get("/tiles/stats")
+async def tile_stats():
+    """Tiled layers, their bounds and tile cache counters"""
+    return tile_server.stats()
+
+@app.get("/tiles/{layer}/{z}/{x}/{y}")
+async def vector_tile(layer: str, z: int, x: int, y: str, request: Request):
+    """Mapbox Vector Tile of a spatial layer, clipped and simplified for the zoom level"""
+    try:
+        # Accept the usual .pbf / .mvt suffix on the last segment
+        y = int(y.split(".")[0])
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid tile row '{y}'")
+    try:
+        tile_server.check(layer, z, x, y)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown layer '{layer}'")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"ETag": tile_server.etag, "Cache-Control": f"public, max-age={config.TILE_MAX_AGE_SECONDS}"}
+    if etag_matches(request, tile_server.etag):
+        return Response(status_code=304, headers=headers)
+    
+    data = tile_server.cached(layer, z, x, y)
+    if data is None:
+        data = await run_blocking(tile_server.tile, layer, z, x, y)
+    return Response(content=data, media_type="application/vnd.mapbox-vector-tile", headers=headers)
+
+# Geometry store endpoints
+@app.get("/geometry/stats")
+async def geometry_stats():
+    """Feature counts, store sizes and vertices per level of detail"""
+    return geometry_stores.stats()
+
+@app.get("/geometry/{layer}")
+async def layer_geometry(layer: str, request: Request, zoom: Optional[float] = None, lod: Optional[int] = None,
+                         bbox: Optional[str] = None, format: str = "binary"):
+    """Layer geometry at the level of detail for a map zoom (or an explicit lod), as a binary store or GeoJSON"""
+    store = geometry_stores.stores.get(layer)
+    if store is None:
+        raise HTTPException(status_code=404, detail=f"Unknown layer '{layer}'")
+    if format not in ("binary", "geojson"):
+        raise HTTPException(status_code=400, detail="format must be 'binary' or 'geojson'")
+    if lod is None:
+        lod = store.choose_lod(zoom) if zoom is not None else 0
+    if not 0 <= lod < len(store.lod_tolerances):
+        raise HTTPException(status_code=400, detail=f"lod must be between 0 and {len(store.lod_tolerances) - 1}")
+    
+    indices = None
+    if bbox:
+        try:
+            minx, miny, maxx, maxy = [float(value) for value in bbox.split(",")]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="bbox must be minLon,minLat,maxLon,maxLat")
+        indices = store.query(minx, miny, maxx, maxy)
+    
+    etag = f'"{make_cache_key(store.source, lod, bbox, format)[:16]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={config.TILE_MAX_AGE_SECONDS}",
+        "X-Level-Of-Detail": str(lod)
     }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    if format == "geojson":
+        return FastJSONResponse(content=await run_blocking(store.to_geojson, lod, indices), headers=headers)
+    if indices is None:
+        data = await run_blocking(geometry_stores.encoded, layer, lod)
+    else:
+        data = await run_blocking(store.encode, lod, indices)
+    return Response(content=data, media_type="application/octet-stream", headers=headers)
+
+# External service health, probed in the background so health checks answer from memory
+health_monitor = HealthMonitor(interval_seconds=config.HEALTH_PROBE_INTERVAL_SECONDS)
+
+def probe_client(lazy_client):
+    """Probe for services without a free API call: healthy once their client could be created"""
+    lazy_client.get()
+    return dict(lazy_client.stats(), healthy=lazy_client.ready)
+
+def probe_translation():
+    """Translate a test word and count the supported languages"""
+    client = translation_service.translate_client
+    if client is None:
+        return dict(translation_service.translate.stats(), healthy=False)
+    
+    test_text = "Hello"
+    with external_call("translate", "health_probe", sent=len(test_text)):
+        test_result = client.translate(test_text, target_language='hi', format_='text')['translatedText']
+        try:
+            languages = client.get_languages()
+            language_count = len(languages) if languages else 0
+        except Exception:
+            language_count = 0
+    return {
+        "supported_languages": language_count,
+        "test_translation": f"Test: '{test_text}' → '{test_result}'"
+    }
+
+health_monitor.add("vision", lambda: probe_client(ocr_processor.vision))
+health_monitor.add("translation", probe_translation)
+if ner_extractor.mode != "offline":
+    health_monitor.add("gemini", lambda: probe_client(ner_extractor.gemini))
+
+@app.on_event("startup")
+async def start_clients():
+    """Create the external clients in the background and start the health probes"""
+    if config.CLIENT_WARMUP:
+        ocr_processor.vision.warm_up()
+        translation_service.translate.warm_up()
+        if ner_extractor.mode != "offline":
+            ner_extractor.gemini.warm_up()
+    health_monitor.start()
+
+@app.on_event("shutdown")
+def stop_health_probes():
+    """Stop the background health probes"""
+    health_monitor.stop()
 
 @app.get("/", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint; reports which clients are ready without creating them"""
     return HealthResponse(
         status="healthy",
-        gemini_available=GEMINI_AVAILABLE and ner_extractor.gemini_model is not None,
-        vision_api_available=ocr_processor.credentials_loaded,
-        translate_api_available=translation_service.translate_client is not None
+        gemini_available=ner_extractor.mode != "offline" and ner_extractor.gemini.ready,
+        vision_api_available=ocr_processor.vision.ready,
+        translate_api_available=translation_service.translate.ready
     )
 
+@app.get("/health/probes")
+async def health_probes(refresh: bool = False):
+    """Last external probe results and client states; refresh=true probes again now (uses API quota)"""
+    if refresh:
+        await run_blocking(health_monitor.refresh)
+    return {
+        "probes": health_monitor.snapshot(),
+        "interval_seconds": health_monitor.interval_seconds,
+        "clients": {
+            "vision": ocr_processor.vision.stats(),
+            "translate": translation_service.translate.stats(),
+            "gemini": ner_extractor.gemini.stats()
+        }
+    }
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and tier sizes for the OCR, translation and NER result cache"""
+    return result_cache.stats()
+
+def cache_metrics():
+    """Cache and store counters for /metrics, read from their owners at scrape time"""
+    namespaces = dict(result_cache.stats()["namespaces"])
+    tiles = tile_server.cache.stats()
+    namespaces["tiles"] = {
+        "hits": tiles["memory_hits"] + tiles["disk_hits"],
+        "misses": tiles["misses"],
+        "hit_rate": tiles["hit_rate"]
+    }
+    stored = results_storage.stats()
+    return [
+        ("fra_cache_hits_total", "counter", "Cache hits by namespace",
+         [({"namespace": name}, c["hits"]) for name, c in namespaces.items()]),
+        ("fra_cache_misses_total", "counter", "Cache misses by namespace",
+         [({"namespace": name}, c["misses"]) for name, c in namespaces.items()]),
+        ("fra_cache_hit_ratio", "gauge", "Cache hit rate by namespace since startup",
+         [({"namespace": name}, c["hit_rate"]) for name, c in namespaces.items()]),
+        ("fra_results_stored_bytes", "gauge", "Bytes held by the results store", [({}, stored["bytes"])]),
+        ("fra_results_stored_entries", "gauge", "Entries held by the results store", [({}, stored["entries"])]),
+        ("fra_search_documents", "gauge", "Documents in the search index", [({}, len(search_index))]),
+    ]
+
+metrics_registry.add_collector(cache_metrics)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Stage latencies, external API calls, pages, HTTP traffic and cache hit rates in Prometheus text format"""
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health/translation", response_model=TranslationHealthResponse)
 async def translation_health_check():
-    """Dedicated health check for Google Translation API"""
-    try:
-        if not translation_service.translate_client:
-            return TranslationHealthResponse(
-                status="unhealthy",
-                translate_api_available=False,
-                supported_languages=0,
-                test_translation="Translation service not available"
-            )
-        
-        test_text = "Hello"
-        test_result = translation_service.translate_with_google(test_text, 'hi')
-        
-        try:
-            languages = translation_service.translate_client.get_languages()
-            language_count = len(languages) if languages else 0
-        except Exception:
-            language_count = 0
-        
+    """Dedicated health check for Google Translation API, served from the last background probe"""
+    probe = health_monitor.status("translation")
+    if probe["healthy"]:
         return TranslationHealthResponse(
             status="healthy",
             translate_api_available=True,
-            supported_languages=language_count,
-            test_translation=f"Test: '{test_text}' → '{test_result}'"
+            supported_languages=probe["supported_languages"],
+            test_translation=probe["test_translation"],
+            checked_seconds_ago=probe["age_seconds"]
         )
-        
-    except Exception as e:
+    if probe["healthy"] is None:
         return TranslationHealthResponse(
-            status="unhealthy",
-            translate_api_available=False,
+            status="pending",
+            translate_api_available=translation_service.translate.ready,
             supported_languages=0,
-            test_translation=f"Error: {str(e)}"
+            test_translation="First health probe has not finished yet"
         )
+    return TranslationHealthResponse(
+        status="unhealthy",
+        translate_api_available=translation_service.translate.ready,
+        supported_languages=0,
+        test_translation=f"Error: {probe['error']}" if probe.get("error") else "Translation service not available",
+        checked_seconds_ago=probe["age_seconds"]
+    )
 
 @app.post("/process-documents", response_model=EntityExtractionResponse)
 async def process_documents(files: List[UploadFile] = File(...)):
     """Process uploaded FRA documents (images or PDFs) for OCR and NER"""
+    started = time.perf_counter()
     
     if files:
-        allowed_types = {'image/png', 'image/jpeg', 'image/jpg', 'application/pdf'}
         for file in files:
-            if file.content_type not in allowed_types:
-                return JSONResponse(
+            if file.content_type not in ALLOWED_UPLOAD_TYPES:
+                return FastJSONResponse(
                     status_code=400,
                     content={
                         "success": False,
@@ -653,78 +1368,50 @@ async def process_documents(files: List[UploadFile] = File(...)):
                     }
                 )
         
-        if ocr_processor.credentials_loaded:
-            results = []
+        if await client_available(ocr_processor.vision):
+            try:
+                uploads = await ingest_batch(files)
+            except UploadTooLargeError as e:
+                return FastJSONResponse(
+                    status_code=413,
+                    content={
+                        "success": False,
+                        "message": str(e),
+                        "results": []
+                    }
+                )
             
             try:
-                for file in files:
-                    print(f"\nProcessing file: {file.filename}")
-                    file_content = await file.read()
-                    
-                    if file.content_type == "application/pdf":
-                        raw_text = ocr_processor.extract_text_from_pdf(file_content)
-                    else:
-                        raw_text = ocr_processor.extract_text_from_image(file_content)
-                    
-                    if raw_text:
-                        cleaned_text = text_preprocessor.clean_text(raw_text)
-                        standardized_text = text_preprocessor.standardize_spacing(cleaned_text)
-                        
-                        translated_text = standardized_text
-                        original_language = "Unknown"
-                        
-                        if translation_service.should_translate(standardized_text):
-                            detection = translation_service.detect_language(standardized_text)
-                            if detection:
-                                original_language = detection.get('language', 'Unknown')
-                                translated_text = translation_service.translate_with_google(standardized_text, 'en')
-                        
-                        if ner_extractor.gemini_model:
-                            try:
-                                entities = ner_extractor.extract_all_entities(translated_text)
-                            except Exception as e:
-                                print(f"NER failed: {str(e)}")
-                                entities = {}
-                        else:
-                            entities = {}
-                        
-                        serializable_entities = make_json_serializable(entities)
-                        
-                        result = ProcessingResult(
-                            filename=file.filename,
-                            raw_text=raw_text,
-                            cleaned_text=cleaned_text,
-                            standardized_text=standardized_text,
-                            translated_text=translated_text,
-                            original_language=original_language,
-                            entities=serializable_entities
-                        )
-                        results.append(result)
-                        
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        storage_key = f"{timestamp}_{file.filename}"
-                        results_storage[storage_key] = result.dict()
-                    else:
-                        print(f"No text found in file: {file.filename}")
+                if config.NER_BATCH_PACKING:
+                    results = await process_batch_with_ner(uploads)
+                else:
+                    results = await process_batch(uploads, build_processing_result)
+                result_dicts = [r for r in results if r is not None]
+                message = f"Successfully processed {len(result_dicts)} document(s)"
                 
-                batch_key = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                results_storage[batch_key] = {
+                # Each result is stored once; the batch entry only references it
+                result_keys = [await store_result(r, name=r["filename"]) for r in result_dicts]
+                processing_time = round(time.perf_counter() - started, 3)
+                timings = {name: round(seconds, 3) for name, seconds in request_timings().items()}
+                batch_key = results_storage.put({
                     "success": True,
-                    "message": f"Successfully processed {len(results)} document(s)",
-                    "results": [r.dict() for r in results],
-                    "processing_time": 0.0
-                }
+                    "message": message,
+                    "result_keys": result_keys,
+                    "processing_time": processing_time,
+                    "timings": timings
+                }, prefix="batch_")
                 
-                response_data = EntityExtractionResponse(
-                    success=True,
-                    message=f"Successfully processed {len(results)} document(s)",
-                    results=results
-                )
-                
-                response_dict = response_data.dict()
-                response_dict["batch_key"] = batch_key
+                response_dict = {
+                    "success": True,
+                    "message": message,
+                    "results": result_dicts,
+                    "batch_key": batch_key,
+                    "result_keys": result_keys,
+                    "processing_time": processing_time,
+                    "timings": timings
+                }
                 
-                return JSONResponse(
+                return FastJSONResponse(
                     status_code=200,
                     content=response_dict,
                     headers={
@@ -737,7 +1424,7 @@ async def process_documents(files: List[UploadFile] = File(...)):
                 error_msg = f"Processing failed: {str(e)}"
                 print(f"Main processing error: {error_msg}")
                 
-                return JSONResponse(
+                return FastJSONResponse(
                     status_code=500,
                     content={
                         "success": False,
@@ -746,8 +1433,10 @@ async def process_documents(files: List[UploadFile] = File(...)):
                         "error_details": str(e)
                     }
                 )
+            finally:
+                close_uploads(uploads)
         else:
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=500,
                 content={
                     "success": False,
@@ -756,7 +1445,7 @@ async def process_documents(files: List[UploadFile] = File(...)):
                 }
             )
     else:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=400,
             content={
                 "success": False,
@@ -772,52 +1461,149 @@ async def extract_text_only(files: List[UploadFile] = File(...)):
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
     
-    if not ocr_processor.credentials_loaded:
+    if not await client_available(ocr_processor.vision):
         raise HTTPException(status_code=500, detail="Google Cloud Vision API not configured")
     
-    results = []
+    try:
+        uploads = await ingest_batch(files)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
     try:
-        for file in files:
-            file_content = await file.read()
-            
-            if file.content_type == "application/pdf":
-                raw_text = ocr_processor.extract_text_from_pdf(file_content)
-            else:
-                raw_text = ocr_processor.extract_text_from_image(file_content)
-            
-            if raw_text is None:
-                continue
-            
-            cleaned_text = text_preprocessor.clean_text(raw_text)
-            standardized_text = text_preprocessor.standardize_spacing(cleaned_text)
-            
-            result_data = {
-                "filename": file.filename,
-                "raw_text": raw_text,
-                "cleaned_text": cleaned_text,
-                "standardized_text": standardized_text
-            }
-            results.append(result_data)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            storage_key = f"text_{timestamp}_{file.filename}"
-            results_storage[storage_key] = result_data
+        results = await process_batch(uploads, build_text_result)
+        results = [r for r in results if r is not None]
         
-        batch_key = f"text_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        batch_data = {
+        message = f"Successfully extracted text from {len(results)} document(s)"
+        result_keys = [await store_result(r, prefix="text_", name=r["filename"]) for r in results]
+        batch_key = results_storage.put({
             "success": True,
-            "message": f"Successfully extracted text from {len(results)} document(s)",
-            "results": results
-        }
-        results_storage[batch_key] = batch_data
+            "message": message,
+            "result_keys": result_keys
+        }, prefix="text_batch_")
         
-        response = batch_data.copy()
-        response["batch_key"] = batch_key
-        return response
+        # Returned as a response so the results are encoded once, without FastAPI's jsonable_encoder walk
+        return FastJSONResponse(content={
+            "success": True,
+            "message": message,
+            "results": results,
+            "batch_key": batch_key,
+            "result_keys": result_keys
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Text extraction failed: {str(e)}")
+    finally:
+        close_uploads(uploads)
+
+
+# --------------------------
+# Background Document Jobs
+# --------------------------
+
+async def run_job_file(upload, progress):
+    """Run the /process-documents stages for one file of a background job"""
+    progress.set_status(STATUS_OCR)
+    raw_text, pages = await run_blocking(extract_raw_text, upload, progress.page_done)
+    if raw_text is None:
+        raise RuntimeError("OCR failed")
+    progress.set_pages(pages)
+    
+    progress.set_status(STATUS_ANALYZING)
+    result = await run_blocking(build_processing_result, upload.filename, raw_text, pages)
+    if result is None:
+        return None
+    return await store_result(result, name=upload.filename)
+
+def store_job_batch(job):
+    """Store a finished job as a batch entry, like /process-documents does"""
+    result_keys = [f["result_key"] for f in job.files if f["result_key"]]
+    job.batch_key = results_storage.put({
+        "success": True,
+        "message": f"Successfully processed {len(result_keys)} document(s)",
+        "result_keys": result_keys,
+        "job_id": job.id,
+        "processing_time": round(time.time() - job.created_at, 3)
+    }, prefix="batch_")
+
+job_manager = JobManager(
+    run_job_file,
+    workers=config.JOB_WORKERS,
+    ttl_seconds=config.JOB_TTL_SECONDS,
+    on_job_finished=store_job_batch
+)
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background job workers"""
+    job_manager.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop the background job workers"""
+    await job_manager.stop()
+
+@app.post("/jobs", status_code=202)
+async def create_job(files: List[UploadFile] = File(...)):
+    """Queue uploaded FRA documents for background OCR and NER and return the job id"""
+    if not files:
+        raise HTTPException(status_code=400, detail="No files provided")
+    
+    for file in files:
+        if file.content_type not in ALLOWED_UPLOAD_TYPES:
+            raise HTTPException(status_code=400, detail=f"File {file.filename} has unsupported type {file.content_type}")
+    
+    if not await client_available(ocr_processor.vision):
+        raise HTTPException(status_code=500, detail="Google Cloud Vision API not configured")
+    
+    try:
+        uploads = await ingest_batch(files)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    job = job_manager.submit(uploads)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "total_files": len(uploads),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Per-file and per-page status of a background job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """Server-Sent Events stream of job progress; each finished file is sent as a `result` event"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    last_event_id = request.headers.get("last-event-id", "")
+    after = int(last_event_id) if last_event_id.isdigit() else -1
+    
+    async def event_source():
+        async for item in job.stream(after):
+            if await request.is_disconnected():
+                break
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, event, data = item
+            if event == "result":
+                data = dict(data, result=results_storage.get(data["result_key"]))
+            yield format_sse(event_id, event, data)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # --------------------------
@@ -827,53 +1613,195 @@ async def extract_text_only(files: List[UploadFile] = File(...)):
 class ChatRequest(BaseModel):
     user_input: str
     ocr_context: Optional[str] = ""
+    document_key: Optional[str] = None  # Result or batch key; its relevant passages replace ocr_context
 
 class ChatResponse(BaseModel):
     bot_reply: str
 
+async def build_chat_context(request):
+    """Context for one chat turn, bounded by CHAT_CONTEXT_TOKENS whatever the document size"""
+    if request.document_key:
+        context = await run_blocking(
+            document_retriever.context,
+            request.document_key,
+            request.user_input,
+            budget_tokens=config.CHAT_CONTEXT_TOKENS,
+            top_k=config.CHAT_TOP_K
+        )
+        if context is None:
+            raise HTTPException(status_code=404, detail="Results not found")
+        return context
+    return (request.ocr_context or "")[:config.CHAT_CONTEXT_TOKENS * CHARS_PER_TOKEN]
+
+async def prepare_chat(request):
+    """Chat context, with the Gemini model created off the event loop unless the answer is already cached.
+    
+    A missing model is reported by the assistant (UNAVAILABLE_REPLY), after
+    the cache, so both chat routes answer cached questions while Gemini is down.
+    """
+    context = await build_chat_context(request)
+    if ner_extractor.mode != "offline" and chat_assistant.cached(request.user_input, context) is None:
+        await client_available(ner_extractor.gemini)
+    return context
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest):
     """
     Chat endpoint for FRA-CSS Assistant using Gemini API.
     Receives user input and optional OCR context, returns bot reply.
     """
-    if not ner_extractor.gemini_model:
-        return {"bot_reply": "⚠️ Gemini API not available. Cannot generate response."}
-
+    context = await prepare_chat(request)
     try:
-        system_prompt = (
-            f"You are an expert assistant for the Forest Rights Act (FRA) Decision Support System "
-            f"focusing exclusively on Central Sector Schemes (CSS).\n\n"
-            f"CONTEXT: FRA OCR Extracted Data:\n{request.ocr_context}\n\n"
-            f"INSTRUCTIONS:\n"
-            f"- Only discuss Central Sector Schemes like PM-KISAN, MGNREGA, Jal Jeevan Mission, Ayushman Bharat PM-JAY, PMAY-G, PM-KUSUM, Swachh Bharat Mission, etc.\n"
-            f"- Provide specific eligibility criteria, application processes, and benefits.\n"
-            f"- Reference the user's extracted data when relevant (name, location, land area, etc.)\n"
-            f"- Keep responses concise (2-4 sentences)\n"
-            f"- Include actionable next steps\n"
-            f"- Use a helpful, professional tone\n\n"
-            f"USER QUESTION: {request.user_input}"
-        )
-
-        response = ner_extractor.gemini_model.generate_content(system_prompt)
-        bot_reply = response.text.strip() if response.text else "I couldn't generate a proper response. Please rephrase your question about Central Sector Schemes."
-
-        # Clean code block formatting if any
-        if bot_reply.startswith("```"):
-            bot_reply = bot_reply.strip("```").strip()
-
+        bot_reply, _ = await chat_assistant.reply(request.user_input, context)
         return {"bot_reply": bot_reply}
 
     except Exception as e:
         print(f"Chat endpoint error: {str(e)}")
-        return {"bot_reply": "⚠️ I'm having trouble connecting to my knowledge base. Try again later."}
+        return {"bot_reply": ERROR_REPLY}
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest, http_request: Request):
+    """Server-Sent Events stream of the reply: `token` events as text arrives, then `done` with the full reply"""
+    context = await prepare_chat(request)
+    
+    async def event_source():
+        event_id = 0
+        async for event, data in chat_assistant.stream(request.user_input, context):
+            if await http_request.is_disconnected():
+                break
+            yield format_sse(event_id, event, data)
+            event_id += 1
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/chat/stats")
+async def chat_stats():
+    """Chat answer cache counters and the document chunk indexes held for retrieval"""
+    return {
+        "answer_cache": result_cache.stats()["namespaces"].get("chat", {}),
+        "retrieval": document_retriever.stats()
+    }
+
+def load_stored_results(key, keep_keys=False):
+    """Fetch a stored result, expanding batch entries into their per-file results (and `result_keys` if asked)"""
+    stored = results_storage.get(key)
+    if stored is None or "result_keys" not in stored:
+        return stored
+    
+    results = []
+    for result_key in stored["result_keys"]:
+        result = results_storage.get(result_key)
+        if result is not None:
+            results.append(result)
+    
+    expanded = {k: v for k, v in stored.items() if keep_keys or k != "result_keys"}
+    expanded["results"] = results
+    return expanded
+
+@app.get("/results/stats")
+async def results_storage_stats():
+    """Entry count, memory usage and eviction counters of the results store"""
+    return results_storage.stats()
+
+def run_search(q, filters, fields, match, page, page_size):
+    """Query the search index and attach filenames, snippets and entities from the results store (blocking)"""
+    found = search_index.search(q, filters, match=match, offset=(page - 1) * page_size, limit=page_size)
+    hits = []
+    for hit in found["hits"]:
+        result = results_storage.get(hit["key"])
+        if result is None:
+            # Expired between the index lookup and now
+            search_index.remove(hit["key"])
+            continue
+        entities = result.get("entities") or {}
+        if fields:
+            entities = {k: v for k, v in entities.items() if k in fields}
+        hits.append({
+            "key": hit["key"],
+            "filename": result.get("filename"),
+            "score": hit["score"],
+            "snippet": snippet(result.get("translated_text") or result.get("standardized_text") or "", found["terms"]),
+            "entities": entities,
+            "download_url": f"/download-results/{hit['key']}"
+        })
+    return {
+        "total": found["total"],
+        "page": page,
+        "page_size": page_size,
+        "pages": (found["total"] + page_size - 1) // page_size,
+        "terms": found["terms"],
+        "results": hits
+    }
+
+@app.get("/search")
+async def search_documents(
+    q: str = "",
+    filter: List[str] = Query(default=[]),
+    fields: Optional[str] = None,
+    match: str = "all",
+    page: int = 1,
+    page_size: int = 20
+):
+    """
+    Ranked search over processed documents and their extracted entities.
+    `q` matches the document text; every `filter=ENTITY_TYPE:value` must also match, e.g.
+    /search?q=survey 45/2 Kaltapally or /search?filter=CLAIM_STATUS:pending&fields=PATTA_NUMBER
+    """
+    filters = []
+    for item in filter:
+        entity_type, _, value = item.partition(":")
+        if not value.strip():
+            raise HTTPException(status_code=400, detail=f"Filter must look like ENTITY_TYPE:value, got {item!r}")
+        filters.append((entity_type.strip(), value.strip()))
+    if not q.strip() and not filters:
+        raise HTTPException(status_code=400, detail="Provide a query (q) or at least one filter")
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="match must be 'all' or 'any'")
+    if page < 1 or not 1 <= page_size <= 100:
+        raise HTTPException(status_code=400, detail="page must be >= 1 and page_size between 1 and 100")
+    
+    field_names = {f.strip().upper() for f in fields.split(",") if f.strip()} if fields else None
+    return await run_blocking(run_search, q, filters, field_names, match, page, page_size)
+
+@app.get("/search/stats")
+async def search_stats():
+    """Document, term and posting counts of the search index"""
+    return search_index.stats()
+
+def export_response(key, file_format, compression=None, table="entities"):
+    """Streaming response for one stored result or batch in the requested format"""
+    try:
+        export = result_exporter.export(key, file_format, compression, table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if export is None:
+        raise HTTPException(status_code=404, detail="Results not found")
+    chunks, media_type, filename = export
+    return StreamingResponse(
+        iterate_blocking(chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @app.get("/download-results/{key}")
 async def download_results_json(key: str):
-    """Download processing results as JSON file"""
-    if key not in results_storage:
-        raise HTTPException(status_code=404, detail="Results not found")
-    
-    results = results_storage[key]
-    json_data = json.dumps(results, indent=2, ensure_ascii=False)
-    filename = f"results_{key}.json"
+    """Download processing results as JSON file, streamed one document at a time"""
+    return export_response(key, "json")
+
+@app.get("/export/formats")
+async def export_formats():
+    """Export formats, compressions and tables available with the installed packages"""
+    return result_exporter.formats()
+
+@app.get("/export/{key}")
+async def export_results(key: str, format: str = "ndjson", compression: Optional[str] = None, table: str = "entities"):
+    """
+    Stream a stored result or batch for bulk download or analytics.
+    format: json | ndjson (compression none, gzip or zstd) or parquet | arrow (`table` entities or documents,
+    compressed with the format's own codecs; zstd by default for parquet).
+    """
+    return export_response(key, format, compression, table)
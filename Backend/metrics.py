@@ -0,0 +1,309 @@
+from bisect import bisect_left
+import contextvars
+from functools import wraps
+import threading
+import time
+
+
+# Seconds; covers a cached lookup up to a long PDF through Vision and Gemini
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Pages per processed document
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+# Stage timings of the request being served, shared with the worker threads it runs on
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    """Render label pairs as {name="value",...}, or "" without labels"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter; label values are passed positionally in the order of `labelnames`"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames, lock):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+        self._values = {}
+
+    def inc(self, amount, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(self.name, tuple(zip(self.labelnames, labels)), value) for labels, value in values]
+
+
+class Histogram:
+    """Fixed-bucket histogram with labels, rendered with cumulative buckets like Prometheus expects"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, lock, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = lock
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            series_list = [(labels, list(series)) for labels, series in sorted(self._series.items())]
+        samples = []
+        for labels, series in series_list:
+            key = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key + (("le", format_value(float(bound))),), cumulative))
+            samples.append((f"{self.name}_sum", key, series[-1]))
+            samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in the Prometheus text exposition format.
+
+    Recording a value is a dict lookup and an addition under one lock, so
+    instrumenting a stage costs microseconds against stages that take
+    milliseconds to seconds. Collectors add values owned by other
+    components (cache hit counters, store sizes) at scrape time instead of
+    mirroring them on every update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._metrics.setdefault(name, Counter(name, documentation, labelnames, self._lock))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._metrics.setdefault(name, Histogram(name, documentation, labelnames, self._lock, buckets))
+
+    def add_collector(self, collect):
+        """Register a callable returning [(name, kind, documentation, [(labels dict, value)])]"""
+        self._collectors.append(collect)
+
+    def render(self):
+        """All metrics as Prometheus text"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                print(f"Metrics collector failed: {str(e)}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{format_labels(sorted(labels.items()))} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "fra_stage_duration_seconds", "Time spent in each document pipeline stage", ["stage"]
+)
+STAGE_ERRORS = registry.counter("fra_stage_errors_total", "Pipeline stages that raised", ["stage"])
+EXTERNAL_CALLS = registry.counter(
+    "fra_external_calls_total", "Calls to Vision, Translate and Gemini by outcome", ["service", "operation", "outcome"]
+)
+EXTERNAL_SECONDS = registry.histogram(
+    "fra_external_call_duration_seconds", "Latency of external API calls", ["service", "operation"]
+)
+EXTERNAL_BYTES = registry.counter(
+    "fra_external_bytes_total", "Payload sent to and received from external APIs (bytes, text as characters)",
+    ["service", "direction"]
+)
+DOCUMENT_PAGES = registry.histogram("fra_document_pages", "Pages per processed PDF", buckets=PAGE_BUCKETS)
+PAGES = registry.counter("fra_pages_total", "Processed PDF pages by extraction path", ["source"])
+HTTP_SECONDS = registry.histogram(
+    "fra_http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+HTTP_BYTES = registry.counter(
+    "fra_http_bytes_total", "HTTP request and response bodies with a known length", ["route", "direction"]
+)
+
+
+def _add_request_time(name, elapsed):
+    timings = _request_timings.get()
+    if timings is not None:
+        with registry._lock:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+class stage:
+    """Context manager timing a pipeline stage into its histogram and the current request's breakdown"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.start
+        if exc_type is not None and issubclass(exc_type, Exception):
+            STAGE_ERRORS.inc(1, self.name)
+        STAGE_SECONDS.observe(elapsed, self.name)
+        _add_request_time(self.name, elapsed)
+        return False
+
+
+def staged(name):
+    """Decorator timing every call of a function as stage `name`"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed(name, iterator):
+    """Yield from `iterator`, timing the work of producing its items as one stage `name`"""
+    iterator = iter(iterator)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        STAGE_SECONDS.observe(elapsed, name)
+        _add_request_time(name, elapsed)
+
+
+class external_call:
+    """Context manager counting and timing one call to an external API.
+
+    The call counts as an error if the block raises or sets `failed`;
+    `sent` and `received` (set inside the block) feed the byte counters.
+    """
+
+    __slots__ = ("service", "operation", "sent", "received", "failed", "start")
+
+    def __init__(self, service, operation, sent=0):
+        self.service = service
+        self.operation = operation
+        self.sent = sent
+        self.received = 0
+        self.failed = False
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.start
+        failed = self.failed or (exc_type is not None and issubclass(exc_type, Exception))
+        EXTERNAL_CALLS.inc(1, self.service, self.operation, "error" if failed else "ok")
+        EXTERNAL_SECONDS.observe(elapsed, self.service, self.operation)
+        if self.sent:
+            EXTERNAL_BYTES.inc(self.sent, self.service, "sent")
+        if self.received:
+            EXTERNAL_BYTES.inc(self.received, self.service, "received")
+        _add_request_time(self.service, elapsed)
+        return False
+
+
+def record_pages(pages):
+    """Count a processed PDF's pages and their extraction paths"""
+    DOCUMENT_PAGES.observe(len(pages))
+    for page in pages:
+        PAGES.inc(1, page["source"])
+
+
+def start_request():
+    """Begin collecting stage timings for the current request; returns a token for end_request()"""
+    return _request_timings.set({})
+
+
+def end_request(token):
+    """Stop collecting and return the request's {stage: seconds}"""
+    timings = _request_timings.get()
+    _request_timings.reset(token)
+    return timings or {}
+
+
+def propagate(func):
+    """Wrap `func` to run in the caller's context, so calls made on other thread pools count toward its request"""
+    context = contextvars.copy_context()
+    # Each call gets its own copy: a context cannot be entered by two threads at once
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+def request_timings():
+    """Stage timings collected so far for the current request, in seconds"""
+    timings = _request_timings.get()
+    if timings is None:
+        return {}
+    with registry._lock:
+        return dict(timings)
+
+
+def server_timing(timings, total=None):
+    """Server-Timing header value (milliseconds) for a {stage: seconds} breakdown"""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
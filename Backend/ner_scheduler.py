@@ -0,0 +1,279 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from metrics import propagate
+
+
+# Entity types returned for every document, with the description given to Gemini
+ENTITY_DESCRIPTIONS = {
+    "PATTA_HOLDER_NAME": "Primary land title holder names, main applicant names",
+    "PATTA_NUMBER": "Patta numbers, land title numbers, document numbers (PAT-XXX, REG-XXX, etc.)",
+    "CLAIM_STATUS": "Application status like 'granted', 'pending', 'approved', 'rejected', 'verified'",
+    "PERSON": "Other person names (family members, witnesses, officers - excluding main patta holders)",
+    "PLACE_NAME": "Villages, cities, districts, states, countries",
+    "ORGANIZATION": "Government departments, committees, institutions",
+    "COORDINATES": "Latitude/longitude, GPS coordinates",
+    "DATE": "All dates in any format",
+    "LAND_AREA": "Area measurements (hectares, acres, sq meters)",
+    "SURVEY_NUMBER": "Land survey numbers",
+    "ADDRESS": "Complete addresses or location descriptions",
+    "PHONE_NUMBER": "Contact numbers",
+    "EMAIL": "Email addresses",
+}
+
+ENTITY_KEYS = list(ENTITY_DESCRIPTIONS)
+
+# Rough characters-per-token ratio used for prompt budgeting
+CHARS_PER_TOKEN = 4
+
+_PROMPT_HEADER = """
+You are an expert multilingual NER system specialized in official government documents worldwide.
+"""
+
+_PROMPT_INSTRUCTIONS = """INSTRUCTIONS:
+1. This document may have been translated from ANY language (Hindi, Telugu, Tamil, Arabic, Spanish, French, etc.)
+2. Extract ALL entities even if names seem unusual due to transliteration
+3. Look for patterns that indicate official document entities regardless of language origin
+4. Be extra careful with proper names that may have been transliterated
+"""
+
+_PROMPT_RULES = """CRITICAL RULES:
+- Include ALL potential names even if spelling seems unusual
+- Look for transliterated names that might appear as multiple words
+- Extract numbers with prefixes/suffixes as document numbers
+- Return ONLY valid JSON, no explanations
+"""
+
+
+def _entity_sections(entity_keys, indent="    "):
+    types = "\n".join(f"- {key}: {ENTITY_DESCRIPTIONS[key]}" for key in entity_keys)
+    fields = ",\n".join(f'{indent}"{key}": []' for key in entity_keys)
+    return types, fields
+
+
+def build_prompt(text, entity_keys=ENTITY_KEYS):
+    """Prompt asking Gemini for the given entity types in one document"""
+    types, fields = _entity_sections(entity_keys)
+    return f"""{_PROMPT_HEADER}
+TASK: Extract entities from this document text (originally translated from any language to English).
+
+DOCUMENT TEXT:
+{text}
+
+{_PROMPT_INSTRUCTIONS}
+ENTITY TYPES TO EXTRACT:
+{types}
+
+RETURN FORMAT - EXACT JSON:
+{{
+{fields}
+}}
+
+{_PROMPT_RULES}"""
+
+
+def build_multi_document_prompt(documents, entity_keys=ENTITY_KEYS):
+    """Prompt asking Gemini for entities of several documents, keyed by document id.
+
+    `documents` is a list of (doc_id, text) pairs.
+    """
+    types, fields = _entity_sections(entity_keys, indent="        ")
+    bodies = "\n\n".join(f"=== {doc_id} ===\n{text}\n=== END {doc_id} ===" for doc_id, text in documents)
+    ids = ", ".join(doc_id for doc_id, _ in documents)
+    return f"""{_PROMPT_HEADER}
+TASK: Extract entities SEPARATELY for each of the {len(documents)} documents below (originally translated from any language to English). Never mix entities between documents.
+
+DOCUMENTS:
+{bodies}
+
+{_PROMPT_INSTRUCTIONS}
+ENTITY TYPES TO EXTRACT:
+{types}
+
+RETURN FORMAT - EXACT JSON with one object per document id ({ids}):
+{{
+    "{documents[0][0]}": {{
+{fields}
+    }},
+    ...
+}}
+
+{_PROMPT_RULES}"""
+
+
+def parse_json_response(response_text):
+    """Strip Markdown code fences from a Gemini reply and parse it as JSON"""
+    response_text = response_text.strip()
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    return json.loads(response_text.strip())
+
+
+def normalize_entities(entities, entity_keys=ENTITY_KEYS):
+    """Ensure every expected key exists and holds a list"""
+    if not isinstance(entities, dict):
+        return {}
+    for key in entity_keys:
+        if key not in entities:
+            entities[key] = []
+        elif not isinstance(entities[key], list):
+            entities[key] = [entities[key]] if entities[key] else []
+    return entities
+
+
+def _dedupe_key(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def merge_entities(entity_dicts, entity_keys=ENTITY_KEYS):
+    """Merge entity dicts from several chunks, de-duplicating values per key in first-seen order"""
+    merged = {key: [] for key in entity_keys}
+    seen = {key: set() for key in entity_keys}
+    for entities in entity_dicts:
+        for key, values in entities.items():
+            if key not in merged:
+                merged[key] = []
+                seen[key] = set()
+            for value in values if isinstance(values, list) else [values]:
+                marker = _dedupe_key(value)
+                if value in ("", None) or marker in seen[key]:
+                    continue
+                seen[key].add(marker)
+                merged[key].append(value)
+    return merged
+
+
+def split_overlapping(text, max_chars, overlap_chars):
+    """Split text into windows of at most `max_chars` overlapping by about `overlap_chars`.
+
+    Window edges are moved back to the nearest whitespace so entities are
+    not cut in half; the overlap lets names that straddle a boundary appear
+    whole in at least one chunk.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    overlap_chars = min(overlap_chars, max_chars // 2)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            cut = text.rfind(" ", start + max_chars // 2, end)
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        next_start = end - overlap_chars
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return chunks
+
+
+class NERScheduler:
+    """Schedule Gemini NER calls by document length.
+
+    Long texts are split into overlapping chunks that are extracted in
+    parallel and merged per key. Short texts are packed several to a
+    prompt under a token budget, and each document's entities are routed
+    back by id; documents missing from a packed reply are retried alone.
+    """
+
+    def __init__(self, generate, max_chunk_tokens=6000, overlap_tokens=200,
+                 pack_tokens=8000, short_doc_tokens=1500, concurrency=4, entity_keys=ENTITY_KEYS):
+        """Initialize with `generate(prompt) -> reply text` and token budgets"""
+        self.generate = generate
+        self.max_chunk_chars = max_chunk_tokens * CHARS_PER_TOKEN
+        self.overlap_chars = overlap_tokens * CHARS_PER_TOKEN
+        self.pack_chars = pack_tokens * CHARS_PER_TOKEN
+        self.short_doc_chars = short_doc_tokens * CHARS_PER_TOKEN
+        self.concurrency = max(1, concurrency)
+        self.entity_keys = entity_keys
+
+    def _map(self, func, items):
+        if len(items) == 1:
+            return [func(items[0])]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(items)), thread_name_prefix="ner") as executor:
+            return list(executor.map(propagate(func), items))
+
+    def _extract_single(self, text):
+        """One prompt for one text; returns None when the call or parsing fails"""
+        try:
+            entities = parse_json_response(self.generate(build_prompt(text, self.entity_keys)))
+        except json.JSONDecodeError as e:
+            print(f"Gemini API returned invalid JSON format: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Gemini NER extraction failed: {str(e)}")
+            return None
+        return normalize_entities(entities, self.entity_keys)
+
+    def extract(self, text):
+        """Extract entities from one text of any length; returns None when every call failed"""
+        chunks = split_overlapping(text, self.max_chunk_chars, self.overlap_chars)
+        if len(chunks) == 1:
+            return self._extract_single(text)
+
+        results = [r for r in self._map(self._extract_single, chunks) if r is not None]
+        if not results:
+            return None
+        if len(results) < len(chunks):
+            print(f"Gemini NER failed on {len(chunks) - len(results)} of {len(chunks)} chunk(s)")
+        return merge_entities(results, self.entity_keys)
+
+    def _extract_packed(self, group):
+        """One prompt for several short texts; returns {index: entities} for documents found in the reply"""
+        documents = [(f"DOC_{index + 1}", text) for index, text in group]
+        try:
+            reply = parse_json_response(self.generate(build_multi_document_prompt(documents, self.entity_keys)))
+        except Exception as e:
+            print(f"Gemini packed NER failed for {len(group)} document(s): {str(e)}")
+            return {}
+        if not isinstance(reply, dict):
+            return {}
+        routed = {}
+        for (index, _), (doc_id, _) in zip(group, documents):
+            if isinstance(reply.get(doc_id), dict):
+                routed[index] = normalize_entities(reply[doc_id], self.entity_keys)
+        return routed
+
+    def _pack(self, items):
+        """Group (index, text) pairs into prompts bounded by the packing budget"""
+        group, group_chars = [], 0
+        for index, text in items:
+            if group and group_chars + len(text) > self.pack_chars:
+                yield group
+                group, group_chars = [], 0
+            group.append((index, text))
+            group_chars += len(text)
+        if group:
+            yield group
+
+    def extract_many(self, texts):
+        """Extract entities for many texts; returns a list aligned with `texts` (None where extraction failed)"""
+        results = [None] * len(texts)
+        short_docs = [(i, t) for i, t in enumerate(texts) if t and len(t) <= self.short_doc_chars]
+        long_docs = [(i, t) for i, t in enumerate(texts) if t and len(t) > self.short_doc_chars]
+
+        packed = list(self._pack(short_docs))
+        groups = [g for g in packed if len(g) > 1]
+        singles = [g[0] for g in packed if len(g) == 1] + long_docs
+
+        for routed in self._map(self._extract_packed, groups) if groups else []:
+            for index, entities in routed.items():
+                results[index] = entities
+
+        # Documents a packed reply dropped are retried on their own
+        retry = [(i, t) for group in groups for i, t in group if results[i] is None]
+        pending = singles + retry
+        if pending:
+            for (index, _), entities in zip(pending, self._map(lambda item: self.extract(item[1]), pending)):
+                results[index] = entities
+        return results
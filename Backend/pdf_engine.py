@@ -0,0 +1,295 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
+import os
+import threading
+import unicodedata
+import fitz  # PyMuPDF for PDF processing
+
+from metrics import external_call, propagate, stage, timed
+
+
+# Text used for pages whose OCR failed, so they are never dropped silently
+FAILED_PAGE_PLACEHOLDER = "[OCR failed for this page]"
+
+# Vision's synchronous batch annotate endpoint accepts at most 16 images per call
+VISION_MAX_BATCH_IMAGES = 16
+
+# Per-page extraction paths reported back to clients
+SOURCE_TEXT_LAYER = "text_layer"
+SOURCE_OCR = "ocr"
+SOURCE_FAILED = "failed"
+
+
+def open_pdf(source):
+    """Open a PDF from raw bytes or a file path"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open("pdf", bytes(source))
+    return fitz.open(source)
+
+
+def is_usable_text_layer(text, min_chars=50, min_printable_ratio=0.9, min_alnum_ratio=0.5):
+    """Decide whether an embedded PDF text layer can be used instead of OCR.
+
+    Rejects text that is missing or too short, and text that looks like
+    garbage from broken font encodings: a low share of printable
+    characters (control codes, U+FFFD) or of word characters among the
+    non-space characters. Word characters are letters, digits and
+    combining marks, which Indic scripts use for vowel signs and viramas.
+    """
+    if not text:
+        return False
+
+    stripped = text.strip()
+    if not stripped or len(stripped) < min_chars:
+        return False
+
+    printable = sum(1 for ch in stripped if (ch.isprintable() or ch.isspace()) and ch != "\ufffd")
+    if printable / len(stripped) < min_printable_ratio:
+        return False
+
+    visible = [ch for ch in stripped if not ch.isspace()]
+    if not visible:
+        return False
+    word = sum(1 for ch in visible if ch.isalnum() or unicodedata.category(ch).startswith("M"))
+    return word / len(visible) >= min_alnum_ratio
+
+
+def render_page_range(source, page_numbers, zoom):
+    """Render the given 0-based pages to PNG bytes.
+
+    Runs inside a worker process, so it opens its own document handle.
+    Returns a list of (page_number, png_bytes) pairs; pages that fail to
+    render carry None instead of bytes.
+    """
+    rendered = []
+    doc = open_pdf(source)
+    try:
+        mat = fitz.Matrix(zoom, zoom)
+        for page_num in page_numbers:
+            try:
+                pix = doc[page_num].get_pixmap(matrix=mat)
+                rendered.append((page_num, pix.tobytes("png")))
+            except Exception as e:
+                print(f"Page {page_num + 1} render failed: {str(e)}")
+                rendered.append((page_num, None))
+    finally:
+        doc.close()
+    return rendered
+
+
+class PDFEngine:
+    """Render PDF pages in parallel and OCR them with batched Vision requests"""
+
+    _render_pool = None
+    _render_pool_lock = threading.Lock()
+
+    def __init__(self, client, render_workers=None, batch_size=VISION_MAX_BATCH_IMAGES,
+                 batch_max_bytes=8 * 1024 * 1024, ocr_concurrency=4, parallel_min_pages=4, zoom=2,
+                 use_text_layer=True, text_layer_min_chars=50, text_layer_min_printable_ratio=0.9):
+        """Initialize with a Vision ImageAnnotatorClient, batching limits and text-layer thresholds"""
+        self.client = client
+        self.render_workers = render_workers or os.cpu_count() or 1
+        self.batch_size = max(1, min(batch_size, VISION_MAX_BATCH_IMAGES))
+        self.batch_max_bytes = batch_max_bytes
+        self.ocr_concurrency = max(1, ocr_concurrency)
+        self.parallel_min_pages = parallel_min_pages
+        self.zoom = zoom
+        self.use_text_layer = use_text_layer
+        self.text_layer_min_chars = text_layer_min_chars
+        self.text_layer_min_printable_ratio = text_layer_min_printable_ratio
+
+    def _get_render_pool(self):
+        """Create the shared process pool on first use.
+
+        Workers are spawned rather than forked: the pool is created from a
+        threaded server, and a forked child could inherit locks held by
+        other threads at that moment and deadlock.
+        """
+        with PDFEngine._render_pool_lock:
+            if PDFEngine._render_pool is None:
+                PDFEngine._render_pool = ProcessPoolExecutor(
+                    max_workers=self.render_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return PDFEngine._render_pool
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the shared render processes"""
+        with cls._render_pool_lock:
+            if cls._render_pool is not None:
+                cls._render_pool.shutdown(wait=False)
+                cls._render_pool = None
+
+    def render_pages(self, source, page_numbers):
+        """Yield (page_number, png_bytes) as pages finish rendering.
+
+        Small documents are rendered in-process; larger ones are split into
+        chunks of one Vision batch each and spread across worker processes,
+        so OCR can start on the first chunk while the rest still render.
+        """
+        if self.render_workers <= 1 or len(page_numbers) < self.parallel_min_pages:
+            yield from render_page_range(source, page_numbers, self.zoom)
+            return
+
+        # Hand file paths to workers as-is; only in-memory PDFs need copying
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+
+        chunks = [page_numbers[i:i + self.batch_size] for i in range(0, len(page_numbers), self.batch_size)]
+        pool = self._get_render_pool()
+        futures = {pool.submit(render_page_range, source, chunk, self.zoom): chunk for chunk in chunks}
+
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception as e:
+                print(f"Render worker failed: {str(e)}")
+                for page_num in futures[future]:
+                    yield page_num, None
+
+    def annotate_batch(self, batch):
+        """OCR a batch of (page_number, png_bytes) with one batch_annotate_images call.
+
+        Returns a list of (page_number, text) where text is None for pages
+        Vision could not process.
+        """
+        # Imported here so loading this module does not pull in the Vision SDK
+        from google.cloud import vision
+        feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=img_data), features=[feature])
+            for _, img_data in batch
+        ]
+
+        with external_call("vision", "batch_annotate_images", sent=sum(len(img) for _, img in batch)) as call:
+            try:
+                response = self.client.batch_annotate_images(requests=requests)
+            except Exception as e:
+                print(f"Vision batch request failed: {str(e)}")
+                call.failed = True
+                return [(page_num, None) for page_num, _ in batch]
+
+            results = []
+            for (page_num, _), page_response in zip(batch, response.responses):
+                if page_response.error.message:
+                    print(f"Vision API error on page {page_num + 1}: {page_response.error.message}")
+                    call.failed = True
+                    results.append((page_num, None))
+                elif page_response.full_text_annotation:
+                    results.append((page_num, page_response.full_text_annotation.text))
+                    call.received += len(results[-1][1])
+                else:
+                    results.append((page_num, ""))
+            return results
+
+    def _iter_batches(self, rendered, failed):
+        """Group rendered pages into batches bounded by count and payload size"""
+        batch, batch_bytes = [], 0
+        for page_num, img_data in rendered:
+            if img_data is None:
+                failed.append(page_num)
+                continue
+            if batch and (len(batch) >= self.batch_size or batch_bytes + len(img_data) > self.batch_max_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append((page_num, img_data))
+            batch_bytes += len(img_data)
+        if batch:
+            yield batch
+
+    def ocr_pages(self, source, page_numbers, on_page=None):
+        """Render and OCR pages, returning {page_number: text or None}.
+
+        `on_page(page, source)` is called with the 1-based page number as
+        each batch comes back from Vision.
+        """
+        texts = {}
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=self.ocr_concurrency, thread_name_prefix="vision-batch") as executor:
+            # Rendering happens while batches are pulled, so time it separately from the Vision calls
+            rendered = timed("pdf_render", self.render_pages(source, page_numbers))
+            annotate = propagate(self.annotate_batch)
+            futures = [executor.submit(annotate, batch) for batch in self._iter_batches(rendered, failed)]
+            for future in as_completed(futures):
+                for page_num, text in future.result():
+                    texts[page_num] = text
+                    if on_page:
+                        on_page(page_num + 1, SOURCE_FAILED if text is None else SOURCE_OCR)
+
+        for page_num in failed:
+            texts[page_num] = None
+            if on_page:
+                on_page(page_num + 1, SOURCE_FAILED)
+        return texts
+
+    def read_text_layer(self, doc):
+        """Return {page_number: text} for pages whose embedded text is usable"""
+        if not self.use_text_layer:
+            return {}
+
+        usable = {}
+        for page_num in range(doc.page_count):
+            try:
+                text = doc[page_num].get_text("text")
+            except Exception as e:
+                print(f"Page {page_num + 1} text layer unreadable: {str(e)}")
+                continue
+            if is_usable_text_layer(text, self.text_layer_min_chars, self.text_layer_min_printable_ratio):
+                usable[page_num] = text.strip()
+        return usable
+
+    def extract_pages(self, source, on_page=None):
+        """Extract per-page text for a whole PDF.
+
+        Pages with a usable text layer are read directly; only the rest are
+        rendered and sent to Vision. Returns a list of dicts in page order
+        with keys `page` (1-based), `source` ("text_layer", "ocr" or
+        "failed") and `text`. `on_page(page, source)` reports progress as
+        pages finish.
+        """
+        with stage("pdf_text_layer"):
+            doc = open_pdf(source)
+            try:
+                page_count = doc.page_count
+                texts = self.read_text_layer(doc)
+            finally:
+                doc.close()
+
+        layer_pages = set(texts)
+        if on_page:
+            for page_num in sorted(layer_pages):
+                on_page(page_num + 1, SOURCE_TEXT_LAYER)
+
+        ocr_page_numbers = [page_num for page_num in range(page_count) if page_num not in layer_pages]
+        if ocr_page_numbers:
+            texts.update(self.ocr_pages(source, ocr_page_numbers, on_page))
+
+        pages = []
+        for page_num in range(page_count):
+            text = texts.get(page_num)
+            if text is None:
+                source_name = SOURCE_FAILED
+            elif page_num in layer_pages:
+                source_name = SOURCE_TEXT_LAYER
+            else:
+                source_name = SOURCE_OCR
+            pages.append({
+                "page": page_num + 1,
+                "source": source_name,
+                "text": FAILED_PAGE_PLACEHOLDER if text is None else text,
+            })
+        return pages
+
+    @staticmethod
+    def assemble_text(pages):
+        """Join page texts with `--- Page N ---` markers, skipping blank pages"""
+        all_text = ""
+        for page in pages:
+            if page["text"]:
+                all_text += f"\n--- Page {page['page']} ---\n{page['text']}\n"
+        return all_text
+
+    def extract_text(self, source):
+        """Extract the full text of a PDF in page order"""
+        return self.assemble_text(self.extract_pages(source))
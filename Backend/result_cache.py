@@ -0,0 +1,152 @@
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+def make_cache_key(data, *params):
+    """Hash raw bytes or text plus any parameters that change the result"""
+    digest = hashlib.sha256()
+    digest.update(data if isinstance(data, (bytes, bytearray, memoryview)) else str(data).encode("utf-8"))
+    for param in params:
+        digest.update(b"\x00")
+        digest.update(str(param).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Content-addressed cache for OCR, translation and NER stage results.
+
+    Values are stored JSON-encoded in an in-memory LRU tier bounded by total
+    bytes, and optionally in a SQLite tier that survives restarts. Disk hits
+    are promoted back into memory. Hit and miss counters are kept per
+    namespace.
+    """
+
+    def __init__(self, max_memory_bytes=256 * 1024 * 1024, sqlite_path=None, enabled=True):
+        """Initialize the memory tier and, when a path is given, the SQLite tier"""
+        self.enabled = enabled
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._db = None
+
+        if enabled and sqlite_path:
+            try:
+                self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, created REAL NOT NULL, "
+                    "PRIMARY KEY (namespace, key))"
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"❌ Failed to open result cache database: {str(e)}")
+                self._db = None
+
+    def _count(self, namespace, field):
+        counters = self._stats.setdefault(namespace, {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def _store_in_memory(self, entry_key, payload):
+        """Insert into the LRU tier and evict least recently used entries over budget"""
+        if len(payload) > self.max_memory_bytes:
+            return
+        previous = self._entries.pop(entry_key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        self._entries[entry_key] = payload
+        self.memory_bytes += len(payload)
+        while self.memory_bytes > self.max_memory_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def get(self, namespace, key):
+        """Return the cached value or None on a miss"""
+        if not self.enabled:
+            return None
+
+        entry_key = (namespace, key)
+        with self._lock:
+            payload = self._entries.get(entry_key)
+            if payload is not None:
+                self._entries.move_to_end(entry_key)
+                self._count(namespace, "hits")
+                self._count(namespace, "memory_hits")
+                return json.loads(payload)
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+                    ).fetchone()
+                except Exception as e:
+                    print(f"Result cache read failed: {str(e)}")
+                    row = None
+                if row is not None:
+                    payload = zlib.decompress(row[0])
+                    self._store_in_memory(entry_key, payload)
+                    self._count(namespace, "hits")
+                    self._count(namespace, "disk_hits")
+                    return json.loads(payload)
+
+            self._count(namespace, "misses")
+            return None
+
+    def set(self, namespace, key, value):
+        """Store a JSON-serializable value in both tiers"""
+        if not self.enabled or value is None:
+            return
+
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._store_in_memory((namespace, key), payload)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+                        (namespace, key, zlib.compress(payload, 1), time.time())
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    print(f"Result cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters per namespace plus tier sizes"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._stats.items():
+                lookups = counters["hits"] + counters["misses"]
+                namespaces[namespace] = dict(counters, hit_rate=counters["hits"] / lookups if lookups else 0.0)
+
+            disk_entries = None
+            if self._db is not None:
+                try:
+                    disk_entries = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                except Exception:
+                    disk_entries = None
+
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self.memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_enabled": self._db is not None,
+                "disk_entries": disk_entries,
+                "namespaces": namespaces,
+            }
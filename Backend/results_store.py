@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import time
+import uuid
+import zlib
+
+from serialization import dumps, loads
+
+
+class ResultsStore:
+    """Bounded store for processing results served by /download-results.
+
+    Entries are kept JSON-encoded (optionally zlib-compressed) so their size
+    is known exactly. The store evicts least recently used entries once the
+    byte budget is exceeded and drops entries that have not been read for
+    `ttl_seconds`. Keys embed a random suffix so two batches stored in the
+    same second never overwrite each other. `on_remove(key)` is called for
+    every entry that is evicted, expired or overwritten.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl_seconds=24 * 3600, compress=True, on_remove=None):
+        """Initialize with a memory budget in bytes, an idle TTL and compression flag"""
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.compress = compress
+        self.on_remove = on_remove
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # key -> (payload, last_access)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_key(prefix="", name=""):
+        """Build a unique, human-readable key like `batch_20250101_120000_3f9a1c2b7d4e`"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        key = f"{prefix}{timestamp}_{uuid.uuid4().hex[:12]}"
+        return f"{key}_{name}" if name else key
+
+    def _encode(self, value):
+        payload = dumps(value)
+        return zlib.compress(payload, 6) if self.compress else payload
+
+    def _decode(self, payload):
+        if self.compress:
+            payload = zlib.decompress(payload)
+        return loads(payload)
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self.total_bytes -= len(payload)
+        if self.on_remove is not None:
+            self.on_remove(key)
+
+    def _expire(self, now):
+        """Drop idle entries; the LRU head is always the least recently read"""
+        if not self.ttl_seconds:
+            return
+        while self._entries:
+            key, (_, last_access) = next(iter(self._entries.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            self._remove(key)
+            self.expirations += 1
+
+    def put(self, value, prefix="", name=""):
+        """Store a JSON-serializable value under a fresh key and return the key"""
+        with self._lock:
+            key = self.new_key(prefix, name)
+            while key in self._entries:
+                key = self.new_key(prefix, name)
+        self[key] = value
+        return key
+
+    def __setitem__(self, key, value):
+        payload = self._encode(value)
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._expire(now)
+            if len(payload) > self.max_bytes:
+                print(f"Result {key} exceeds the results store budget and was not stored")
+                return
+            self._entries[key] = (payload, now)
+            self.total_bytes += len(payload)
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get(self, key, default=None):
+        """Return a stored value and mark it as recently used"""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries[key] = (entry[0], now)
+            self._entries.move_to_end(key)
+            payload = entry[0]
+        return self._decode(payload)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire(time.time())
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            self._expire(time.time())
+            return len(self._entries)
+
+    def keys(self):
+        """Snapshot of stored keys, least recently used first"""
+        with self._lock:
+            self._expire(time.time())
+            return list(self._entries)
+
+    def stats(self):
+        """Return entry count, byte usage and eviction counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "compressed": self.compress,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,213 @@
+from collections import OrderedDict
+import math
+import re
+import threading
+
+import numpy as np
+
+from ner_scheduler import split_overlapping, CHARS_PER_TOKEN
+
+
+# Words plus runs of Indic script, whose vowel signs are not \w on their own
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0dff]+")
+
+# Question words that would otherwise rank chunks by how often they say "the"
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i if in is it me my of on or "
+    "so that the their there this to was what when where which who why will with you your".split()
+)
+
+# Text fields of a stored result, best first
+_TEXT_FIELDS = ("translated_text", "standardized_text", "cleaned_text", "raw_text")
+
+
+def tokenize(text):
+    """Lowercased word tokens without stopwords"""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def document_text(result):
+    """The most processed text a stored result has"""
+    for field in _TEXT_FIELDS:
+        if result.get(field):
+            return result[field]
+    return ""
+
+
+def entity_summary(result):
+    """One line per non-empty entity type of a stored result"""
+    lines = []
+    for key, values in (result.get("entities") or {}).items():
+        if isinstance(values, list) and values:
+            lines.append(f"{key}: {', '.join(str(v) for v in values)}")
+    return "\n".join(lines)
+
+
+class BM25Index:
+    """Okapi BM25 over the chunks of one or more documents.
+
+    Postings are kept per term as NumPy arrays of chunk ids and term
+    frequencies, so a query costs one vectorized update per query term.
+    """
+
+    def __init__(self, chunks, k1=1.2, b=0.75):
+        """Index a list of (label, text) chunks"""
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        lengths = np.zeros(len(chunks), dtype=np.float64)
+        postings = {}
+        for chunk_id, (_, text) in enumerate(chunks):
+            tokens = tokenize(text)
+            lengths[chunk_id] = len(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, ([], []))
+                postings[token][0].append(chunk_id)
+                postings[token][1].append(count)
+        self.postings = {
+            token: (np.array(ids, dtype=np.int64), np.array(counts, dtype=np.float64))
+            for token, (ids, counts) in postings.items()
+        }
+        average = lengths.mean() if len(chunks) else 0.0
+        self._norm = k1 * (1 - b + b * lengths / average) if average else np.full(len(chunks), k1)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def scores(self, query):
+        """BM25 score of every chunk for the query"""
+        scores = np.zeros(len(self.chunks), dtype=np.float64)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            ids, tf = posting
+            idf = math.log(1 + (len(self.chunks) - len(ids) + 0.5) / (len(ids) + 0.5))
+            scores[ids] += idf * tf * (self.k1 + 1) / (tf + self._norm[ids])
+        return scores
+
+    def search(self, query, top_k):
+        """Chunk ids of the best `top_k` matches, best first; the opening chunks when nothing matches"""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) == 0:
+            return list(range(min(top_k, len(self.chunks))))
+        best = matched[np.argsort(-scores[matched], kind="stable")[:top_k]]
+        return best.tolist()
+
+
+class DocumentRetriever:
+    """Builds bounded chat context from processed documents in the results store.
+
+    Each result or batch key gets a BM25 index over its text chunks, built
+    on first use and kept in a small LRU. remove() must be called whenever
+    the results store drops a key; it forgets that key's index and those of
+    the batches listing it in `result_keys`, so chat never answers from an
+    expired document. context() returns the documents' entities plus the
+    top-k chunks for a question, cut to a fixed token budget, so the prompt
+    stays the same size however long the source documents are.
+    """
+
+    def __init__(self, load_results, chunk_tokens=200, overlap_tokens=30, max_indexes=64):
+        """Initialize with a callable returning a stored result or expanded batch (with its `result_keys`), or None"""
+        self.load_results = load_results
+        self.chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+        self.overlap_chars = overlap_tokens * CHARS_PER_TOKEN
+        self.max_indexes = max_indexes
+        self._indexes = OrderedDict()  # key -> (index, entity text)
+        self._batch_members = {}  # batch key -> set of its result keys
+        self._removals = 0
+        self._lock = threading.Lock()
+
+    def _build(self, stored):
+        results = stored["results"] if "results" in stored else [stored]
+        chunks = []
+        summaries = []
+        for result in results:
+            name = result.get("filename", "document")
+            text = document_text(result).strip()
+            if text:
+                for number, chunk in enumerate(split_overlapping(text, self.chunk_chars, self.overlap_chars)):
+                    chunks.append((f"{name} #{number + 1}", chunk))
+            summary = entity_summary(result)
+            if summary:
+                summaries.append(f"[{name}]\n{summary}")
+        return BM25Index(chunks), "\n".join(summaries)
+
+    def index(self, key):
+        """(BM25Index, entity text) for a result or batch key, or None when the key is not stored"""
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None:
+                self._indexes.move_to_end(key)
+                return entry
+            removals = self._removals
+
+        stored = self.load_results(key)
+        if stored is None:
+            return None
+        entry = self._build(stored)
+
+        with self._lock:
+            # A removal while building may have made this index stale, so it is used once and not kept
+            if self._removals == removals:
+                self._indexes[key] = entry
+                if stored.get("result_keys"):
+                    self._batch_members[key] = set(stored["result_keys"])
+                while len(self._indexes) > self.max_indexes:
+                    evicted, _ = self._indexes.popitem(last=False)
+                    self._batch_members.pop(evicted, None)
+        return entry
+
+    def remove(self, key):
+        """Forget the index of a key the results store no longer holds, and of every batch containing it"""
+        with self._lock:
+            self._removals += 1
+            stale = [key] + [batch for batch, members in self._batch_members.items() if key in members]
+            for stale_key in stale:
+                self._indexes.pop(stale_key, None)
+                self._batch_members.pop(stale_key, None)
+
+    def context(self, key, question, budget_tokens=1500, top_k=5):
+        """Context text for one chat turn, or None when the key is not stored.
+
+        Entities take at most half the budget; the best chunks fill the
+        rest and are listed in document order.
+        """
+        entry = self.index(key)
+        if entry is None:
+            return None
+        index, entities = entry
+        budget = budget_tokens * CHARS_PER_TOKEN
+
+        parts = []
+        if entities:
+            entities = entities[:budget // 2]
+            parts.append(f"EXTRACTED ENTITIES:\n{entities}")
+            budget -= len(entities)
+
+        passages = []
+        for chunk_id in index.search(question, top_k):
+            label, text = index.chunks[chunk_id]
+            passage = f"[{label}] {text}"
+            if len(passage) > budget:
+                passage = passage[:budget]
+            if passage:
+                passages.append((chunk_id, passage))
+                budget -= len(passage)
+            if budget <= 0:
+                break
+        if passages:
+            parts.append("RELEVANT PASSAGES:\n" + "\n\n".join(p for _, p in sorted(passages)))
+        return "\n\n".join(parts)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "indexed_keys": len(self._indexes),
+                "max_indexes": self.max_indexes,
+                "chunks": sum(len(index) for index, _ in self._indexes.values()),
+            }
@@ -0,0 +1,478 @@
+from operator import itemgetter
+from threading import Lock
+import json
+import operator
+import os
+import time
+
+import numpy as np
+
+
+# Comparison operators available to predicates in the rule file
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Attribute tuples remembered per plan before the memo is reset
+MAX_MEMO_ENTRIES = 100000
+
+# How condition trees are written out as source: per claimant over predicate
+# results, or over boolean NumPy masks covering every claimant at once
+SCALAR_SYNTAX = {"all": " and ", "any": " or ", "not": "not ", "all_empty": "True", "any_empty": "False"}
+MASK_SYNTAX = {"all": " & ", "any": " | ", "not": "~", "all_empty": "t", "any_empty": "f"}
+
+
+def _field_kind(op, value):
+    """Column type a predicate needs: flag, number or text"""
+    if op == "truthy":
+        return "flag"
+    if op in ("<", "<=", ">", ">="):
+        return "number"
+    sample = value[0] if op == "in" and value else value
+    if isinstance(sample, bool):
+        return "flag"
+    if isinstance(sample, (int, float)):
+        return "number"
+    return "text"
+
+
+def pack_masks(masks, total):
+    """Pack boolean masks of `total` rows into one integer code per row, bit i set where masks[i] is"""
+    codes = np.zeros(total, dtype=np.int64) if len(masks) < 63 else np.zeros(total, dtype=object)
+    for i, mask in enumerate(masks):
+        codes[mask] += 1 << i
+    return codes
+
+
+class RulePlan:
+    """A rule file compiled into a shared-predicate evaluation plan.
+
+    Every distinct (field, op, value) test is one predicate, evaluated once
+    per claimant no matter how many schemes use it. Single claimants go
+    through one generated function shaped like a hand-written if-chain.
+    For traces a claimant reduces to a bit pattern of predicate results;
+    the scheme list and trace for each pattern are derived once and
+    reused, and patterns are memoized per attribute tuple.
+    """
+
+    def __init__(self, spec):
+        """Compile a parsed rule file; raises ValueError for invalid rules"""
+        self.predicates = []  # (name, field, op, value)
+        self._predicate_index = {}
+        self._signatures = {}
+        for name, definition in spec.get("predicates", {}).items():
+            self._add_predicate(definition, name)
+
+        self._condition_specs = spec.get("conditions", {})
+        self._conditions = {}  # name -> (position, refs)
+        self._condition_nodes = []  # in dependency order
+        self._compiling = set()
+
+        self.schemes = []  # (name, condition tree, predicate indices)
+        for scheme in spec.get("schemes", []):
+            if "name" not in scheme or "when" not in scheme:
+                raise ValueError(f"Scheme entries need 'name' and 'when': {scheme}")
+            node, refs = self._compile(scheme["when"])
+            self.schemes.append((scheme["name"], node, sorted(refs)))
+
+        self.fields = tuple(dict.fromkeys(field for _, field, _, _ in self.predicates))
+        self.field_kinds = {}
+        for _, field, op, value in self.predicates:
+            kind = _field_kind(op, value)
+            if self.field_kinds.setdefault(field, kind) != kind:
+                raise ValueError(f"Field '{field}' is used both as {self.field_kinds[field]} and {kind}")
+
+        field_positions = {field: i for i, field in enumerate(self.fields)}
+        self._tests = [
+            (field_positions[field], self._scalar_test(op, value)) for _, field, op, value in self.predicates
+        ]
+        self._bits_of = self._generate_bits_function(field_positions)
+        self._evaluate = self._generate_evaluate_function()
+        self._schemes_of = self._generate_schemes_function()
+        self._masks_of = self._generate_masks_function()
+        self._get_values = itemgetter(*self.fields) if len(self.fields) > 1 else None
+        self._memo = {}
+        self._patterns = {}
+
+    def _add_predicate(self, definition, name=None):
+        field, op, value = definition.get("field"), definition.get("op"), definition.get("value")
+        if not field or (op not in COMPARISONS and op not in ("truthy", "in")):
+            raise ValueError(f"Invalid predicate {name or definition}: needs 'field' and a known 'op'")
+        if op == "in":
+            value = list(value)
+        signature = (field, op, json.dumps(value, sort_keys=True))
+        # Identical tests written in several places share one predicate
+        index = self._signatures.get(signature)
+        if index is None:
+            index = len(self.predicates)
+            self._signatures[signature] = index
+            label = f"{field} {op} {value}" if op != "truthy" else field
+            self.predicates.append((name or label, field, op, value))
+        if name:
+            self._predicate_index[name] = index
+        return index
+
+    def _compile(self, condition):
+        """Compile a condition to (tree, referenced predicate indices).
+
+        Trees are ("predicate", index), ("condition", position), ("not", tree)
+        or ("all" / "any", [trees]); named conditions are compiled once and
+        referenced by position.
+        """
+        if isinstance(condition, str):
+            if condition in self._predicate_index:
+                index = self._predicate_index[condition]
+                return ("predicate", index), {index}
+            if condition in self._condition_specs:
+                if condition not in self._conditions:
+                    if condition in self._compiling:
+                        raise ValueError(f"Condition '{condition}' refers to itself")
+                    self._compiling.add(condition)
+                    node, refs = self._compile(self._condition_specs[condition])
+                    self._compiling.discard(condition)
+                    self._conditions[condition] = (len(self._condition_nodes), refs)
+                    self._condition_nodes.append(node)
+                position, refs = self._conditions[condition]
+                return ("condition", position), refs
+            raise ValueError(f"Unknown predicate or condition '{condition}'")
+
+        if not isinstance(condition, dict):
+            raise ValueError(f"Invalid condition {condition!r}")
+        if "field" in condition:
+            index = self._add_predicate(condition)
+            return ("predicate", index), {index}
+        if "not" in condition:
+            node, refs = self._compile(condition["not"])
+            return ("not", node), refs
+        for key in ("all", "any"):
+            if key in condition:
+                compiled = [self._compile(part) for part in condition[key]]
+                refs = set().union(*(r for _, r in compiled))
+                return (key, [node for node, _ in compiled]), refs
+        raise ValueError(f"Conditions need 'all', 'any', 'not' or a predicate: {condition}")
+
+    @staticmethod
+    def _source(node, syntax, inline=None):
+        """Python expression for a condition tree over locals p<i> (predicates) and k<i> (conditions).
+
+        Predicates and conditions found in `inline` are replaced by the
+        expression it maps them to.
+        """
+        kind, arg = node
+        if kind in ("predicate", "condition"):
+            if inline and node in inline:
+                return inline[node]
+            return f"p{arg}" if kind == "predicate" else f"k{arg}"
+        if kind == "not":
+            return f"({syntax['not']}{RulePlan._source(arg, syntax, inline)})"
+        if not arg:
+            return syntax[f"{kind}_empty"]
+        return "(" + syntax[kind].join(RulePlan._source(part, syntax, inline) for part in arg) + ")"
+
+    def _condition_lines(self, syntax):
+        """Assignments computing each named condition once, before any scheme uses it"""
+        return [f"    k{i} = {self._source(node, syntax)}" for i, node in enumerate(self._condition_nodes)]
+
+    @staticmethod
+    def _scalar_test(op, value):
+        if op == "truthy":
+            return bool
+        if op == "in":
+            return lambda v: v in value
+        compare = COMPARISONS[op]
+        # Missing values never satisfy a predicate
+        return lambda v: v is not None and v != "" and compare(v, value)
+
+    def _generate_bits_function(self, field_positions):
+        """Generate one straight-line function computing all predicate bits from a value tuple.
+
+        Rule values are passed in as bound constants, never formatted into
+        the source.
+        """
+        lines = ["def bits_of(v):", "    b = 0"]
+        for i, (_, field, _, _) in enumerate(self.predicates):
+            lines.append(f"    if {self._predicate_source(i, f'v[{field_positions[field]}]')}:")
+            lines.append(f"        b |= {1 << i}")
+        lines.append("    return b")
+        namespace = {f"c{i}": value for i, (_, _, _, value) in enumerate(self.predicates)}
+        exec(compile("\n".join(lines), "<scheme rules>", "exec"), namespace)
+        return namespace["bits_of"]
+
+    def _predicate_source(self, i, x, first=None):
+        """Python expression for predicate i applied to the value expression `x`; its rule value is c<i>.
+
+        `first`, if given, is written in place of the first use of `x`.
+        """
+        op = self.predicates[i][2]
+        first = first or x
+        if op == "truthy":
+            return first
+        if op == "in":
+            return f"{first} in c{i}"
+        return f"{first} is not None and {x} != '' and {x} {op} c{i}"
+
+    def _generate_evaluate_function(self):
+        """Generate one straight-line function listing the schemes a claimant dict is eligible for.
+
+        Consecutive schemes whose conditions start with the same test are
+        nested under it, as an if-chain written by hand would be. Predicates
+        and named conditions used in several places are computed once up
+        front; those used once are written out where they are used, so they
+        short-circuit. Field names and rule values are bound constants like
+        in bits_of; a missing field or a type mismatch raises, and eligible()
+        falls back to predicate_bits().
+        """
+        groups = []  # [head, [(scheme position, remaining conditions)]]
+        for j, (_, node, _) in enumerate(self.schemes):
+            kind, parts = node
+            head, rest = (parts[0], parts[1:]) if kind == "all" and parts else (node, [])
+            if not groups or groups[-1][0] != head:
+                groups.append([head, []])
+            groups[-1][1].append((j, rest))
+
+        referenced = [head for head, _ in groups] + self._condition_nodes
+        referenced += [part for _, members in groups for _, rest in members for part in rest]
+        uses = {}
+        for node in referenced:
+            self._count_references(node, uses)
+
+        field_positions = {field: i for i, field in enumerate(self.fields)}
+        tests = {}
+        for i, (_, field, op, value) in enumerate(self.predicates):
+            x = f"c[f{field_positions[field]}]"
+            if (op == "==" and value is not None and value != "") or \
+                    (op in ("<", "<=", ">", ">=") and not isinstance(value, str)):
+                # None and "" never equal the value, and ordering them against it raises TypeError
+                tests[i] = f"{x} {op} c{i}"
+            else:
+                # The field is read once even where the missing-value guard tests it again
+                tests[i] = self._predicate_source(i, "x", f"(x := {x})") if op != "truthy" else x
+
+        lines = ["def evaluate(c):"]
+        inline = {}
+        for i, test in tests.items():
+            if uses.get(("predicate", i), 0) > 1:
+                lines.append(f"    p{i} = {test}")
+            else:
+                inline[("predicate", i)] = f"({test})"
+        for k, node in enumerate(self._condition_nodes):
+            if uses.get(("condition", k), 0) > 1:
+                lines.append(f"    k{k} = {self._source(node, SCALAR_SYNTAX, inline)}")
+            else:
+                inline[("condition", k)] = self._source(node, SCALAR_SYNTAX, inline)
+
+        lines.append("    s = []")
+        for head, members in groups:
+            lines.append(f"    if {self._source(head, SCALAR_SYNTAX, inline)}:")
+            for j, rest in members:
+                if rest:
+                    lines.append(f"        if {self._source(('all', rest), SCALAR_SYNTAX, inline)}:")
+                    lines.append(f"            s.append(n{j})")
+                else:
+                    lines.append(f"        s.append(n{j})")
+        lines.append("    return s")
+        namespace = {f"c{i}": value for i, (_, _, _, value) in enumerate(self.predicates)}
+        namespace.update((f"f{j}", field) for j, field in enumerate(self.fields))
+        namespace.update((f"n{j}", name) for j, (name, _, _) in enumerate(self.schemes))
+        exec(compile("\n".join(lines), "<scheme rules>", "exec"), namespace)
+        return namespace["evaluate"]
+
+    @staticmethod
+    def _count_references(node, uses):
+        """Add how often a tree names each predicate and condition to `uses`"""
+        kind, arg = node
+        if kind in ("predicate", "condition"):
+            uses[node] = uses.get(node, 0) + 1
+        elif kind == "not":
+            RulePlan._count_references(arg, uses)
+        else:
+            for part in arg:
+                RulePlan._count_references(part, uses)
+
+    def _generate_schemes_function(self):
+        """Generate one straight-line function listing the schemes (by position) a bit pattern satisfies"""
+        lines = ["def schemes_of(b):"]
+        lines += [f"    p{i} = b >> {i} & 1" for i in range(len(self.predicates))]
+        lines += self._condition_lines(SCALAR_SYNTAX)
+        lines.append("    s = []")
+        for j, (_, node, _) in enumerate(self.schemes):
+            lines.append(f"    if {self._source(node, SCALAR_SYNTAX)}:")
+            lines.append(f"        s.append({j})")
+        lines.append("    return s")
+        namespace = {}
+        exec(compile("\n".join(lines), "<scheme rules>", "exec"), namespace)
+        return namespace["schemes_of"]
+
+    def _generate_masks_function(self):
+        """Generate one function turning predicate masks into a mask per scheme with NumPy boolean ops"""
+        lines = ["def masks_of(m, t, f):"]
+        lines += [f"    p{i} = m[{i}]" for i in range(len(self.predicates))]
+        lines += self._condition_lines(MASK_SYNTAX)
+        lines.append("    return [")
+        # `t &` keeps a scheme that names no predicate a full-length mask
+        lines += [f"        t & {self._source(node, MASK_SYNTAX)}," for _, node, _ in self.schemes]
+        lines.append("    ]")
+        namespace = {}
+        exec(compile("\n".join(lines), "<scheme rules>", "exec"), namespace)
+        return namespace["masks_of"]
+
+    def _bits_checked(self, values):
+        """Per-predicate evaluation that treats type mismatches as a failed test"""
+        bits = 0
+        for i, (position, test) in enumerate(self._tests):
+            try:
+                if test(values[position]):
+                    bits |= 1 << i
+            except TypeError:
+                pass
+        return bits
+
+    def predicate_bits(self, claimant):
+        """Evaluate every predicate once for a claimant dict and pack the results"""
+        try:
+            values = self._get_values(claimant) if self._get_values else (claimant.get(self.fields[0]),)
+        except (KeyError, TypeError):
+            values = tuple(map(claimant.get, self.fields))
+
+        key = values
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable attribute values
+            key = None
+
+        try:
+            bits = self._bits_of(values)
+        except TypeError:  # e.g. a number compared with a string
+            bits = self._bits_checked(values)
+
+        if key is not None:
+            if len(self._memo) >= MAX_MEMO_ENTRIES:
+                self._memo.clear()
+            self._memo[key] = bits
+        return bits
+
+    def pattern(self, bits):
+        """(schemes, trace) for a predicate bit pattern; trace maps each scheme to the predicates that fired"""
+        result = self._patterns.get(bits)
+        if result is None:
+            schemes = []
+            trace = {}
+            for j in self._schemes_of(bits):
+                name, _, refs = self.schemes[j]
+                schemes.append(name)
+                trace[name] = [self.predicates[i][0] for i in refs if bits >> i & 1]
+            result = (schemes, trace)
+            self._patterns[bits] = result
+        return result
+
+    def eligible(self, claimant):
+        """New list of the schemes one claimant dict is eligible for, in rule-file order"""
+        try:
+            return self._evaluate(claimant)
+        except (KeyError, TypeError):  # missing fields, or e.g. a number compared with a string
+            return list(self.pattern(self.predicate_bits(claimant))[0])
+
+    def evaluate(self, claimant, explain=False):
+        """Return (eligible schemes, trace) for one claimant dict; the trace is None unless `explain`"""
+        if explain:
+            return self.pattern(self.predicate_bits(claimant))
+        return self.eligible(claimant), None
+
+    def predicate_masks(self, columns):
+        """Evaluate each predicate as a boolean NumPy mask over claimant columns"""
+        total = len(next(iter(columns.values()))) if columns else 0
+        masks = []
+        for _, field, op, value in self.predicates:
+            column = columns.get(field)
+            if column is None:
+                masks.append(np.zeros(total, dtype=bool))
+                continue
+            if op == "truthy":
+                mask = column.astype(bool)
+            elif op == "in":
+                mask = np.isin(column, value)
+            else:
+                with np.errstate(invalid="ignore"):
+                    mask = np.asarray(COMPARISONS[op](column, value), dtype=bool)
+                # NaN and empty strings are missing values, as in the scalar path
+                if column.dtype.kind == "f":
+                    mask &= ~np.isnan(column)
+                elif column.dtype == object:
+                    mask &= column != ""
+            masks.append(mask)
+        return masks
+
+    def scheme_masks(self, predicate_masks, total):
+        """One boolean mask per scheme, in rule-file order, from the masks of predicate_masks()"""
+        return self._masks_of(predicate_masks, np.ones(total, dtype=bool), np.zeros(total, dtype=bool))
+
+    def stats(self):
+        return {
+            "predicates": len(self.predicates),
+            "schemes": len(self.schemes),
+            "memoized_claimants": len(self._memo),
+            "distinct_patterns": len(self._patterns),
+        }
+
+
+class RuleEngine:
+    """Scheme rules loaded from a JSON file and recompiled when the file changes.
+
+    The file's mtime is checked at most every `check_interval` seconds. A
+    rule file that fails to compile is reported and the previous plan is
+    kept, so a bad edit never takes the DSS down.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        """Load and compile the rule file at `path`"""
+        self.path = path
+        self.check_interval = check_interval
+        self._plan = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._loaded_at = None
+        self._lock = Lock()
+        self._reload_if_changed()
+        if self._plan is None:
+            raise ValueError(f"Could not load scheme rules from {path}")
+
+    def _reload_if_changed(self):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                print(f"❌ Scheme rules unavailable: {str(e)}")
+                return
+            if mtime == self._mtime:
+                return
+            # Remember the mtime even on failure so a broken file is reported once
+            self._mtime = mtime
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    plan = RulePlan(json.load(f))
+            except Exception as e:
+                print(f"❌ Failed to compile scheme rules from {self.path}: {str(e)}")
+                return
+            self._plan = plan
+            self._loaded_at = time.time()
+            print(f"✅ Loaded {len(plan.schemes)} scheme rules over {len(plan.predicates)} predicates")
+
+    def plan(self):
+        """Current compiled plan, reloading the rule file first if it changed"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self._reload_if_changed()
+        return self._plan
+
+    def stats(self):
+        stats = self.plan().stats()
+        stats["path"] = self.path
+        stats["loaded_at"] = self._loaded_at
+        return stats
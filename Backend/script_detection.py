@@ -0,0 +1,69 @@
+from bisect import bisect_right
+from collections import Counter
+
+
+# Unicode blocks used to guess a document's language from its script
+SCRIPT_RANGES = [
+    (0x0600, 0x06FF, 'ar'),  # Arabic
+    (0x0900, 0x097F, 'hi'),  # Devanagari
+    (0x0980, 0x09FF, 'bn'),  # Bengali
+    (0x0A00, 0x0A7F, 'pa'),  # Gurmukhi
+    (0x0A80, 0x0AFF, 'gu'),  # Gujarati
+    (0x0B00, 0x0B7F, 'or'),  # Odia
+    (0x0B80, 0x0BFF, 'ta'),  # Tamil
+    (0x0C00, 0x0C7F, 'te'),  # Telugu
+    (0x0C80, 0x0CFF, 'kn'),  # Kannada
+    (0x0D00, 0x0D7F, 'ml'),  # Malayalam
+    (0x4E00, 0x9FFF, 'zh'),  # Chinese
+]
+
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Characters examined per document, as with the Translate API detection call
+SAMPLE_SIZE = 1000
+
+# Minimum share of letters in one script before it is reported
+MIN_CONFIDENCE = 0.1
+
+
+def script_of(char):
+    """Return the language code whose script contains `char`, or None"""
+    code = ord(char)
+    index = bisect_right(_RANGE_STARTS, code) - 1
+    if index >= 0 and code <= SCRIPT_RANGES[index][1]:
+        return SCRIPT_RANGES[index][2]
+    return None
+
+
+def detect_script_language(text):
+    """Guess the language of `text` from the Unicode scripts of its letters.
+
+    Counts each distinct character of the sample once with a C-level
+    Counter, then classifies only the distinct letters via bisect over the
+    sorted script ranges. Returns {'language', 'confidence'} where
+    confidence is the share of letters in the winning script; falls back
+    to English with zero confidence.
+    """
+    sample_text = text[:SAMPLE_SIZE] if text else ""
+
+    char_counts = {}
+    total_chars = 0
+    for char, count in Counter(sample_text).items():
+        if not char.isalpha():
+            continue
+        total_chars += count
+        lang = script_of(char)
+        if lang:
+            char_counts[lang] = char_counts.get(lang, 0) + count
+
+    if total_chars > 0 and char_counts:
+        most_common_lang = max(char_counts, key=char_counts.get)
+        confidence = char_counts[most_common_lang] / total_chars
+
+        if confidence > MIN_CONFIDENCE:
+            return {
+                'language': most_common_lang,
+                'confidence': confidence
+            }
+
+    return {'language': 'en', 'confidence': 0.0}
@@ -0,0 +1,284 @@
+from array import array
+from collections import Counter
+import math
+import re
+import threading
+
+import numpy as np
+
+from retrieval import STOPWORDS, TOKEN_PATTERN
+
+
+# Result fields whose text is searchable
+TEXT_FIELDS = ("standardized_text", "translated_text")
+
+# Removed documents are compacted out once they outnumber live ones (and at least this many)
+COMPACT_MIN_DEAD = 1024
+
+# Words, keeping runs joined by punctuation (45/2, PAT-000123, PM-KISAN) together
+_COMPOUND = re.compile(r"[\w\u0900-\u0dff]+(?:[^\s\w\u0900-\u0dff]+[\w\u0900-\u0dff]+)*")
+
+
+def index_terms(text):
+    """Terms a text is indexed under.
+
+    Every word part is a term (`pm`, `kisan`), and a word with inner
+    punctuation is also kept whole (`pm-kisan`, `45/2`, `pat-000123`) so
+    survey and patta numbers can be matched exactly.
+    """
+    terms = []
+    for word in _COMPOUND.findall(text.casefold()):
+        if word.isalnum():
+            if word not in STOPWORDS:
+                terms.append(word)
+            continue
+        parts = TOKEN_PATTERN.findall(word)
+        terms.extend(part for part in parts if part not in STOPWORDS)
+        if len(parts) > 1:
+            terms.append(word)
+    return terms
+
+
+def query_terms(text):
+    """Terms a query must match: whole words with inner punctuation, otherwise single word parts"""
+    terms = []
+    for word in _COMPOUND.findall(text.casefold()):
+        parts = TOKEN_PATTERN.findall(word)
+        if len(parts) > 1:
+            terms.append(word)
+        elif parts and parts[0] not in STOPWORDS:
+            terms.append(parts[0])
+    return list(dict.fromkeys(terms))
+
+
+def snippet(text, terms, width=160):
+    """Short excerpt of `text` around the first occurrence of any term"""
+    if not text:
+        return ""
+    folded = text.casefold()
+    positions = [p for p in (folded.find(term) for term in terms) if p >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    excerpt = " ".join(text[start:start + width].split())
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
+
+
+def _intersect(a, b):
+    """Sorted values present in both sorted, duplicate-free arrays"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[positions] == a]
+
+
+class SearchIndex:
+    """Incremental inverted index over stored results and their entities.
+
+    Documents get increasing ids, so every posting list is an append-only,
+    sorted array('i') of ids (with an array('H') of term counts for the
+    text index). Adding a result costs one append per distinct term; a
+    query scatter-adds BM25 scores from each term's postings into per-document
+    arrays, so it never reads document text. Entities are indexed per type
+    (`CLAIM_STATUS` -> `pending`) for filters. Removed documents are masked
+    out and compacted away in bulk.
+    """
+
+    def __init__(self, text_fields=TEXT_FIELDS, k1=1.2, b=0.75):
+        """Initialize with the result fields to index as text and BM25 parameters"""
+        self.text_fields = text_fields
+        self.k1 = k1
+        self.b = b
+        self._keys = []  # doc id -> result key, None once removed
+        self._ids = {}  # result key -> doc id
+        self._lengths = array("i")
+        self._alive = bytearray()
+        self._terms = {}  # term -> (doc ids, term counts)
+        self._fields = {}  # (ENTITY_TYPE, term) -> doc ids
+        self._live = 0
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def add(self, key, result):
+        """Index one stored result under its results store key, replacing any earlier version"""
+        counts = Counter()
+        for field in self.text_fields:
+            text = result.get(field)
+            if text:
+                counts.update(index_terms(text))
+        length = sum(counts.values())
+        field_terms = set()
+        for entity_type, values in (result.get("entities") or {}).items():
+            if isinstance(values, list):
+                for value in values:
+                    field_terms.update((entity_type.upper(), term) for term in index_terms(str(value)))
+
+        with self._lock:
+            if key in self._ids:
+                self._remove(key)
+            doc = len(self._keys)
+            self._keys.append(key)
+            self._ids[key] = doc
+            self._lengths.append(length)
+            self._alive.append(1)
+            self._live += 1
+            self._total_length += length
+            for term, count in counts.items():
+                posting = self._terms.get(term)
+                if posting is None:
+                    posting = self._terms[term] = (array("i"), array("H"))
+                posting[0].append(doc)
+                posting[1].append(min(count, 65535))
+            for field_term in field_terms:
+                ids = self._fields.get(field_term)
+                if ids is None:
+                    ids = self._fields[field_term] = array("i")
+                ids.append(doc)
+
+    def _remove(self, key):
+        doc = self._ids.pop(key)
+        self._keys[doc] = None
+        self._alive[doc] = 0
+        self._live -= 1
+        self._total_length -= self._lengths[doc]
+
+    def remove(self, key):
+        """Drop a result from search results; its postings are compacted later"""
+        with self._lock:
+            if key in self._ids:
+                self._remove(key)
+            dead = len(self._keys) - self._live
+            if dead >= COMPACT_MIN_DEAD and dead > self._live:
+                self._compact()
+
+    def _compact(self):
+        """Renumber live documents densely and drop removed ones from every posting"""
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        remap = (np.cumsum(alive) - 1).astype(np.int32)
+
+        def rewrite(ids, typecode="i"):
+            compacted = array(typecode)
+            compacted.frombytes(ids.tobytes())
+            return compacted
+
+        for term, (ids, tfs) in list(self._terms.items()):
+            doc_ids = np.frombuffer(ids, dtype=np.int32).copy()
+            keep = alive[doc_ids]
+            if keep.any():
+                counts = np.frombuffer(tfs, dtype=np.uint16).copy()
+                self._terms[term] = (rewrite(remap[doc_ids[keep]]), rewrite(counts[keep], "H"))
+            else:
+                del self._terms[term]
+        for field_term, ids in list(self._fields.items()):
+            doc_ids = np.frombuffer(ids, dtype=np.int32).copy()
+            keep = alive[doc_ids]
+            if keep.any():
+                self._fields[field_term] = rewrite(remap[doc_ids[keep]])
+            else:
+                del self._fields[field_term]
+
+        self._lengths = rewrite(np.frombuffer(self._lengths, dtype=np.int32)[alive].copy())
+        self._keys = [key for key in self._keys if key is not None]
+        self._ids = {key: doc for doc, key in enumerate(self._keys)}
+        self._alive = bytearray(b"\x01" * len(self._keys))
+
+    def _postings(self, term):
+        """Copy of a term's (doc ids, counts), or None"""
+        posting = self._terms.get(term)
+        if posting is None:
+            return None
+        return np.frombuffer(posting[0], dtype=np.int32).copy(), np.frombuffer(posting[1], dtype=np.uint16).copy()
+
+    def _field_ids(self, entity_type, value):
+        """Doc ids whose `entity_type` entities contain every term of `value`"""
+        matched = None
+        for term in query_terms(value):
+            ids = self._fields.get((entity_type.upper(), term))
+            if ids is None:
+                return np.zeros(0, dtype=np.int32)
+            ids = np.frombuffer(ids, dtype=np.int32).copy()
+            matched = ids if matched is None else _intersect(matched, ids)
+        return matched
+
+    def search(self, query="", filters=(), match="all", offset=0, limit=20):
+        """Ranked result keys for a text query and entity filters.
+
+        `filters` are (ENTITY_TYPE, value) pairs that must all match.
+        `match` is "all" (every query term) or "any". Without a query,
+        matching documents are listed newest first. Returns
+        {"total", "hits": [{"key", "score"}], "terms"}.
+        """
+        terms = query_terms(query)
+        with self._lock:
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            mask = alive.copy()
+            filtered = False
+            for entity_type, value in filters:
+                ids = self._field_ids(entity_type, value)
+                if ids is None:
+                    continue
+                matched = np.zeros(len(mask), dtype=bool)
+                matched[ids] = True
+                mask &= matched
+                filtered = True
+            if not terms and not filtered:
+                return {"total": 0, "hits": [], "terms": terms}
+
+            if terms:
+                # Score into dense per-document arrays: one scatter-add per query term
+                scores = np.zeros(len(mask), dtype=np.float64)
+                matches = np.zeros(len(mask), dtype=np.int32)
+                average = self._total_length / self._live if self._live and self._total_length else 1.0
+                for term in terms:
+                    posting = self._postings(term)
+                    if posting is None:
+                        continue
+                    ids, tfs = posting
+                    # Postings of removed documents stay until compaction; they must not count towards IDF
+                    live = alive[ids]
+                    ids, tfs = ids[live], tfs[live]
+                    if not len(ids):
+                        continue
+                    tf = tfs.astype(np.float64)
+                    lengths = np.frombuffer(self._lengths, dtype=np.int32)[ids]
+                    norm = self.k1 * (1 - self.b + self.b * lengths / average)
+                    idf = math.log(1 + (self._live - len(ids) + 0.5) / (len(ids) + 0.5))
+                    scores[ids] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    matches[ids] += 1
+                mask &= matches == len(terms) if match == "all" else matches > 0
+            candidates = np.flatnonzero(mask)
+
+            if terms and len(candidates):
+                scores = scores[candidates]
+                end = min(offset + limit, len(candidates))
+                if end <= offset:
+                    order = np.zeros(0, dtype=np.int64)
+                elif end < len(candidates):
+                    # Keep every candidate tied with the cut-off score so pages are stable
+                    cutoff = -np.partition(-scores, end - 1)[end - 1]
+                    top = np.flatnonzero(scores >= cutoff)
+                    order = top[np.lexsort((-candidates[top], -scores[top]))][offset:end]
+                else:
+                    order = np.lexsort((-candidates, -scores))[offset:end]
+                hits = [{"key": self._keys[candidates[i]], "score": round(float(scores[i]), 4)} for i in order]
+            else:
+                newest = candidates[::-1][offset:offset + limit]
+                hits = [{"key": self._keys[doc], "score": None} for doc in newest]
+            return {"total": int(len(candidates)), "hits": hits, "terms": terms}
+
+    def __len__(self):
+        return self._live
+
+    def stats(self):
+        with self._lock:
+            postings = sum(len(ids) for ids, _ in self._terms.values())
+            field_postings = sum(len(ids) for ids in self._fields.values())
+            return {
+                "documents": self._live,
+                "removed_pending_compaction": len(self._keys) - self._live,
+                "terms": len(self._terms),
+                "postings": postings,
+                "field_terms": len(self._fields),
+                "field_postings": field_postings,
+                "index_bytes": postings * 6 + field_postings * 4 + len(self._lengths) * 4,
+            }
@@ -0,0 +1,403 @@
+import json
+import math
+import re
+
+import numpy as np
+
+
+# Points per chunk in bulk lookups, bounding the size of the candidate edge arrays
+QUERY_CHUNK_POINTS = 16384
+
+# Hectares per unit for land areas written in claims (unit spelled without spaces, dots or plural s)
+AREA_UNITS_HECTARES = {
+    "hectare": 1.0,
+    "ha": 1.0,
+    "acre": 0.40468564224,
+    "ac": 0.40468564224,
+    "gunta": 0.0101171,
+    "cent": 0.0040468564224,
+    "sqm": 0.0001,
+    "sqmtr": 0.0001,
+    "sqmeter": 0.0001,
+    "sqmetre": 0.0001,
+    "squaremeter": 0.0001,
+    "squaremetre": 0.0001,
+    "sqft": 0.000009290304,
+    "sqfeet": 0.000009290304,
+    "squarefeet": 0.000009290304,
+}
+
+_AREA_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(hectares?|ha|acres?|ac|guntas?|cents?|"
+    r"sq\.?\s*(?:m|mtrs?|meters?|metres?|ft|feet)|square\s+(?:meters?|metres?|feet))(?![a-z])",
+    re.IGNORECASE
+)
+
+_DECIMAL_PAIR_PATTERN = re.compile(
+    r"(-?\d{1,3}(?:\.\d+)?)\s*°?\s*([NSEW])?\s*[,; ]\s*(-?\d{1,3}(?:\.\d+)?)\s*°?\s*([NSEW])?", re.IGNORECASE
+)
+
+_DMS_PATTERN = re.compile(
+    r"(\d{1,3})\s*°\s*(\d{1,2})\s*['′]\s*(?:(\d{1,2}(?:\.\d+)?)\s*[\"″]\s*)?([NSEW])", re.IGNORECASE
+)
+
+
+def load_geojson(path):
+    """Read a GeoJSON FeatureCollection, tolerating full-line // comments"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if "//" in text:
+        text = "\n".join(line for line in text.splitlines() if not line.lstrip().startswith("//"))
+    return json.loads(text).get("features", [])
+
+
+def load_layers(paths):
+    """Load {layer name: GeoJSON path} into {layer name: features}; unreadable files become empty layers"""
+    layers = {}
+    for name, path in paths.items():
+        try:
+            layers[name] = load_geojson(path) if path else []
+        except Exception as e:
+            print(f"❌ Could not load {name} polygons from {path}: {str(e)}")
+            layers[name] = []
+    print("✅ Spatial layers loaded: " + ", ".join(f"{len(features)} {name}" for name, features in layers.items()))
+    return layers
+
+
+def parse_land_area(value):
+    """Convert a claimed land area such as "2.5 hectares" or "3 acres" to hectares, or None"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _AREA_PATTERN.search(value or "")
+    if not match:
+        # A bare number is taken as hectares, the unit fra_claimant uses
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    unit = re.sub(r"[^a-z]", "", match.group(2).lower())
+    if unit.endswith("s") and unit[:-1] in AREA_UNITS_HECTARES:
+        unit = unit[:-1]
+    return float(match.group(1)) * AREA_UNITS_HECTARES[unit]
+
+
+def parse_coordinates(value):
+    """Parse "19.6354 N, 78.5371 E", "19.6354, 78.5371" or DMS text into (lon, lat), or None.
+
+    Without hemisphere letters the pair is read as latitude, longitude
+    unless the first number cannot be a latitude.
+    """
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return float(value[0]), float(value[1])
+    if not value:
+        return None
+
+    dms = _DMS_PATTERN.findall(value)
+    if len(dms) >= 2:
+        lat = lon = None
+        for degrees, minutes, seconds, hemisphere in dms[:2]:
+            decimal = int(degrees) + int(minutes) / 60 + float(seconds or 0) / 3600
+            hemisphere = hemisphere.upper()
+            if hemisphere in "SW":
+                decimal = -decimal
+            if hemisphere in "NS":
+                lat = decimal
+            else:
+                lon = decimal
+        if lat is not None and lon is not None:
+            return lon, lat
+
+    match = _DECIMAL_PAIR_PATTERN.search(value)
+    if not match:
+        return None
+    first, first_hemisphere, second, second_hemisphere = match.groups()
+    first_hemisphere = (first_hemisphere or "").upper()
+    second_hemisphere = (second_hemisphere or "").upper()
+    first = -abs(float(first)) if first_hemisphere in ("S", "W") else float(first)
+    second = -abs(float(second)) if second_hemisphere in ("S", "W") else float(second)
+    if first_hemisphere in ("E", "W") or second_hemisphere in ("N", "S") or abs(first) > 90:
+        return first, second
+    return second, first
+
+
+def ragged_arange(starts, counts):
+    """Concatenate arange(start, start + count) for every pair, vectorized"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    offsets = np.repeat(starts - (ends - counts), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class STRTree:
+    """Sort-Tile-Recursive packed R-tree over bounding boxes.
+
+    Every level is stored as flat NumPy arrays (node boxes plus the range
+    of children one level down), so a batch of points descends the tree
+    level by level with vectorized box tests instead of per-point loops.
+    """
+
+    def __init__(self, boxes, node_capacity=16):
+        """Build over an (n, 4) array of minx, miny, maxx, maxy boxes"""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.node_capacity = node_capacity
+        self.order = self._str_order(boxes, np.arange(len(boxes)))
+        self.levels = []  # root first: (boxes, child_start, child_count)
+
+        level_boxes = boxes[self.order]
+        while True:
+            starts = np.arange(0, len(level_boxes), node_capacity)
+            counts = np.minimum(node_capacity, len(level_boxes) - starts)
+            node_boxes = np.empty((len(starts), 4))
+            if len(starts):
+                node_boxes[:, 0] = np.minimum.reduceat(level_boxes[:, 0], starts)
+                node_boxes[:, 1] = np.minimum.reduceat(level_boxes[:, 1], starts)
+                node_boxes[:, 2] = np.maximum.reduceat(level_boxes[:, 2], starts)
+                node_boxes[:, 3] = np.maximum.reduceat(level_boxes[:, 3], starts)
+            if len(node_boxes) <= 1:
+                self.levels.insert(0, (node_boxes, starts, counts))
+                break
+            # Pack the next level with STR as well; children ranges travel with their nodes
+            order = self._str_order(node_boxes, np.arange(len(node_boxes)))
+            self.levels.insert(0, (node_boxes[order], starts[order], counts[order]))
+            level_boxes = node_boxes[order]
+
+    def _str_order(self, boxes, ids):
+        """Order boxes into vertical slices by x centre, each sorted by y centre"""
+        if len(ids) == 0:
+            return ids
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+        leaves = math.ceil(len(ids) / self.node_capacity)
+        slice_size = math.ceil(math.sqrt(leaves)) * self.node_capacity
+        by_x = np.argsort(cx, kind="stable")
+        slices = [by_x[i:i + slice_size] for i in range(0, len(by_x), slice_size)]
+        return np.concatenate([s[np.argsort(cy[s], kind="stable")] for s in slices])
+
+    def query_points(self, x, y):
+        """Return (point_index, item_index) arrays for every box containing a point"""
+        points = np.arange(len(x))
+        nodes = np.zeros(len(x), dtype=np.int64)
+        for boxes, child_start, child_count in self.levels:
+            b = boxes[nodes]
+            px, py = x[points], y[points]
+            hit = (b[:, 0] <= px) & (px <= b[:, 2]) & (b[:, 1] <= py) & (py <= b[:, 3])
+            points, nodes = points[hit], nodes[hit]
+            counts = child_count[nodes]
+            points = np.repeat(points, counts)
+            nodes = ragged_arange(child_start[nodes], counts)
+        return points, self.order[nodes]
+
+    def query_box(self, minx, miny, maxx, maxy):
+        """Return the indices of every box intersecting the query box"""
+        nodes = np.zeros(1, dtype=np.int64)
+        for boxes, child_start, child_count in self.levels:
+            b = boxes[nodes]
+            nodes = nodes[(b[:, 0] <= maxx) & (minx <= b[:, 2]) & (b[:, 1] <= maxy) & (miny <= b[:, 3])]
+            nodes = ragged_arange(child_start[nodes], child_count[nodes])
+        return self.order[nodes]
+
+
+class PolygonLayer:
+    """Polygon features with an STR-tree over their bounding boxes and exact point-in-polygon tests"""
+
+    def __init__(self, name, features):
+        """Index the Polygon and MultiPolygon features of one layer"""
+        self.name = name
+        self.properties = []
+        self.areas = []
+        edge_x1, edge_y1, edge_x2, edge_y2 = [], [], [], []
+        edge_start, edge_count, boxes = [], [], []
+        total_edges = 0
+
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            if geometry.get("type") == "Polygon":
+                rings = geometry["coordinates"]
+            elif geometry.get("type") == "MultiPolygon":
+                rings = [ring for polygon in geometry["coordinates"] for ring in polygon]
+            else:
+                continue
+            rings = [np.asarray(ring, dtype=np.float64)[:, :2] for ring in rings if len(ring) >= 3]
+            if not rings:
+                continue
+
+            edge_start.append(total_edges)
+            count = 0
+            for ring in rings:
+                # Holes and extra parts are plain rings under the even-odd rule
+                closed = ring if np.array_equal(ring[0], ring[-1]) else np.vstack([ring, ring[:1]])
+                edge_x1.append(closed[:-1, 0])
+                edge_y1.append(closed[:-1, 1])
+                edge_x2.append(closed[1:, 0])
+                edge_y2.append(closed[1:, 1])
+                count += len(closed) - 1
+            edge_count.append(count)
+            total_edges += count
+
+            points = np.vstack(rings)
+            box = (points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max())
+            boxes.append(box)
+            # Box area is enough to prefer the more specific of two overlapping polygons
+            self.areas.append((box[2] - box[0]) * (box[3] - box[1]))
+            self.properties.append(feature.get("properties") or {})
+
+        def concat(parts):
+            return np.concatenate(parts) if parts else np.zeros(0)
+
+        self._index_edges(concat(edge_x1), concat(edge_y1), concat(edge_x2), concat(edge_y2), edge_start, edge_count, boxes)
+
+    @classmethod
+    def from_table(cls, name, table):
+        """Index the polygons of a geojson_stream.FeatureTable without going back through GeoJSON dicts"""
+        layer = cls(name, [])
+        ring_offsets = table.ring_offsets.data
+        feature_rings = table.polygon_offsets.data[table.feature_offsets.data]
+        # Rows without polygons stay out of the tree; properties map back to table rows
+        rows = np.flatnonzero(np.diff(feature_rings) > 0)
+        layer.properties = table.row_view(rows)
+
+        x, y = table.x.data, table.y.data
+        # Rings are stored closed, so every vertex except the last of its ring starts an edge
+        starts_edge = np.ones(len(x), dtype=bool)
+        starts_edge[ring_offsets[1:] - 1] = False
+        edge = np.flatnonzero(starts_edge)
+        vertex_start = ring_offsets[feature_rings]
+        edge_count = (np.diff(vertex_start) - np.diff(feature_rings))[rows]
+        edge_start = (vertex_start[:-1] - feature_rings[:-1])[rows]
+
+        boxes = table.boxes.data[rows]
+        layer.areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        layer._index_edges(x[edge], y[edge], x[edge + 1], y[edge + 1], edge_start, edge_count, boxes)
+        return layer
+
+    def _index_edges(self, x1, y1, x2, y2, edge_start, edge_count, boxes):
+        # Edges are kept as y-range plus x at y1 and inverse slope, so a crossing test is one multiply-add
+        self.x1, self.y1, self.y2 = x1, y1, y2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.inverse_slope = np.where(y1 != y2, (x2 - x1) / (y2 - y1), 0.0)
+        self.edge_start = np.asarray(edge_start, dtype=np.int64)
+        self.edge_count = np.asarray(edge_count, dtype=np.int64)
+        self.areas = np.asarray(self.areas)
+        self.tree = STRTree(np.asarray(boxes).reshape(-1, 4))
+
+    def __len__(self):
+        return len(self.properties)
+
+    def locate(self, x, y):
+        """Index of the polygon containing each point (the smallest if several do), or -1"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        result = np.full(len(x), -1, dtype=np.int64)
+        if len(self) == 0:
+            return result
+
+        for offset in range(0, len(x), QUERY_CHUNK_POINTS):
+            cx, cy = x[offset:offset + QUERY_CHUNK_POINTS], y[offset:offset + QUERY_CHUNK_POINTS]
+            points, polygons = self.tree.query_points(cx, cy)
+            if len(points) == 0:
+                continue
+
+            # Ray casting over every edge of every candidate polygon at once
+            counts = self.edge_count[polygons]
+            edges = ragged_arange(self.edge_start[polygons], counts)
+            pair = np.repeat(np.arange(len(points)), counts)
+            px, py = np.repeat(cx[points], counts), np.repeat(cy[points], counts)
+            y1 = self.y1[edges]
+            straddles = (y1 > py) != (self.y2[edges] > py)
+            crosses = straddles & (px < self.x1[edges] + (py - y1) * self.inverse_slope[edges])
+            inside = np.bincount(pair, weights=crosses, minlength=len(points)).astype(np.int64) % 2 == 1
+
+            points, polygons = points[inside], polygons[inside]
+            if len(points) == 0:
+                continue
+            # Most specific match first when polygons overlap
+            order = np.lexsort((self.areas[polygons], points))
+            points, polygons = points[order], polygons[order]
+            first = np.unique(points, return_index=True)[1]
+            result[offset + points[first]] = polygons[first]
+        return result
+
+
+class SpatialIndex:
+    """Survey, mandal and district polygon layers answering point lookups"""
+
+    def __init__(self, layers, area_tolerance=0.1):
+        """Initialize with {layer name: GeoJSON features} and the accepted relative area mismatch"""
+        self.layers = {name: PolygonLayer(name, features) for name, features in layers.items()}
+        self.area_tolerance = area_tolerance
+
+    @classmethod
+    def from_files(cls, paths, area_tolerance=0.1):
+        """Load layers from {layer name: GeoJSON path}"""
+        return cls(load_layers(paths), area_tolerance)
+
+    def replace_layer(self, name, layer):
+        """Swap in a rebuilt layer; lookups already running keep the layers they started with"""
+        layers = dict(self.layers)
+        layers[name] = layer
+        self.layers = layers
+
+    def stats(self):
+        return {name: len(layer) for name, layer in self.layers.items()}
+
+    def check_area(self, claimed_hectares, survey_properties):
+        """Compare a claimed area with the survey polygon's AREA attribute (square metres)"""
+        try:
+            surveyed_hectares = float(survey_properties.get("AREA")) / 10000
+        except (TypeError, ValueError):
+            return None
+        if claimed_hectares is None:
+            return {"surveyed_hectares": surveyed_hectares, "claimed_hectares": None, "matches": None}
+        difference = abs(claimed_hectares - surveyed_hectares) / surveyed_hectares if surveyed_hectares else None
+        return {
+            "surveyed_hectares": round(surveyed_hectares, 4),
+            "claimed_hectares": round(claimed_hectares, 4),
+            "relative_difference": round(difference, 4) if difference is not None else None,
+            "matches": difference is not None and difference <= self.area_tolerance,
+        }
+
+    def lookup_many(self, lon, lat, land_areas=None):
+        """Resolve many points at once; returns one dict per point"""
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        layers = self.layers
+        located = {name: layer.locate(lon, lat).tolist() for name, layer in layers.items()}
+
+        results = []
+        for i in range(len(lon)):
+            entry = {"lon": float(lon[i]), "lat": float(lat[i])}
+            for name, layer in layers.items():
+                match = located[name][i]
+                entry[name] = layer.properties[match] if match >= 0 else None
+
+            survey = entry.get("survey")
+            # Fall back to the survey's own MANDAL attribute when no mandal polygons are loaded
+            if entry.get("mandal") is None and survey and survey.get("MANDAL"):
+                entry["mandal"] = {"MANDAL": survey["MANDAL"]}
+            if land_areas is not None and survey:
+                entry["area_check"] = self.check_area(parse_land_area(land_areas[i]), survey)
+            results.append(entry)
+        return results
+
+    def lookup(self, lon, lat, land_area=None):
+        """Resolve one point"""
+        return self.lookup_many([lon], [lat], None if land_area is None else [land_area])[0]
+
+    def validate_entities(self, entities):
+        """Check the COORDINATES and LAND_AREA entities of one processed document"""
+        points = [p for p in (parse_coordinates(c) for c in entities.get("COORDINATES", [])) if p]
+        if not points:
+            return {"validated": False, "message": "No parseable COORDINATES entity", "locations": []}
+        land_areas = entities.get("LAND_AREA") or []
+        land_area = land_areas[0] if land_areas else None
+        locations = self.lookup_many(
+            [p[0] for p in points], [p[1] for p in points],
+            [land_area] * len(points) if land_area is not None else None
+        )
+        return {
+            "validated": any(location.get("survey") for location in locations),
+            "land_area": land_area,
+            "locations": locations,
+        }
@@ -0,0 +1,120 @@
+import csv
+import io
+import random
+
+from dss import claimant_fields, columns_from_records, default_rules, evaluate_batch, fra_dss, load_claimants, split_plain_csv
+from rule_engine import RulePlan
+
+
+def claimants(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        {
+            "Name": f"Claimant {i}",
+            "Village": f"Village {rng.randint(1, 20)}",
+            "District": rng.choice(["Adilabad", "Khammam"]),
+            "Land Area (hectares)": rng.choice([round(rng.uniform(0.2, 4.0), 2), None]),
+            "Claim Status": rng.choice(["Granted", "Pending", ""]),
+            "SC": rng.random() < 0.2,
+            "ST": rng.random() < 0.6,
+            "Other Vulnerable": rng.random() < 0.1,
+            "Income Level": rng.choice(["Low", "Medium", "High"]),
+            "Water Index": round(rng.random(), 2),
+            "Village Population": rng.randint(100, 1000),
+            "Village ST Percentage": rng.randint(0, 100),
+            "Aspirational District": rng.random() < 0.4,
+            "Village ST Population": rng.randint(0, 200),
+            "Unelectrified HH": rng.random() < 0.3,
+            "No Pucca House": rng.random() < 0.4,
+            "No Toilet": rng.random() < 0.35,
+        }
+        for i in range(count)
+    ]
+
+
+def to_csv(records, quoting=csv.QUOTE_MINIMAL):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(records[0]), quoting=quoting)
+    writer.writeheader()
+    writer.writerows(records)
+    return out.getvalue()
+
+
+def test_batch_matches_fra_dss():
+    records = claimants(500)
+    expected = [fra_dss(record) for record in records]
+    fields = claimant_fields(default_rules().plan())
+
+    batch = evaluate_batch(columns_from_records(records, fields))
+    assert [c["eligible_schemes"] for c in batch["claimants"]] == expected
+    for name, count in batch["scheme_counts"].items():
+        assert count == sum(name in schemes for schemes in expected)
+
+
+def test_csv_with_and_without_quoting_loads_the_same_columns():
+    records = claimants(200)
+    plain, quoted = to_csv(records), to_csv(records, csv.QUOTE_ALL)
+    assert split_plain_csv(plain) is not None
+    assert split_plain_csv(quoted) is None
+
+    expected = [fra_dss(record) for record in records]
+    for text in (plain, quoted):
+        batch = evaluate_batch(load_claimants(text, "claimants.csv"))
+        assert [c["eligible_schemes"] for c in batch["claimants"]] == expected
+
+
+def test_ragged_or_blank_rows_fall_back_to_csv_reader():
+    assert split_plain_csv("Name,ST\nA,True\n\nB,False\n") is None
+    assert split_plain_csv("Name,ST\nA,True,extra\nB\n") is None
+    columns = load_claimants("Name,ST\nA,True\n\nB\n", "claimants.csv")
+    assert columns["Name"].tolist() == ["A", "B"]
+    assert columns["ST"].tolist() == [True, False]
+
+
+def test_scheme_masks_match_scalar_patterns():
+    plan = RulePlan({
+        "predicates": {
+            "granted": {"field": "Claim Status", "op": "==", "value": "Granted"},
+            "tribal": {"field": "ST", "op": "truthy"},
+            "small": {"field": "Land Area (hectares)", "op": "<=", "value": 2.5},
+        },
+        "conditions": {"small_or_tribal": {"any": ["small", "tribal"]}},
+        "schemes": [
+            {"name": "not granted", "when": {"not": "granted"}},
+            {"name": "granted, small or tribal", "when": {"all": ["granted", "small_or_tribal"]}},
+            {"name": "always", "when": {"all": []}},
+            {"name": "never", "when": {"any": []}},
+            {"name": "granted but neither", "when": {"all": ["granted", {"not": "small_or_tribal"}]}},
+        ],
+    })
+    records = claimants(300)
+    columns = columns_from_records(records, claimant_fields(plan))
+    batch = evaluate_batch(columns, plan, explain=True)
+    plain = evaluate_batch(columns, plan)
+    for record, entry, plain_entry in zip(records, batch["claimants"], plain["claimants"]):
+        schemes, trace = plan.evaluate(record, explain=True)
+        assert entry["eligible_schemes"] == plain_entry["eligible_schemes"] == schemes
+        assert plan.evaluate(record) == (schemes, None)
+        assert entry["explanations"] == trace
+    assert batch["scheme_counts"]["always"] == 300
+    assert batch["scheme_counts"]["never"] == 0
+
+
+def test_evaluate_falls_back_for_missing_fields_and_mismatched_types():
+    plan = default_rules().plan()
+    record = claimants(1)[0]
+    record.update({"Claim Status": "Granted", "ST": True, "Village ST Percentage": 80})
+    expected, _ = plan.evaluate(record, explain=True)
+
+    missing = {key: value for key, value in record.items() if key != "SC"}
+    assert plan.evaluate(missing)[0] == expected
+    mismatched = dict(record, **{"Village ST Percentage": "eighty", "Aspirational District": False})
+    assert "Community Forest Resource Rights - Management and conservation authority" not in plan.evaluate(mismatched)[0]
+
+
+def test_plain_csv_line_endings():
+    assert split_plain_csv("Name,ST\r\nA,True\r\nB,False\r\n") == (["Name", "ST"], [["A", "B"], ["True", "False"]])
+    assert split_plain_csv("Name,ST\nA,True\nB,False") == (["Name", "ST"], [["A", "B"], ["True", "False"]])
+    assert split_plain_csv("Name,ST\r\nA,True\nB,False\r\n") is None
+    assert split_plain_csv("Name,ST\rA,True\rB,False\r") is None
+    assert split_plain_csv("Name\r\nA\nB\r\n") is None
@@ -0,0 +1,65 @@
+from entity_patterns import extract_pattern_entities, PATTERN_ENTITY_KEYS
+from ner_scheduler import merge_entities
+from spatial_index import parse_coordinates
+
+
+def test_survey_number_keeps_letter_subdivision():
+    assert extract_pattern_entities("Sy.No 102/A")["SURVEY_NUMBER"] == ["102/A"]
+    assert extract_pattern_entities("Survey No. 45/2B")["SURVEY_NUMBER"] == ["45/2B"]
+    assert extract_pattern_entities("Survey No 12-A1 granted")["SURVEY_NUMBER"] == ["12-A1"]
+
+
+def test_survey_number_stops_before_words():
+    assert extract_pattern_entities("Survey 45-Village Gundala")["SURVEY_NUMBER"] == ["45"]
+
+
+def test_bare_survey_number_needs_context():
+    assert extract_pattern_entities("Page 1/3")["SURVEY_NUMBER"] == []
+    assert extract_pattern_entities("Claim form\n12/7")["SURVEY_NUMBER"] == []
+    assert extract_pattern_entities("Page No. 2/3 Survey No 45/2")["SURVEY_NUMBER"] == ["45/2"]
+    assert extract_pattern_entities("Survey Nos. 45/2, 46/3 and 47/1")["SURVEY_NUMBER"] == ["45/2", "46/3", "47/1"]
+    assert extract_pattern_entities("1   45/2   2.5 hectares")["SURVEY_NUMBER"] == ["45/2"]
+
+
+def test_bare_survey_number_skips_dates():
+    entities = extract_pattern_entities("Survey done on 12/03/2023")
+    assert entities["SURVEY_NUMBER"] == []
+    assert entities["DATE"] == ["12/03/2023"]
+
+
+def test_labelled_latitude_and_longitude_are_paired():
+    coordinates = extract_pattern_entities("Lat 19.1234 Long 78.4567")["COORDINATES"]
+    assert coordinates == ["19.1234, 78.4567"]
+    assert parse_coordinates(coordinates[0]) == (78.4567, 19.1234)
+
+
+def test_longitude_first_pair_keeps_hemispheres():
+    coordinates = extract_pattern_entities("Longitude: 78.4567 E, Latitude: 19.1234 N")["COORDINATES"]
+    assert coordinates == ["19.1234 N, 78.4567 E"]
+    assert parse_coordinates(coordinates[0]) == (78.4567, 19.1234)
+
+
+def test_lone_latitude_is_not_a_coordinate():
+    assert extract_pattern_entities("Latitude 19.1234")["COORDINATES"] == []
+
+
+def test_raw_and_translated_text_are_merged():
+    # Raw Telugu OCR keeps the date punctuation, the translation has the keywords
+    raw = "పట్టా సంఖ్య 1234 సర్వే నంబర్ 45/2 తేదీ 12/03/2023"
+    translated = "Patta No 1234 Survey No 45/2 date 12 03 2023"
+    merged = merge_entities([extract_pattern_entities(raw), extract_pattern_entities(translated)], PATTERN_ENTITY_KEYS)
+    assert merged["PATTA_NUMBER"] == ["1234"]
+    assert merged["SURVEY_NUMBER"] == ["45/2"]
+    assert merged["DATE"] == ["12/03/2023"]
+
+
+def test_sentence_final_dates():
+    assert extract_pattern_entities("Date 12/03/2023.")["DATE"] == ["12/03/2023"]
+    assert extract_pattern_entities("The claim was dated 05-01-2023.")["DATE"] == ["05-01-2023"]
+    assert extract_pattern_entities("Verified on 12.03.2023. Approved.")["DATE"] == ["12.03.2023"]
+    assert extract_pattern_entities("Version 12.03.2023.1")["DATE"] == []
+
+
+def test_survey_number_with_spaced_separator():
+    assert extract_pattern_entities("Survey Number: 45 / 2")["SURVEY_NUMBER"] == ["45/2"]
+    assert extract_pattern_entities("Survey 45 - 12.5 acres")["SURVEY_NUMBER"] == ["45"]
@@ -0,0 +1,55 @@
+from geometry_store import GeometryStore, GeometryStoreSet, build_store
+
+
+def polygon(rings, properties=None):
+    return {"type": "Feature", "properties": properties or {},
+            "geometry": {"type": "Polygon", "coordinates": rings}}
+
+
+SQUARE = [[78.0, 19.0], [78.1, 19.0], [78.1, 19.1], [78.0, 19.1], [78.0, 19.0]]
+# Smaller than the default quantum, so every vertex lands on the same grid point
+SPECK = [[78.05, 19.05], [78.0500001, 19.05], [78.05, 19.0500001], [78.05, 19.05]]
+
+
+def test_ring_collapsed_by_quantization_is_dropped():
+    store = GeometryStore(build_store([polygon([SPECK], {"id": 1}), polygon([SQUARE, SPECK], {"id": 2})]))
+    geojson = store.to_geojson()
+    assert len(store) == 2
+    assert geojson["features"][0]["geometry"] is None
+    assert len(geojson["features"][1]["geometry"]["coordinates"]) == 1
+    assert [f["properties"]["id"] for f in geojson["features"]] == [1, 2]
+
+
+def test_degenerate_layer_still_loads(tmp_path):
+    source = tmp_path / "surveys.geojson"
+    source.write_text("{}")
+    stores = GeometryStoreSet(str(tmp_path / "stores"))
+    store = stores.load("survey", str(source), [polygon([SPECK]), polygon([SQUARE])])
+    assert store is not None and len(store) == 2
+
+
+def test_replaced_layer_is_not_served_from_encoded_cache(tmp_path):
+    stores = GeometryStoreSet(str(tmp_path))
+    stores.replace("survey", [polygon([SQUARE], {"id": 1})], "upload:1")
+    before = stores.encoded("survey", 0)
+    stores.replace("survey", [polygon([SQUARE], {"id": 1}), polygon([SQUARE], {"id": 2})], "upload:2")
+    after = stores.encoded("survey", 0)
+    assert after != before
+    assert len(GeometryStore(after)) == 2
+
+
+def square(x, y, size):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+
+
+def test_to_geojson_keeps_holes_with_their_feature():
+    holed = polygon([square(78.0, 19.0, 0.1), square(78.02, 19.02, 0.02)], {"id": 1})
+    plain = [polygon([square(78.2 + i * 0.2, 19.0, 0.1)], {"id": i + 2}) for i in range(2)]
+    store = GeometryStore(build_store([holed] + plain))
+    features = store.to_geojson()["features"]
+    assert [len(f["geometry"]["coordinates"]) for f in features] == [2, 1, 1]
+    assert features[1]["geometry"]["coordinates"][0][0] == [78.2, 19.0]
+    assert features[2]["geometry"]["coordinates"][0][0] == [78.4, 19.0]
+    # Selecting a subset keeps the same pairing
+    subset = store.to_geojson(indices=[0, 2])["features"]
+    assert [len(f["geometry"]["coordinates"]) for f in subset] == [2, 1]
@@ -0,0 +1,65 @@
+import results_store
+from results_store import ResultsStore
+from retrieval import DocumentRetriever
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_retriever(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(results_store.time, "time", clock)
+    retriever = None
+
+    def load(key):
+        stored = store.get(key)
+        if stored is None or "result_keys" not in stored:
+            return stored
+        results = [r for r in (store.get(k) for k in stored["result_keys"]) if r is not None]
+        return {"result_keys": stored["result_keys"], "results": results}
+
+    store = ResultsStore(ttl_seconds=60, on_remove=lambda key: retriever.remove(key))
+    retriever = DocumentRetriever(load)
+    return store, retriever, clock
+
+
+def test_expired_result_is_not_served_from_cached_index(monkeypatch):
+    store, retriever, clock = make_retriever(monkeypatch)
+    key = store.put({"filename": "a.pdf", "translated_text": "Patta granted to Ramesh Kumar"})
+    assert "Ramesh" in retriever.context(key, "who holds the patta")
+    clock.now += 61
+    assert key not in store
+    assert retriever.context(key, "who holds the patta") is None
+
+
+def test_batch_index_drops_replaced_member(monkeypatch):
+    store, retriever, _ = make_retriever(monkeypatch)
+    first = store.put({"filename": "a.pdf", "translated_text": "Patta granted to Ramesh Kumar"})
+    second = store.put({"filename": "b.pdf", "translated_text": "Survey number 45 is pending"})
+    batch = store.put({"result_keys": [first, second]}, prefix="batch_")
+    assert "Ramesh" in retriever.context(batch, "Ramesh patta")
+    store[first] = {"filename": "a.pdf", "translated_text": "Patta granted to Lakshmi Bai"}
+    context = retriever.context(batch, "Ramesh Lakshmi patta")
+    assert "Lakshmi" in context and "Ramesh" not in context
+
+
+def test_unrelated_removal_keeps_batch_index(monkeypatch):
+    store, retriever, _ = make_retriever(monkeypatch)
+    first = store.put({"filename": "a.pdf", "translated_text": "Patta granted to Ramesh Kumar"})
+    other = store.put({"filename": "b.pdf", "translated_text": "Survey number 45 is pending"})
+    batch = store.put({"result_keys": [first]}, prefix="batch_")
+    retriever.context(batch, "Ramesh patta")
+    retriever.context(other, "survey")
+    assert retriever.stats()["indexed_keys"] == 2
+    store[other] = {"filename": "b.pdf", "translated_text": "Survey number 46 is pending"}
+    assert retriever.stats()["indexed_keys"] == 1
+    loads = []
+    load = retriever.load_results
+    retriever.load_results = lambda key: loads.append(key) or load(key)
+    assert "Ramesh" in retriever.context(batch, "Ramesh patta")
+    assert loads == []  # served from the kept index, not rebuilt
@@ -0,0 +1,37 @@
+from search_index import SearchIndex
+
+
+def document(text):
+    return {"translated_text": text, "entities": {}}
+
+
+def test_scores_stay_positive_with_removed_documents_pending_compaction():
+    index = SearchIndex()
+    for i in range(999):
+        index.add(f"removed_{i}", document("forest patta claim"))
+    for i in range(500):
+        index.add(f"live_{i}", document("forest survey record" if i % 2 else "forest patta patta claim"))
+    for i in range(999):
+        index.remove(f"removed_{i}")
+    assert index.stats()["removed_pending_compaction"] == 999
+
+    hits = index.search("patta forest", match="any", limit=500)["hits"]
+    assert len(hits) == 500
+    assert all(hit["score"] > 0 for hit in hits)
+    # Documents mentioning the rarer term twice rank above those with only "forest"
+    assert all(hit["key"].startswith("live_") for hit in hits)
+    patta_keys = {f"live_{i}" for i in range(0, 500, 2)}
+    assert {hit["key"] for hit in hits[:250]} == patta_keys
+
+
+def test_scores_match_a_fresh_index_after_removals():
+    index, fresh = SearchIndex(), SearchIndex()
+    texts = ["patta granted to ramesh", "survey 45/2 pending", "patta pending verification", "forest rights"]
+    for i in range(40):
+        index.add(f"old_{i}", document("patta patta patta"))
+    for i, text in enumerate(texts):
+        index.add(f"doc_{i}", document(text))
+        fresh.add(f"doc_{i}", document(text))
+    for i in range(40):
+        index.remove(f"old_{i}")
+    assert index.search("patta pending", match="any") == fresh.search("patta pending", match="any")
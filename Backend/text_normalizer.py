@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+import re
+import unicodedata
+
+
+# Everything outside word characters and this punctuation becomes a space in clean_text;
+# whitespace is included so a mixed run collapses to a single space in the same pass
+_SEPARATOR_PATTERN = re.compile(r"[^\w\-.,;:()\[\]{}'\"/\\]+")
+
+# The OCR confusions `l` -> `I` and `0` -> `O` as standalone words, and `rn` -> `m`, in one
+# pass. Separators are already plain spaces, so word boundaries match the original passes.
+# (`|` and `!` never survive the separator pass, so the old `[|!]` -> `l` rule is a no-op.)
+_CONFUSION_PATTERN = re.compile(r"\b[lL0]\b|[rR][nN]")
+
+_CONFUSION_REPLACEMENTS = {"l": "I", "L": "I", "0": "O"}
+
+# standardize_spacing in one pass: punctuation with surrounding whitespace, whitespace runs, line breaks
+_STANDARDIZE_PATTERN = re.compile(r"\s*([,.;:!?])\s*|\s{2,}|\r\n|\r|\n")
+
+# On clean_text output whitespace is already single spaces and `!`/`?` are gone
+_STANDARDIZE_CLEANED_PATTERN = re.compile(r" ?([,.;:]) ?")
+
+
+def _confusion_replacement(match):
+    return _CONFUSION_REPLACEMENTS.get(match.group(), "m")
+
+
+class TextNormalizer:
+    """Precompiled text cleaning and spacing normalization.
+
+    Produces exactly the same output as the original multi-pass
+    `TextPreprocessor.clean_text` and `standardize_spacing`, using
+    patterns compiled once at import time.
+    """
+
+    def __init__(self, batch_workers=1, parallel_min_texts=64):
+        """Initialize with the process count used by normalize_batch for large batches"""
+        self.batch_workers = batch_workers
+        self.parallel_min_texts = parallel_min_texts
+
+    @staticmethod
+    def clean(text):
+        """Clean and normalize extracted text"""
+        if not text:
+            return ""
+        # ASCII text is already in NFKD form
+        if not text.isascii():
+            text = unicodedata.normalize('NFKD', text)
+        # Separator runs are by far the most frequent match, so they use a plain string
+        # replacement; only the rare OCR confusions go through a Python callback
+        text = _SEPARATOR_PATTERN.sub(" ", text)
+        return _CONFUSION_PATTERN.sub(_confusion_replacement, text).strip()
+
+    @staticmethod
+    def standardize(text):
+        """Standardize spacing and line breaks"""
+        if not text:
+            return ""
+        # Unmatched group 1 expands to "", so whitespace-only matches become a single space
+        return _STANDARDIZE_PATTERN.sub(r"\1 ", text).strip()
+
+    @staticmethod
+    def normalize(text):
+        """Return (cleaned_text, standardized_text) for one document"""
+        cleaned = TextNormalizer.clean(text)
+        if not cleaned:
+            return "", ""
+        return cleaned, _STANDARDIZE_CLEANED_PATTERN.sub(r"\1 ", cleaned).strip()
+
+    def normalize_batch(self, texts):
+        """Normalize many documents, spreading large batches across processes"""
+        texts = list(texts)
+        if self.batch_workers > 1 and len(texts) >= self.parallel_min_texts:
+            chunksize = max(1, len(texts) // (self.batch_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.batch_workers) as executor:
+                return list(executor.map(TextNormalizer.normalize, texts, chunksize=chunksize))
+        normalize = TextNormalizer.normalize
+        return [normalize(text) for text in texts]
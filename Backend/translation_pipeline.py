@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+import re
+
+from metrics import external_call, propagate
+from result_cache import make_cache_key
+
+
+# Sentence ends: Latin punctuation and the danda used by Devanagari, Bengali and Odia text
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;।॥])\s+")
+
+# Translate v2 accepts at most 128 text segments per request
+MAX_SEGMENTS_PER_REQUEST = 128
+
+
+def split_sentences(text, max_chars):
+    """Split text into (segment, separator) pairs on sentence boundaries.
+
+    Sentences longer than `max_chars` are split again at whitespace and,
+    failing that, hard-cut, so every segment fits in one request.
+    Joining `segment + separator` for all pairs reproduces the text.
+    """
+    pairs = []
+    position = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        pairs.append((text[position:match.start()], match.group()))
+        position = match.end()
+    if position < len(text):
+        pairs.append((text[position:], ""))
+
+    segments = []
+    for sentence, separator in pairs:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                segments.append((sentence[:max_chars], ""))
+                sentence = sentence[max_chars:]
+            else:
+                segments.append((sentence[:cut], " "))
+                sentence = sentence[cut + 1:]
+        segments.append((sentence, separator))
+    return segments
+
+
+class TranslationPipeline:
+    """Sentence-chunked, batched translation backed by a translation memory.
+
+    Text is split into sentences that fit the per-request character budget.
+    Segments already in the translation memory (FRA form boilerplate repeats
+    across documents) are reused. Each distinct new segment is sent once,
+    packed into batch translate requests that run in parallel, so cost
+    tracks the amount of new text rather than document size.
+    """
+
+    def __init__(self, client, memory=None, max_chars=4500, concurrency=4):
+        """Initialize with a translate_v2 client, a ResultCache used as translation memory and limits"""
+        self.client = client
+        self.memory = memory
+        self.max_chars = max_chars
+        self.concurrency = max(1, concurrency)
+
+    def _memory_key(self, segment, source_language, target_language):
+        return make_cache_key(segment, source_language, target_language)
+
+    def _pack_requests(self, segments):
+        """Group segments into requests bounded by character budget and segment count"""
+        batch, batch_chars = [], 0
+        for segment in segments:
+            if batch and (batch_chars + len(segment) > self.max_chars or len(batch) >= MAX_SEGMENTS_PER_REQUEST):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(segment)
+            batch_chars += len(segment)
+        if batch:
+            yield batch
+
+    def _translate_request(self, batch, source_language, target_language):
+        """Translate one batch; returns {segment: translation} or {} if the call failed"""
+        with external_call("translate", "translate", sent=sum(len(segment) for segment in batch)) as call:
+            try:
+                results = self.client.translate(
+                    batch,
+                    target_language=target_language,
+                    source_language=source_language,
+                    format_='text'
+                )
+            except Exception as e:
+                print(f"Google Translate batch error: {str(e)}")
+                call.failed = True
+                return {}
+            if isinstance(results, dict):
+                results = [results]
+            translations = {segment: result['translatedText'] for segment, result in zip(batch, results)}
+            call.received = sum(len(translated) for translated in translations.values())
+            return translations
+
+    def translate(self, text, source_language, target_language='en'):
+        """Translate `text` and return (translated_text, stats).
+
+        Segments whose request failed are kept in the source language and
+        counted in `stats["failed_segments"]` instead of failing the document.
+        """
+        pieces = split_sentences(text, self.max_chars)
+        translations = {}
+        memory_hits = 0
+
+        pending = []
+        seen = set()
+        for segment, _ in pieces:
+            if not segment.strip() or segment in seen:
+                continue
+            seen.add(segment)
+            cached = None
+            if self.memory is not None:
+                cached = self.memory.get("translation_memory", self._memory_key(segment, source_language, target_language))
+            if cached is not None:
+                translations[segment] = cached
+                memory_hits += 1
+            else:
+                pending.append(segment)
+
+        requests = list(self._pack_requests(pending))
+        if len(requests) == 1:
+            responses = [self._translate_request(requests[0], source_language, target_language)]
+        elif requests:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(requests)),
+                                    thread_name_prefix="translate-batch") as executor:
+                responses = list(executor.map(
+                    propagate(lambda batch: self._translate_request(batch, source_language, target_language)),
+                    requests
+                ))
+        else:
+            responses = []
+
+        for response in responses:
+            for segment, translated in response.items():
+                translations[segment] = translated
+                if self.memory is not None:
+                    self.memory.set("translation_memory",
+                                    self._memory_key(segment, source_language, target_language), translated)
+
+        failed = [segment for segment in pending if segment not in translations]
+        translated_text = "".join(translations.get(segment, segment) + separator for segment, separator in pieces)
+
+        stats = {
+            "segments": len(pieces),
+            "memory_hits": memory_hits,
+            "translated_segments": len(pending) - len(failed),
+            "translated_chars": sum(len(segment) for segment in pending if segment in translations),
+            "failed_segments": len(failed),
+            "requests": len(requests),
+        }
+        return translated_text, stats
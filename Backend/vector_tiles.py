@@ -0,0 +1,478 @@
+from collections import OrderedDict
+import hashlib
+import math
+import os
+import threading
+
+import numpy as np
+
+from spatial_index import STRTree
+
+
+# Web Mercator stops at the latitude where the projected world is square
+MAX_LATITUDE = 85.05112878
+
+# MVT geometry commands and feature type
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+_POLYGON = 3
+
+
+def lonlat_to_world(lon, lat):
+    """Project degrees to Web Mercator world coordinates in [0, 1], y growing southwards"""
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.radians(np.clip(np.asarray(lat, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE))
+    wx = (lon + 180.0) / 360.0
+    wy = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0
+    return wx, wy
+
+
+def source_version(paths, *settings):
+    """Short hash of the source files' size and mtime plus tiling settings, used as the tile ETag"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(f"{path}:missing".encode("utf-8"))
+    for setting in settings:
+        digest.update(f"|{setting}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def simplification_importance(ring, min_sq_tolerance):
+    """Squared Douglas-Peucker distance at which each vertex of a ring stops being kept.
+
+    Computed once per ring; a zoom level then keeps the vertices whose
+    importance exceeds its squared tolerance. A vertex never outranks the
+    vertex that split its range, so every zoom sees a true DP result.
+    Ranges below the finest tolerance are not refined further.
+    """
+    importance = np.zeros(len(ring))
+    importance[0] = importance[-1] = np.inf
+    stack = [(0, len(ring) - 1, np.inf)]
+    while stack:
+        first, last, limit = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = ring[first], ring[last]
+        points = ring[first + 1:last]
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length = dx * dx + dy * dy
+        if length > 0:
+            t = np.clip(((points[:, 0] - a[0]) * dx + (points[:, 1] - a[1]) * dy) / length, 0.0, 1.0)
+            ex, ey = points[:, 0] - (a[0] + t * dx), points[:, 1] - (a[1] + t * dy)
+        else:
+            ex, ey = points[:, 0] - a[0], points[:, 1] - a[1]
+        distances = ex * ex + ey * ey
+        i = int(np.argmax(distances))
+        distance = min(float(distances[i]), limit)
+        importance[first + 1 + i] = distance
+        if distance > min_sq_tolerance:
+            stack.append((first, first + 1 + i, distance))
+            stack.append((first + 1 + i, last, distance))
+    return importance
+
+
+def _clip_half_plane(points, axis, bound, keep_above):
+    """Sutherland-Hodgman against one axis-aligned edge, vectorized over the ring's edges"""
+    values = points[:, axis]
+    inside = values >= bound if keep_above else values <= bound
+    if inside.all():
+        return points
+    if not inside.any():
+        return points[:0]
+
+    following = np.roll(points, -1, axis=0)
+    crossing = inside != np.roll(inside, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (bound - values) / (following[:, axis] - values)
+        intersections = points + t[:, None] * (following - points)
+    intersections[:, axis] = bound
+    # Each edge emits its start vertex when inside, then the crossing point when it leaves or enters
+    candidates = np.stack([points, intersections], axis=1).reshape(-1, 2)
+    keep = np.stack([inside, crossing], axis=1).reshape(-1)
+    return candidates[keep]
+
+
+def clip_ring(points, low, high):
+    """Clip an open ring to the square [low, high] on both axes"""
+    for axis in (0, 1):
+        points = _clip_half_plane(points, axis, low, True)
+        points = _clip_half_plane(points, axis, high, False)
+    return points
+
+
+def _signed_area(ring):
+    """Twice the signed area; positive for clockwise rings in tile space (y down)"""
+    x, y = ring[:, 0], ring[:, 1]
+    return int(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _zigzag(values):
+    return (values << 1) ^ (values >> 63)
+
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _packed_varints(values):
+    """Encode a non-negative integer array as concatenated protobuf varints"""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b""
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        lengths += values >= np.uint64(1 << shift)
+    offsets = np.cumsum(lengths) - lengths
+    out = np.zeros(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        selected = lengths > k
+        byte = (values[selected] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[selected] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[offsets[selected] + k] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def _field(number, payload):
+    """Length-delimited protobuf field"""
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _field_varint(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _encode_value(value):
+    """MVT Value message for a property value"""
+    if isinstance(value, bool):
+        return _field_varint(7, int(value))
+    if isinstance(value, int):
+        return _field_varint(6, (value << 1) ^ (value >> 63))
+    if isinstance(value, float):
+        return _varint(3 << 3 | 1) + np.float64(value).tobytes()
+    return _field(1, str(value).encode("utf-8"))
+
+
+def encode_polygon(rings):
+    """MVT command stream for a list of closed integer rings (exteriors clockwise, holes counter-clockwise)"""
+    commands = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for ring in rings:
+        deltas = _zigzag(np.diff(ring, axis=0, prepend=cursor[None, :]))
+        cursor = ring[-1]
+        commands.append(np.array([_MOVE_TO | 1 << 3], dtype=np.int64))
+        commands.append(deltas[0])
+        commands.append(np.array([_LINE_TO | (len(ring) - 1) << 3], dtype=np.int64))
+        commands.append(deltas[1:].reshape(-1))
+        commands.append(np.array([_CLOSE_PATH | 1 << 3], dtype=np.int64))
+    return np.concatenate(commands) if commands else np.zeros(0, dtype=np.int64)
+
+
+class TileLayer:
+    """Polygon features projected to Web Mercator and indexed for cutting into tiles"""
+
+    def __init__(self, name, features, min_sq_tolerance):
+        """Project the Polygon and MultiPolygon features of one layer"""
+        self.name = name
+        self.properties = []
+        self.polygons = []  # per feature: list of polygons, each a list of closed world-coordinate rings
+        self._importance = []
+        self.min_sq_tolerance = min_sq_tolerance
+        boxes = []
+
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            if geometry.get("type") == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                continue
+
+            projected = []
+            for polygon in polygons:
+                rings = []
+                for ring in polygon:
+                    if len(ring) < 3:
+                        continue
+                    ring = np.asarray(ring, dtype=np.float64)[:, :2]
+                    if not np.array_equal(ring[0], ring[-1]):
+                        ring = np.vstack([ring, ring[:1]])
+                    rings.append(np.column_stack(lonlat_to_world(ring[:, 0], ring[:, 1])))
+                if rings:
+                    projected.append(rings)
+            if not projected:
+                continue
+
+            points = np.vstack([ring for rings in projected for ring in rings])
+            boxes.append((points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()))
+            self.polygons.append(projected)
+            self._importance.append(None)
+            self.properties.append(feature.get("properties") or {})
+
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.tree = STRTree(self.boxes) if len(self.boxes) else None
+
+    def __len__(self):
+        return len(self.properties)
+
+    def importance(self, index):
+        """Per-ring simplification importance for one feature, computed on first use"""
+        importance = self._importance[index]
+        if importance is None:
+            importance = [
+                [simplification_importance(ring, self.min_sq_tolerance) for ring in rings]
+                for rings in self.polygons[index]
+            ]
+            self._importance[index] = importance
+        return importance
+
+    def bounds(self):
+        """Layer extent as (west, south, east, north) degrees, or None when empty"""
+        if not len(self):
+            return None
+        minx, miny = self.boxes[:, 0].min(), self.boxes[:, 1].min()
+        maxx, maxy = self.boxes[:, 2].max(), self.boxes[:, 3].max()
+
+        def latitude(wy):
+            return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * wy))))
+
+        return [float(minx * 360 - 180), latitude(maxy), float(maxx * 360 - 180), latitude(miny)]
+
+
+class TileCache:
+    """Generated tiles in a byte-bounded in-memory LRU, optionally backed by a directory on disk"""
+
+    def __init__(self, max_memory_bytes=64 * 1024 * 1024, directory=None):
+        """Initialize the memory tier and, when a directory is given, the disk tier"""
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                print(f"❌ Failed to create tile cache directory: {str(e)}")
+                self.directory = None
+
+    def _path(self, key):
+        return os.path.join(self.directory, *map(str, key)) + ".mvt"
+
+    def _store_in_memory(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= len(previous)
+        self._entries[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def get(self, key):
+        """Return the cached tile bytes or None on a miss"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return data
+
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._store_in_memory(key, data)
+                    self._stats["disk_hits"] += 1
+                return data
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, data):
+        """Store tile bytes in both tiers"""
+        with self._lock:
+            self._store_in_memory(key, data)
+        if self.directory:
+            path = self._path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so a concurrent reader never sees a partial tile
+                temporary = f"{path}.{threading.get_ident()}.tmp"
+                with open(temporary, "wb") as f:
+                    f.write(data)
+                os.replace(temporary, path)
+            except OSError as e:
+                print(f"Tile cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop the memory tier; disk entries of an old version are no longer addressed"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return dict(
+                self._stats,
+                hit_rate=hits / lookups if lookups else 0.0,
+                memory_entries=len(self._entries),
+                memory_bytes=self.memory_bytes,
+                max_memory_bytes=self.max_memory_bytes,
+                disk_enabled=bool(self.directory),
+            )
+
+
+class VectorTileServer:
+    """Cuts polygon layers into Mapbox Vector Tiles, clipped and simplified per zoom level.
+
+    Geometry is projected once at startup. Per tile, the STR-tree finds the
+    features overlapping the buffered tile, each ring keeps the vertices
+    significant at this zoom, is clipped to the buffer and snapped to the
+    tile grid. Tiles are cached under the source version, which doubles as
+    the ETag, so an unchanged tile can be answered with 304 without being
+    generated or read.
+    """
+
+    def __init__(self, layers, version="", extent=4096, buffer=64, simplify_pixels=0.5, max_zoom=18, cache=None):
+        """Initialize with {layer name: GeoJSON features}"""
+        self.extent = extent
+        self.buffer = buffer
+        self.simplify_pixels = simplify_pixels
+        self.max_zoom = max_zoom
+        self.version = version
+        self.cache = cache or TileCache()
+        self.min_sq_tolerance = (simplify_pixels / (256 * 2 ** max_zoom)) ** 2
+        self.layers = {name: TileLayer(name, features, self.min_sq_tolerance) for name, features in layers.items()}
+
+    @property
+    def etag(self):
+        return f'"{self.version}"'
+
+    def replace_layer(self, name, features, version):
+        """Swap in a re-projected layer under a new source version, so cached tiles and ETags go stale"""
+        layers = dict(self.layers)
+        layers[name] = TileLayer(name, features, self.min_sq_tolerance)
+        self.layers = layers
+        self.version = version
+        self.cache.clear()
+
+    def check(self, layer, z, x, y):
+        """Raise KeyError for an unknown layer and ValueError for an invalid tile address"""
+        if layer not in self.layers:
+            raise KeyError(layer)
+        if not 0 <= z <= self.max_zoom:
+            raise ValueError(f"Zoom must be between 0 and {self.max_zoom}")
+        if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError(f"Tile {x}/{y} is outside zoom level {z}")
+
+    def cached(self, layer, z, x, y):
+        """Tile bytes from the cache, or None"""
+        return self.cache.get((self.version, layer, z, x, y))
+
+    def tile(self, layer, z, x, y):
+        """Encoded tile bytes, generated on a cache miss; an empty tile is zero bytes"""
+        self.check(layer, z, x, y)
+        key = (self.version, layer, z, x, y)
+        data = self.cache.get(key)
+        if data is None:
+            data = self.render(self.layers[layer], z, x, y)
+            self.cache.set(key, data)
+        return data
+
+    def _tile_rings(self, rings, importance, sq_tolerance, origin, scale):
+        """Simplify, clip and snap the rings of one polygon; the polygon is dropped with its exterior"""
+        low, high = -self.buffer, self.extent + self.buffer
+        out = []
+        for k, (ring, ring_importance) in enumerate(zip(rings, importance)):
+            points = ring[ring_importance > sq_tolerance]
+            if len(points) >= 4:
+                points = (points[:-1] - origin) * scale
+                if points.min() < low or points.max() > high:
+                    points = clip_ring(points, low, high)
+                points = np.round(points).astype(np.int64)
+                if len(points):
+                    # Drop vertices that snapped onto their predecessor
+                    points = points[np.any(points != np.roll(points, 1, axis=0), axis=1)]
+            area = _signed_area(points) if len(points) >= 3 else 0
+            if area == 0:
+                if k == 0:
+                    return []
+                continue
+            # Exterior rings are clockwise in tile space, holes counter-clockwise
+            if (area > 0) != (k == 0):
+                points = points[::-1]
+            out.append(points)
+        return out
+
+    def render(self, layer, z, x, y):
+        """Generate one tile for a layer"""
+        if layer.tree is None:
+            return b""
+        tiles = 2 ** z
+        margin = self.buffer / self.extent / tiles
+        candidates = layer.tree.query_box(x / tiles - margin, y / tiles - margin,
+                                          (x + 1) / tiles + margin, (y + 1) / tiles + margin)
+        if len(candidates) == 0:
+            return b""
+
+        sq_tolerance = (self.simplify_pixels / (256 * tiles)) ** 2
+        origin = np.array([x / tiles, y / tiles])
+        scale = tiles * self.extent
+        keys, values = {}, {}
+        features = []
+        for index in np.sort(candidates).tolist():
+            rings = []
+            for polygon, importance in zip(layer.polygons[index], layer.importance(index)):
+                rings.extend(self._tile_rings(polygon, importance, sq_tolerance, origin, scale))
+            if not rings:
+                continue
+
+            tags = []
+            for key, value in layer.properties[index].items():
+                if value is None or isinstance(value, (dict, list)):
+                    continue
+                tags.append(keys.setdefault(key, len(keys)))
+                tags.append(values.setdefault((type(value).__name__, value), len(values)))
+
+            feature = _field_varint(1, index)
+            if tags:
+                feature += _field(2, _packed_varints(tags))
+            feature += _field_varint(3, _POLYGON) + _field(4, _packed_varints(encode_polygon(rings)))
+            features.append(_field(2, feature))
+
+        if not features:
+            return b""
+        message = _field(1, layer.name.encode("utf-8")) + b"".join(features)
+        message += b"".join(_field(3, key.encode("utf-8")) for key in keys)
+        message += b"".join(_field(4, _encode_value(value)) for _, value in values)
+        message += _field_varint(5, self.extent) + _field_varint(15, 2)
+        return _field(3, message)
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "max_zoom": self.max_zoom,
+            "extent": self.extent,
+            "layers": {name: {"features": len(layer), "bounds": layer.bounds()} for name, layer in self.layers.items()},
+            "cache": self.cache.stats(),
+        }
@@ -1,7 +1,7 @@
 import React, { useState, useRef, useEffect } from "react";
 import "./ChatBox.css"; // Use the forest-themed CSS
 
-export default function ChatBox({ ocrContext }) {
+export default function ChatBox({ ocrContext, documentKey }) {
   const [messages, setMessages] = useState([
     {
       sender: "bot",
@@ -25,17 +25,53 @@ export default function ChatBox({ ocrContext }) {
     setIsLoading(true);
 
     try {
-      const response = await fetch("http://localhost:8000/chat", {
+      const response = await fetch("http://localhost:8000/chat/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ user_input: trimmedInput, ocr_context: ocrContext })
+        body: JSON.stringify({ user_input: trimmedInput, ocr_context: ocrContext, document_key: documentKey || null })
       });
 
       let botReply = "⚠️ Couldn't get a response from the assistant.";
 
-      if (response.ok) {
-        const data = await response.json();
-        botReply = data?.bot_reply || botReply;
+      if (response.ok && response.body) {
+        // Show the reply as it streams in; the final `done` event replaces it with the cleaned text
+        let streamed = "";
+        let started = false;
+        const showReply = (text, streaming = true) => {
+          const message = { sender: "bot", text, streaming };
+          if (!started) {
+            started = true;
+            setMessages(prev => [...prev, message]);
+          } else {
+            setMessages(prev => [...prev.slice(0, -1), message]);
+          }
+        };
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let finalReply = null;
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const events = buffer.split("\n\n");
+          buffer = events.pop();
+          for (const block of events) {
+            const event = block.match(/^event: (.*)$/m)?.[1];
+            const data = block.match(/^data: (.*)$/m)?.[1];
+            if (!event || !data) continue;
+            const payload = JSON.parse(data);
+            if (event === "token") {
+              streamed += payload.text;
+              showReply(streamed);
+            } else {
+              finalReply = payload.bot_reply || botReply;
+            }
+          }
+        }
+        showReply(finalReply || streamed || botReply, false);
+        return;
       } else if (response.status === 429) {
         botReply = "⚠️ Too many requests - please wait a moment and try again.";
       } else if (response.status === 403) {
@@ -97,7 +133,7 @@ export default function ChatBox({ ocrContext }) {
           </div>
         ))}
 
-        {isLoading && (
+        {isLoading && !messages[messages.length - 1]?.streaming && (
           <div className="msg bot">
             <div className="typing-indicator">
               <span>Thinking</span>
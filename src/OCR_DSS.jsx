@@ -15,6 +15,8 @@ const OCR_DSS = () => {
   const [results, setResults] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [progress, setProgress] = useState(null);
+  const [documentKey, setDocumentKey] = useState(null); // Result or batch key the chat retrieves passages from
 
   const { setOcrResults } = useOcr();
 
@@ -78,6 +80,25 @@ const OCR_DSS = () => {
     return entities;
   };
 
+  // Add fallback parsing if NER returned no meaningful entities
+  const withFallbackEntities = (result) => {
+    let entities = result.entities || {};
+    
+    // If entities object is empty or has no meaningful data, try fallback parsing
+    if (Object.keys(entities).length === 0 || 
+        !entities.PATTA_HOLDER_NAME || 
+        !entities.PERSON) {
+      console.log('NER failed, using fallback parsing...');
+      entities = parseEntitiesFromText(result.raw_text || result.cleaned_text || result.standardized_text);
+    }
+    
+    return {
+      ...result,
+      entities
+    };
+  };
+
+  // Submit files as a background job and render each result as soon as it is streamed back
   const processDocuments = async () => {
     if (files.length === 0) return setError('Please select files to process');
 
@@ -87,42 +108,64 @@ const OCR_DSS = () => {
     try {
       setLoading(true);
       setError(null);
+      setResults(null);
+      setDocumentKey(null);
+      setProgress({ completed: 0, total: files.length });
 
-      const res = await fetch(`${API_BASE_URL}/process-documents`, {
+      const res = await fetch(`${API_BASE_URL}/jobs`, {
         method: 'POST',
         body: formData
       });
-      const data = await res.json();
+      const job = await res.json();
 
-      if (data.success) {
-        // Process results and add fallback parsing if entities are empty
-        const processedResults = data.results.map(result => {
-          let entities = result.entities || {};
-          
-          // If entities object is empty or has no meaningful data, try fallback parsing
-          if (Object.keys(entities).length === 0 || 
-              !entities.PATTA_HOLDER_NAME || 
-              !entities.PERSON) {
-            console.log('NER failed, using fallback parsing...');
-            entities = parseEntitiesFromText(result.raw_text || result.cleaned_text || result.standardized_text);
-          }
-          
-          return {
-            ...result,
-            entities
-          };
-        });
-        
-        setResults(processedResults);
-        if (processedResults[0]?.entities) {
-          setOcrResults(processedResults[0].entities);
-        }
-      } else {
-        setError('Processing failed: ' + data.message);
+      if (!res.ok) {
+        setError('Processing failed: ' + (job.detail || res.statusText));
+        setLoading(false);
+        return;
       }
+
+      const events = new EventSource(`${API_BASE_URL}${job.events_url}`);
+      let firstResult = true;
+
+      events.addEventListener('result', (e) => {
+        const data = JSON.parse(e.data);
+        if (!data.result) return;
+        const processed = withFallbackEntities(data.result);
+        setResults(prev => [...(prev || []), processed]);
+        if (firstResult && processed.entities) {
+          setOcrResults(processed.entities);
+          setDocumentKey(data.result_key);
+          firstResult = false;
+        }
+      });
+
+      events.addEventListener('file', (e) => {
+        const data = JSON.parse(e.data);
+        if (['completed', 'no_text', 'failed'].includes(data.status)) {
+          setProgress(prev => ({ ...prev, completed: prev.completed + 1 }));
+        }
+        if (data.status === 'failed') {
+          setError(`Processing failed for ${data.filename}`);
+        }
+      });
+
+      events.addEventListener('done', (e) => {
+        const data = JSON.parse(e.data);
+        setProgress({ completed: data.completed_files, total: data.total_files });
+        if (data.batch_key) setDocumentKey(data.batch_key);
+        events.close();
+        setLoading(false);
+      });
+
+      events.onerror = () => {
+        // The browser retries automatically; give up only once the stream is closed
+        if (events.readyState === EventSource.CLOSED) {
+          setError('Lost connection to the processing job');
+          setLoading(false);
+        }
+      };
     } catch (err) {
       setError('API request failed: ' + err.message);
-    } finally {
       setLoading(false);
     }
   };
@@ -242,6 +285,9 @@ const OCR_DSS = () => {
         <button className="button-process" onClick={processDocuments} disabled={loading}>
           {loading ? <FaSync className="spin" /> : <FaBrain />} Process OCR & DSS
         </button>
+        {loading && progress && (
+          <p className="progress">Processed {progress.completed} of {progress.total} document(s)...</p>
+        )}
         {error && <p className="error">{error}</p>}
       </div>
 
@@ -298,6 +344,7 @@ const OCR_DSS = () => {
       <div className="dss-right">
         <ChatBox 
           ocrContext={JSON.stringify(results[0].entities, null, 2)} 
+          documentKey={documentKey}
         />
       </div>
     </div>